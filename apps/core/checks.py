@@ -0,0 +1,31 @@
+"""
+System checks for core app.
+
+Cached per-user data (group listings, dashboard numbers, wheel states) is
+invalidated with cache.delete(), which only reaches every worker process
+when they all share one cache.
+"""
+
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+# Backends that keep their data inside a single process
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """Warn when a production deployment uses a cache private to each process."""
+    backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+    if settings.DEBUG or backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [
+        Warning(
+            f"The default cache ({backend}) is private to each process.",
+            hint="Use the database cache or Redis so every worker sees the same invalidations.",
+            id="core.W001",
+        )
+    ]
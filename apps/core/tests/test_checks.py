@@ -0,0 +1,29 @@
+"""Tests for core app system checks."""
+
+from apps.core.checks import check_shared_cache
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+class TestCheckSharedCache:
+    """Tests for the shared cache check."""
+
+    def test_warns_about_process_local_cache_in_production(self, settings):
+        settings.DEBUG = False
+        settings.CACHES = LOCMEM
+
+        assert [message.id for message in check_shared_cache(None)] == ["core.W001"]
+
+    def test_shared_cache_passes(self, settings, tmp_path):
+        settings.DEBUG = False
+        settings.CACHES = {
+            "default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": str(tmp_path)}
+        }
+
+        assert check_shared_cache(None) == []
+
+    def test_debug_passes(self, settings):
+        settings.DEBUG = True
+        settings.CACHES = LOCMEM
+
+        assert check_shared_cache(None) == []
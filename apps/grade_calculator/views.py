@@ -1,7 +1,7 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic.edit import FormView
 
-from apps.users.models import UserStats
+from apps.users.services import UsageCounters
 
 from .forms import GradeCalculatorForm
 from .services.grade_calculator import grade_calculator
@@ -20,9 +20,7 @@ class GradeCalculatorView(LoginRequiredMixin, FormView):
             form.add_error("max_points", "Maximum points must be at least 4.")
             return self.form_invalid(form)
 
-        stats, _ = UserStats.objects.get_or_create(user=self.request.user)
-        stats.calculator_uses += 1
-        stats.save(update_fields=["calculator_uses"])
+        UsageCounters.increment(self.request.user.id, "calculator_uses")
 
         grades = grade_calculator(max_points, rounding_option)
         context = self.get_context_data(form=form, score_range=grades)
@@ -1 +1,8 @@
+from django.contrib import admin
+
+from .models import Division, PairHistory
+
 # Register your models here.
+
+admin.site.register(Division)
+admin.site.register(PairHistory)
@@ -1,6 +1,73 @@
+import json
+
 from django import forms
 
+from apps.group_maker.models import GroupCreationModel
+
+CONSTRAINT_HELP = "One set of names per line, separated by commas."
+
+
+def _name_sets(value):
+    """Parse one comma-separated set of names per line, skipping blank lines."""
+    sets = []
+    for number, line in enumerate(value.splitlines(), start=1):
+        names = [name.strip() for name in line.split(",") if name.strip()]
+        if not names:
+            continue
+        if len(names) < 2:
+            raise forms.ValidationError(f"Line {number} needs at least two names.")
+        sets.append(names)
+    return sets
+
 
 class GroupMakerForm(forms.Form):
     group_id = forms.IntegerField(required=True)
     size = forms.IntegerField(min_value=1, required=True, help_text="How many members per group?")
+    keep_together = forms.CharField(required=False, widget=forms.Textarea(attrs={"rows": 2}), help_text=CONSTRAINT_HELP)
+    keep_apart = forms.CharField(required=False, widget=forms.Textarea(attrs={"rows": 2}), help_text=CONSTRAINT_HELP)
+    # "" (no balancing), "net" or "field:<FieldDefinition id>"; checked against the group in the view
+    balance_by = forms.CharField(required=False)
+    avoid_repeats = forms.BooleanField(required=False, help_text="Keep apart members who were together before.")
+
+    def clean_keep_together(self):
+        return _name_sets(self.cleaned_data["keep_together"])
+
+    def clean_keep_apart(self):
+        return _name_sets(self.cleaned_data["keep_apart"])
+
+
+class KeepDivisionForm(forms.Form):
+    """The split a teacher chose to use, as shown on the page."""
+
+    group_id = forms.IntegerField(required=True)
+    size = forms.IntegerField(min_value=1, required=True)
+    balance_by = forms.CharField(required=False)
+    avoid_repeats = forms.BooleanField(required=False)
+    # JSON list of teams, each a list of member IDs; checked against the group in the view
+    teams = forms.CharField()
+
+    def clean_teams(self):
+        try:
+            teams = json.loads(self.cleaned_data["teams"])
+        except ValueError:
+            raise forms.ValidationError("Teams must be a JSON list.") from None
+        if (
+            not isinstance(teams, list)
+            or not teams
+            or not all(isinstance(team, list) and team for team in teams)
+            or not all(isinstance(member_id, int) for team in teams for member_id in team)
+        ):
+            raise forms.ValidationError("Teams must be non-empty lists of member IDs.")
+        return teams
+
+
+class BatchDivideForm(forms.Form):
+    groups = forms.ModelMultipleChoiceField(queryset=GroupCreationModel.objects.none())
+    size = forms.IntegerField(min_value=1, required=True, help_text="How many members per group?")
+    # Point columns differ between groups, so a batch can only balance net points
+    balance_by = forms.ChoiceField(choices=[("", "Nothing (random teams)"), ("net", "Net points")], required=False)
+    avoid_repeats = forms.BooleanField(required=False, help_text="Keep apart members who were together before.")
+
+    def __init__(self, *args, user=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["groups"].queryset = GroupCreationModel.objects.filter(user=user).order_by("-created", "-id")
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.group_divider.services.pair_history import rebuild_pair_history
+from apps.group_maker.models import GroupCreationModel
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-group pair co-occurrence matrices from saved divisions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--group", type=int, help="Only rebuild the matrix of this group ID.")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Divisions fetched per round trip.")
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be at least 1.")
+
+        group = None
+        if options["group"] is not None:
+            group = GroupCreationModel.objects.filter(id=options["group"]).first()
+            if group is None:
+                raise CommandError(f"Group {options['group']} does not exist.")
+
+        replayed = rebuild_pair_history(group=group, chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt pair history from {replayed} divisions."))
@@ -1 +1,51 @@
-# Create your models here.
+from django.conf import settings
+from django.db import models
+
+from apps.group_maker.models import GroupCreationModel
+
+
+class Division(models.Model):
+    """
+    One saved split of a group into teams.
+
+    PairHistory is pre-aggregated from these rows; rebuild_pair_history
+    recomputes it from them.
+    """
+
+    group = models.ForeignKey(GroupCreationModel, on_delete=models.CASCADE, related_name="+")
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    # One list of member IDs per team
+    teams = models.JSONField(default=list)
+    group_size = models.PositiveIntegerField()
+    balance_by = models.CharField(max_length=32, blank=True, default="")
+    avoid_repeats = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["group", "created_at"], name="division_group_time")]
+
+    def __str__(self):
+        return f"{self.group_id}_{len(self.teams)}teams_{self.created_at:%Y-%m-%d}"
+
+
+class PairHistory(models.Model):
+    """
+    How often each two members of a group have shared a team.
+
+    counts is a packed upper-triangular matrix of unsigned 16-bit counts over
+    the members in member_ids, ordered so that adding a member only appends;
+    see services.pair_history.PairMatrix.
+    """
+
+    group = models.OneToOneField(GroupCreationModel, on_delete=models.CASCADE, primary_key=True, related_name="+")
+    member_ids = models.JSONField(default=list)
+    counts = models.BinaryField(default=b"")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Pair histories"
+
+    def __str__(self):
+        return f"{self.group_id}_{len(self.member_ids)}members"
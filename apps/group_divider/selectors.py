@@ -0,0 +1,23 @@
+"""
+Selectors for group_divider app.
+
+Read-only queries backing the divider form.
+"""
+
+from apps.point_system.models import FieldDefinition
+
+
+def get_score_columns(user) -> list[FieldDefinition]:
+    """
+    Get the numerical point columns of all groups owned by a user.
+
+    Teams can be balanced by any of them; the form shows the ones of the
+    selected group.
+
+    Args:
+        user: User instance
+
+    Returns:
+        List of FieldDefinition instances, by group then column order
+    """
+    return list(FieldDefinition.objects.filter(group__user=user, type="int").order_by("group_id", "id"))
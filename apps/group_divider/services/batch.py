@@ -0,0 +1,83 @@
+"""
+Batch division for group_divider app.
+
+Divides several groups with the same settings in one pass: the members of
+every group come from a single query, the pair histories (when repeats are
+avoided) from another, and all resulting divisions are saved together by
+record_divisions().
+"""
+
+from operator import attrgetter
+
+from apps.core.models import Member
+
+from ..models import Division, PairHistory
+from .group_split import group_split, split_result
+from .pair_history import PairMatrix, record_divisions
+from .score_balance import member_scores
+
+
+def divide_groups(
+    groups,
+    group_size: int,
+    user=None,
+    balance_by: str = "",
+    avoid_repeats: bool = False,
+) -> tuple[list[dict], dict[int, str]]:
+    """
+    Divide several groups into teams and save every division.
+
+    Args:
+        groups: GroupCreationModel instances to divide
+        group_size: Maximum members per team
+        user: User who divided the groups (optional)
+        balance_by: '' for random teams or 'net' to balance net points
+        avoid_repeats: Whether to keep apart members who were together before
+
+    Returns:
+        Tuple of one split_result() per group, in the given order and with the
+        saved division's division_id added, and a dict mapping member ID to name
+    """
+    groups = list(groups)
+    members_by_group: dict[int, list[Member]] = {group.id: [] for group in groups}
+    for member in Member.objects.filter(group__in=groups).order_by("group_id", "id"):
+        members_by_group[member.group_id].append(member)
+
+    matrices: dict[int, PairMatrix] = {}
+    if avoid_repeats:
+        matrices = {
+            history.group_id: PairMatrix.from_history(history)
+            for history in PairHistory.objects.filter(group__in=groups)
+        }
+
+    results, divisions = [], []
+    for group in groups:
+        members = members_by_group[group.id]
+        scores = member_scores(group, members, balance_by) if balance_by else None
+        repeat_counts = None
+        if group.id in matrices:
+            repeat_counts = matrices[group.id].pair_counts(member.id for member in members)
+        teams = group_split(
+            members,
+            group_size,
+            key=attrgetter("id"),
+            score=(lambda member, scores=scores: scores[member.id]) if scores is not None else None,
+            repeat_counts=repeat_counts,
+        )
+        results.append(split_result(group, teams, scores))
+        divisions.append(
+            Division(
+                group=group,
+                user=user,
+                teams=[list(team["member_ids"]) for team in results[-1]["teams"]],
+                group_size=group_size,
+                balance_by=balance_by,
+                avoid_repeats=avoid_repeats,
+            )
+        )
+
+    record_divisions(divisions)
+    for result, division in zip(results, divisions, strict=True):
+        result["division_id"] = division.id
+    names = {member.id: member.name for members in members_by_group.values() for member in members}
+    return results, names
@@ -1,14 +1,78 @@
 import random
 
+from .partition import balanced_split
+from .score_balance import score_balanced_split
 
-def group_split(members_list, group_size):
-    random.shuffle(members_list)
-    list = [members_list[i : i + group_size] for i in range(0, len(members_list), group_size)]
-    return list
+# Fallback for members without a color, as on the wheel
+DEFAULT_COLOR = "#6366f1"
 
 
-def get_split_group_color(member_groups):
-    for group in member_groups:
-        random_member = random.choice(group)
-        group.append(random_member.color)
-    return member_groups
+def group_split(members_list, group_size, must_link=(), cannot_link=(), key=None, score=None, repeat_counts=None):
+    if score is not None:
+        return score_balanced_split(
+            members_list,
+            group_size,
+            score,
+            must_link=must_link,
+            cannot_link=cannot_link,
+            key=key,
+            repeat_counts=repeat_counts,
+        )
+    return balanced_split(
+        members_list,
+        group_size,
+        must_link=must_link,
+        cannot_link=cannot_link,
+        key=key,
+        repeat_counts=repeat_counts,
+    )
+
+
+def split_result(group, teams, scores=None, rng=None):
+    """
+    Build the compact result of one division.
+
+    Holds only IDs and plain values, so it can be cached or serialized to JSON
+    as is and rendered again with team_names().
+
+    Args:
+        group: GroupCreationModel that was divided
+        teams: One list of Member instances per team
+        scores: Dict mapping member ID to the score teams were balanced by (optional)
+        rng: random.Random instance used to pick team colors (optional)
+
+    Returns:
+        Dict with group_id, group_title and teams, each team a dict with
+        member_ids (tuple), color (one of its members' colors) and score
+        (team total, or None without scores)
+    """
+    rng = rng or random.Random()
+    return {
+        "group_id": group.id,
+        "group_title": group.title,
+        "teams": [
+            {
+                "member_ids": tuple(member.id for member in team),
+                "color": rng.choice([member.color or DEFAULT_COLOR for member in team]),
+                "score": sum(scores[member.id] for member in team) if scores is not None else None,
+            }
+            for team in teams
+        ],
+    }
+
+
+def team_names(result, names):
+    """
+    Attach member names to the teams of a split_result(), for rendering.
+
+    Args:
+        result: Dict from split_result()
+        names: Dict mapping member ID to name; members missing from it are skipped
+
+    Returns:
+        List of team dicts, each with an added names list
+    """
+    return [
+        {**team, "names": [names[member_id] for member_id in team["member_ids"] if member_id in names]}
+        for team in result["teams"]
+    ]
@@ -0,0 +1,227 @@
+"""
+Pair history for group_divider app.
+
+Saves divisions and keeps, per group, a matrix of how often each two members
+shared a team. The matrix is a packed upper-triangular array of unsigned
+16-bit counts: the pair at positions (i, j), i < j, lives at j * (j - 1) / 2 + i,
+so a new member only appends a column and existing cells never move. Each
+saved division updates the stored matrix in place, and the fresh-teams mode
+reads pair counts from it instead of rescanning saved divisions.
+"""
+
+import logging
+import sys
+from array import array
+from collections.abc import Iterable, Sequence
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.models import Member
+
+from ..models import Division, PairHistory
+
+logger = logging.getLogger(__name__)
+
+# Counts saturate instead of wrapping around
+MAX_COUNT = 0xFFFF
+
+
+class PairMatrix:
+    """Packed upper-triangular pair counts over a list of member IDs."""
+
+    def __init__(self, member_ids: Iterable[int] = (), counts: bytes = b""):
+        self.member_ids = list(member_ids)
+        self.index = {member_id: position for position, member_id in enumerate(self.member_ids)}
+        self.counts = array("H")
+        self.counts.frombytes(bytes(counts))
+        # Stored little-endian, whatever the machine
+        if sys.byteorder == "big":
+            self.counts.byteswap()
+        missing = self._cells(len(self.member_ids)) - len(self.counts)
+        if missing > 0:
+            self.counts.extend([0] * missing)
+
+    @staticmethod
+    def _cells(n: int) -> int:
+        return n * (n - 1) // 2
+
+    @staticmethod
+    def _cell(i: int, j: int) -> int:
+        if i > j:
+            i, j = j, i
+        return j * (j - 1) // 2 + i
+
+    @classmethod
+    def from_history(cls, history: PairHistory | None) -> "PairMatrix":
+        if history is None:
+            return cls()
+        return cls(history.member_ids, history.counts)
+
+    def to_bytes(self) -> bytes:
+        counts = array("H", self.counts)
+        if sys.byteorder == "big":
+            counts.byteswap()
+        return counts.tobytes()
+
+    def get(self, a: int, b: int) -> int:
+        """Return how often two members shared a team."""
+        i, j = self.index.get(a), self.index.get(b)
+        if i is None or j is None or i == j:
+            return 0
+        return self.counts[self._cell(i, j)]
+
+    def _position(self, member_id: int) -> int:
+        """Return a member's position, appending a column for new members."""
+        position = self.index.get(member_id)
+        if position is None:
+            position = len(self.member_ids)
+            self.member_ids.append(member_id)
+            self.index[member_id] = position
+            self.counts.extend([0] * position)
+        return position
+
+    def add_teams(self, teams: Iterable[Sequence[int]]) -> None:
+        """Count every two members of each team as having shared a team once more."""
+        for team in teams:
+            positions = [self._position(member_id) for member_id in team]
+            for x, i in enumerate(positions):
+                for j in positions[x + 1 :]:
+                    cell = self._cell(i, j)
+                    if self.counts[cell] < MAX_COUNT:
+                        self.counts[cell] += 1
+
+    def pair_counts(self, member_ids: Iterable[int]) -> dict[tuple[int, int], int]:
+        """
+        Return the non-zero counts among some members.
+
+        Args:
+            member_ids: IDs of the members to look up, e.g. a group's roster
+
+        Returns:
+            Dict mapping (member ID, member ID) to the times they shared a team
+        """
+        known = [(self.index[member_id], member_id) for member_id in member_ids if member_id in self.index]
+        known.sort()
+        counts = self.counts
+        pairs = {}
+        for y, (j, b) in enumerate(known):
+            base = j * (j - 1) // 2
+            for i, a in known[:y]:
+                count = counts[base + i]
+                if count:
+                    pairs[(a, b)] = count
+        return pairs
+
+
+def load_matrix(group_id: int) -> PairMatrix:
+    """Return the pair matrix of a group (empty if it was never divided)."""
+    return PairMatrix.from_history(PairHistory.objects.filter(group_id=group_id).first())
+
+
+@transaction.atomic
+def record_divisions(divisions: list[Division]) -> list[Division]:
+    """
+    Save divisions in one insert and add their pairings to their groups' matrices.
+
+    Costs the same few queries however many groups are involved.
+
+    Args:
+        divisions: Unsaved Division instances
+
+    Returns:
+        The saved divisions
+    """
+    if not divisions:
+        return divisions
+    Division.objects.bulk_create(divisions)
+
+    group_ids = {division.group_id for division in divisions}
+    PairHistory.objects.bulk_create([PairHistory(group_id=group_id) for group_id in group_ids], ignore_conflicts=True)
+    histories = {
+        history.group_id: history for history in PairHistory.objects.select_for_update().filter(group_id__in=group_ids)
+    }
+    matrices = {group_id: PairMatrix.from_history(history) for group_id, history in histories.items()}
+    for division in divisions:
+        matrices[division.group_id].add_teams(division.teams)
+
+    now = timezone.now()
+    for group_id, history in histories.items():
+        history.member_ids = matrices[group_id].member_ids
+        history.counts = matrices[group_id].to_bytes()
+        history.updated_at = now
+    PairHistory.objects.bulk_update(list(histories.values()), ["member_ids", "counts", "updated_at"])
+    return divisions
+
+
+def record_division(
+    group, teams: Sequence[Sequence[int]], group_size: int, user=None, balance_by: str = "", avoid_repeats=False
+) -> Division:
+    """
+    Save one division and add its pairings to the group's matrix.
+
+    Args:
+        group: GroupCreationModel that was divided
+        teams: One list of member IDs per team
+        group_size: Requested members per team
+        user: User who divided the group (optional)
+        balance_by: Score the teams were balanced by, if any
+        avoid_repeats: Whether past pairings were avoided
+
+    Returns:
+        The saved Division
+    """
+    division = Division(
+        group=group,
+        user=user,
+        teams=[list(team) for team in teams],
+        group_size=group_size,
+        balance_by=balance_by,
+        avoid_repeats=avoid_repeats,
+    )
+    return record_divisions([division])[0]
+
+
+@transaction.atomic
+def rebuild_pair_history(group=None, chunk_size: int = 2000) -> int:
+    """
+    Recompute PairHistory from saved divisions.
+
+    Members that no longer exist are dropped, which also compacts the matrix.
+
+    Args:
+        group: Restrict the rebuild to one GroupCreationModel (optional)
+        chunk_size: Divisions fetched per database round trip
+
+    Returns:
+        Number of divisions replayed
+    """
+    divisions = Division.objects.order_by("id")
+    histories = PairHistory.objects.all()
+    members = Member.objects.all()
+    if group is not None:
+        divisions, histories, members = (
+            divisions.filter(group=group),
+            histories.filter(group=group),
+            members.filter(group=group),
+        )
+
+    existing = set(members.values_list("id", flat=True))
+    matrices: dict[int, PairMatrix] = {}
+    replayed = 0
+    for group_id, teams in divisions.values_list("group_id", "teams").iterator(chunk_size=chunk_size):
+        replayed += 1
+        matrix = matrices.setdefault(group_id, PairMatrix())
+        matrix.add_teams([member_id for member_id in team if member_id in existing] for team in teams)
+
+    histories.delete()
+    PairHistory.objects.bulk_create(
+        [
+            PairHistory(group_id=group_id, member_ids=matrix.member_ids, counts=matrix.to_bytes())
+            for group_id, matrix in matrices.items()
+        ],
+        batch_size=chunk_size,
+    )
+
+    logger.info(f"Rebuilt pair history from {replayed} divisions")
+    return replayed
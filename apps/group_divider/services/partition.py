@@ -0,0 +1,361 @@
+"""
+Balanced group division for group_divider app.
+
+Splits a roster into ceil(n / size) groups whose sizes differ by at most one
+and never exceed the requested size, keeping must-link members together and
+cannot-link members apart. Must-link pairs are merged into blocks up front,
+so they always hold; cannot-link pairs are honored whenever the solver finds
+a way to within the size limit. Optionally, repeats of past pairings are
+minimized as well, ranking below both the size balance and cannot-link pairs.
+
+Blocks are placed greedily (largest first, into the group with the fewest
+conflicts, then the fewest members) and the placement is improved by local
+search over block moves and swaps. The search restarts from a fresh shuffle
+until the result is optimal or the time budget runs out, and the best
+placement seen is returned.
+"""
+
+import math
+import random
+import time
+from collections import Counter
+from collections.abc import Callable, Hashable, Iterable, Mapping, Sequence
+from typing import Any
+
+from apps.core.exceptions import ValidationError
+
+DEFAULT_TIME_BUDGET = 0.05
+
+
+def _identity(member: Hashable) -> Hashable:
+    return member
+
+
+def _merge_blocks(n: int, pairs: Iterable[tuple[int, int]]) -> list[list[int]]:
+    """Union must-link pairs of indices into blocks, in first-index order."""
+    parent = list(range(n))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for a, b in pairs:
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    blocks: dict[int, list[int]] = {}
+    for i in range(n):
+        blocks.setdefault(find(i), []).append(i)
+    return list(blocks.values())
+
+
+class _Solver:
+    """
+    Greedy placement plus local search over blocks of members.
+
+    adjacency holds the cost of each two blocks sharing a group, already
+    weighted; size_weight scales the sum of squared group sizes.
+    """
+
+    def __init__(
+        self,
+        sizes: list[int],
+        adjacency: list[Counter],
+        k: int,
+        capacity: int,
+        rng: random.Random,
+        deadline: float,
+        size_weight: int = 1,
+    ):
+        self.sizes = sizes
+        self.adjacency = adjacency
+        self.k = k
+        self.capacity = capacity
+        self.rng = rng
+        self.deadline = deadline
+        self.size_weight = size_weight
+        n = sum(sizes)
+        q, r = divmod(n, k)
+        self.lower_bound = size_weight * (r * (q + 1) ** 2 + (k - r) * q * q)
+
+    def solve(self) -> list[int]:
+        best: list[int] = []
+        best_cost = math.inf
+        while True:
+            assign, loads = self._greedy()
+            cost = self._local_search(assign, loads)
+            if cost < best_cost:
+                best, best_cost = assign, cost
+            if best_cost <= self.lower_bound or time.perf_counter() >= self.deadline:
+                return best
+
+    def _conflicts(self, block: int, assign: list[int]) -> Counter:
+        """Pairing cost between a block and each group."""
+        counts: Counter = Counter()
+        for other, weight in self.adjacency[block].items():
+            if assign[other] >= 0:
+                counts[assign[other]] += weight
+        return counts
+
+    def _greedy(self) -> tuple[list[int], list[int]]:
+        order = list(range(len(self.sizes)))
+        self.rng.shuffle(order)
+        order.sort(key=lambda block: -self.sizes[block])
+
+        assign = [-1] * len(self.sizes)
+        loads = [0] * self.k
+        for block in order:
+            size = self.sizes[block]
+            conflicts = self._conflicts(block, assign)
+            # Scan from a random group so ties do not always go to the first one
+            start = self.rng.randrange(self.k)
+            group = min(
+                ((start + offset) % self.k for offset in range(self.k)),
+                key=lambda g: (loads[g] + size > self.capacity, conflicts[g], loads[g]),
+            )
+            assign[block] = group
+            loads[group] += self.sizes[block]
+        return assign, loads
+
+    def _overfills(self, new_load: int, old_load: int) -> bool:
+        """Whether a change pushes a group past the requested size (or further past it)."""
+        return new_load > self.capacity and new_load > old_load
+
+    def _cost(self, assign: list[int], loads: list[int]) -> int:
+        pairing = sum(
+            weight
+            for block, neighbours in enumerate(self.adjacency)
+            for other, weight in neighbours.items()
+            if block < other and assign[block] == assign[other]
+        )
+        return pairing + self.size_weight * sum(load * load for load in loads)
+
+    def _local_search(self, assign: list[int], loads: list[int]) -> int:
+        cost = self._cost(assign, loads)
+        blocks = list(range(len(self.sizes)))
+        improved = True
+        while improved and cost > self.lower_bound:
+            improved = False
+            self.rng.shuffle(blocks)
+            for block in blocks:
+                if time.perf_counter() >= self.deadline:
+                    return cost
+                delta = self._improve(block, assign, loads)
+                if delta < 0:
+                    cost += delta
+                    improved = True
+                    if cost <= self.lower_bound:
+                        break
+        return cost
+
+    def _improve(self, block: int, assign: list[int], loads: list[int]) -> int:
+        """Apply the best improving move or swap of one block; return the cost change."""
+        group = assign[block]
+        size = self.sizes[block]
+        conflicts = self._conflicts(block, assign)
+        weight = self.size_weight
+
+        best_delta = 0
+        best_move: tuple[int, int | None] | None = None
+        for target in range(self.k):
+            if target == group or loads[target] + size > self.capacity:
+                continue
+            delta = conflicts[target] - conflicts[group] + weight * 2 * size * (loads[target] - loads[group] + size)
+            if delta < best_delta:
+                best_delta, best_move = delta, (target, None)
+
+        # Swaps keep group sizes but can untangle pairings that no single move fixes
+        if conflicts[group]:
+            for other, other_size in enumerate(self.sizes):
+                target = assign[other]
+                if target == group:
+                    continue
+                shared = self.adjacency[block].get(other, 0)
+                other_conflicts = self._conflicts(other, assign)
+                conflict_delta = (
+                    conflicts[target]
+                    - shared
+                    - conflicts[group]
+                    + other_conflicts[group]
+                    - shared
+                    - other_conflicts[target]
+                )
+                new_group_load = loads[group] - size + other_size
+                new_target_load = loads[target] - other_size + size
+                if self._overfills(new_group_load, loads[group]) or self._overfills(new_target_load, loads[target]):
+                    continue
+                size_delta = new_group_load**2 + new_target_load**2 - loads[group] ** 2 - loads[target] ** 2
+                delta = conflict_delta + weight * size_delta
+                if delta < best_delta:
+                    best_delta, best_move = delta, (target, other)
+
+        if best_move is None:
+            return 0
+        target, swap_with = best_move
+        assign[block] = target
+        loads[group] -= size
+        loads[target] += size
+        if swap_with is not None:
+            assign[swap_with] = group
+            loads[target] -= self.sizes[swap_with]
+            loads[group] += self.sizes[swap_with]
+        return best_delta
+
+
+def balanced_split(
+    members: Iterable[Any],
+    group_size: int,
+    must_link: Iterable[tuple[Hashable, Hashable]] = (),
+    cannot_link: Iterable[tuple[Hashable, Hashable]] = (),
+    key: Callable[[Any], Hashable] | None = None,
+    rng: random.Random | None = None,
+    time_budget: float = DEFAULT_TIME_BUDGET,
+    repeat_counts: Mapping[tuple[Hashable, Hashable], int] | None = None,
+) -> list[list[Any]]:
+    """
+    Split members into size-balanced groups that respect link constraints.
+
+    Must-link pairs always end up together. Cannot-link pairs end up apart
+    unless that is impossible; use broken_pairs() to find the ones left.
+    With repeat_counts, the solver then minimizes how often members who
+    already shared a group share one again, weighted by those counts.
+
+    Args:
+        members: Members to divide (any objects)
+        group_size: Maximum members per group; ceil(n / group_size) groups are made
+        must_link: Pairs of member keys that must share a group
+        cannot_link: Pairs of member keys that must not share a group
+        key: Function mapping a member to the key used in constraints (default: the member itself)
+        rng: random.Random instance to draw with (optional, for seeding)
+        time_budget: Seconds the local search may spend improving the placement
+        repeat_counts: Times each pair of member keys already shared a group (optional)
+
+    Returns:
+        List of groups, each a list of members
+
+    Raises:
+        ValidationError: If a constraint names an unknown member, a member is
+            both linked to and kept apart from the same block, or more members
+            must stay together than fit in one group
+    """
+    members = list(members)
+    if group_size < 1:
+        raise ValidationError("Group size must be at least 1.")
+    if not members:
+        return []
+    rng = rng or random.Random()
+    key = key or _identity
+
+    index: dict[Hashable, int] = {}
+    for position, member in enumerate(members):
+        index.setdefault(key(member), position)
+
+    def positions(pairs: Iterable[tuple[Hashable, Hashable]]) -> list[tuple[int, int]]:
+        resolved = []
+        for a, b in pairs:
+            for value in (a, b):
+                if value not in index:
+                    raise ValidationError(f"Unknown member in constraint: {value}.")
+            resolved.append((index[a], index[b]))
+        return resolved
+
+    blocks = _merge_blocks(len(members), positions(must_link))
+    for block in blocks:
+        if len(block) > group_size:
+            raise ValidationError(
+                f"{len(block)} members must stay together, but groups only have room for {group_size}."
+            )
+    block_of = [0] * len(members)
+    for number, block in enumerate(blocks):
+        for position in block:
+            block_of[position] = number
+
+    apart: list[Counter] = [Counter() for _ in blocks]
+    for a, b in positions(cannot_link):
+        block_a, block_b = block_of[a], block_of[b]
+        if block_a == block_b:
+            raise ValidationError(f"{key(members[a])} and {key(members[b])} cannot be both together and apart.")
+        apart[block_a][block_b] += 1
+        apart[block_b][block_a] += 1
+
+    repeats: list[Counter] = [Counter() for _ in blocks]
+    for (first, second), count in (repeat_counts or {}).items():
+        if count > 0 and first in index and second in index:
+            block_a, block_b = block_of[index[first]], block_of[index[second]]
+            if block_a != block_b:
+                repeats[block_a][block_b] += count
+                repeats[block_b][block_a] += count
+
+    # Sizes outweigh every repeat, and a broken cannot-link pair outweighs both
+    total_repeats = sum(sum(counts.values()) for counts in repeats) // 2
+    size_weight = total_repeats + 1
+    apart_weight = size_weight * len(members) ** 2 + total_repeats + 1
+    adjacency = [
+        Counter({other: apart_weight * count for other, count in apart[number].items()}) + repeats[number]
+        for number in range(len(blocks))
+    ]
+
+    k = math.ceil(len(members) / group_size)
+    solver = _Solver(
+        [len(block) for block in blocks],
+        adjacency,
+        k,
+        group_size,
+        rng,
+        time.perf_counter() + time_budget,
+        size_weight=size_weight,
+    )
+    assign = solver.solve()
+
+    groups: list[list[Any]] = [[] for _ in range(k)]
+    for number, block in enumerate(blocks):
+        groups[assign[number]].extend(members[position] for position in block)
+    for group in groups:
+        rng.shuffle(group)
+    return [group for group in groups if group]
+
+
+def broken_pairs(
+    groups: Sequence[Sequence[Any]],
+    cannot_link: Iterable[tuple[Hashable, Hashable]],
+    key: Callable[[Any], Hashable] | None = None,
+) -> list[tuple[Hashable, Hashable]]:
+    """Return the cannot-link pairs that ended up in the same group."""
+    key = key or _identity
+    group_of = {key(member): number for number, group in enumerate(groups) for member in group}
+    return [(a, b) for a, b in cannot_link if a in group_of and group_of[a] == group_of.get(b)]
+
+
+def constraint_pairs(members: Iterable[Any], name_sets: Iterable[Sequence[str]]) -> list[tuple[Any, Any]]:
+    """
+    Turn sets of member names into pairs of member IDs.
+
+    Every two members of a set become a pair, so a set works both as "all of
+    these together" and "all of these apart". Names match case-insensitively;
+    a name shared by several members refers to all of them.
+
+    Args:
+        members: Member objects with id and name
+        name_sets: Sets of names, e.g. from GroupMakerForm
+
+    Raises:
+        ValidationError: If a name matches no member
+    """
+    ids_by_name: dict[str, list[Any]] = {}
+    for member in members:
+        ids_by_name.setdefault(member.name.strip().lower(), []).append(member.id)
+
+    pairs: list[tuple[Any, Any]] = []
+    for names in name_sets:
+        ids = []
+        for name in names:
+            matches = ids_by_name.get(name.strip().lower())
+            if not matches:
+                raise ValidationError(f"No member named '{name}' in this group.")
+            ids.extend(matches)
+        ids = list(dict.fromkeys(ids))
+        pairs.extend((a, b) for i, a in enumerate(ids) for b in ids[i + 1 :])
+    return pairs
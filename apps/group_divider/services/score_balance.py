@@ -0,0 +1,298 @@
+"""
+Score-balanced teams for group_divider app.
+
+Splits members into size-balanced groups whose score totals (net points or
+one point column) are as even as possible. Without link constraints the
+start is an LPT placement: members by descending score, each into the group
+with the lowest total that still has room. With constraints (or past
+pairings to avoid) the start is the placement of partition.balanced_split.
+
+The start is then refined by swaps between the highest (or lowest) scoring
+group and the groups at the other end of the ranking, each swap picking the
+pair whose score difference is closest to half the gap (found by bisection
+over the other group's sorted scores). Swaps never move must-linked members,
+never put cannot-linked members together and never add past pairings, so
+refinement keeps whatever the start honored. Rounds do bounded work and stop when neither extreme
+group can improve or the time budget runs out, so the whole split stays
+near-linear in the number of members.
+"""
+
+import bisect
+import heapq
+import itertools
+import math
+import random
+import time
+from collections.abc import Callable, Hashable, Iterable, Mapping
+from typing import Any
+
+from apps.core.exceptions import ValidationError
+from apps.point_system.models import FieldDefinition
+from apps.point_system.services import ScoreStorage
+
+from .partition import DEFAULT_TIME_BUDGET, balanced_split
+
+# Groups at the other end of the ranking an extreme group tries to swap with per round;
+# bounds a round to constant work, so refinement adds little to the O(n log n) start
+SWAP_WIDTH = 32
+
+
+def _identity(member: Hashable) -> Hashable:
+    return member
+
+
+def lpt_split(
+    members: Iterable[Any], group_size: int, score: Callable[[Any], float], rng: random.Random | None = None
+) -> list[list[Any]]:
+    """
+    Place members by descending score into the lowest-scoring group with room.
+
+    Groups get sizes that differ by at most one, as in balanced_split().
+
+    Args:
+        members: Members to divide
+        group_size: Maximum members per group
+        score: Function mapping a member to its score
+        rng: random.Random instance used to break score ties (optional)
+
+    Returns:
+        List of groups, each a list of members
+    """
+    members = list(members)
+    if group_size < 1:
+        raise ValidationError("Group size must be at least 1.")
+    if not members:
+        return []
+    rng = rng or random.Random()
+    k = math.ceil(len(members) / group_size)
+    q, r = divmod(len(members), k)
+    room = [q + 1 if number < r else q for number in range(k)]
+
+    rng.shuffle(members)
+    members.sort(key=score, reverse=True)
+
+    groups: list[list[Any]] = [[] for _ in range(k)]
+    # (total, random tie-break, group number) of every group that still has room
+    heap = [(0.0, rng.random(), number) for number in range(k)]
+    heapq.heapify(heap)
+    for member in members:
+        total, tie, number = heapq.heappop(heap)
+        groups[number].append(member)
+        room[number] -= 1
+        if room[number]:
+            heapq.heappush(heap, (total + score(member), tie, number))
+    return groups
+
+
+class _Refiner:
+    """Swap refinement of group totals that keeps link constraints intact and adds no repeat pairings."""
+
+    def __init__(self, groups, score, key, locked, apart, repeats, deadline):
+        self.groups = groups
+        self.score = score
+        self.key = key
+        self.locked = locked
+        self.apart = apart
+        self.repeats = repeats
+        self.deadline = deadline
+        self.totals = [sum(score(member) for member in group) for group in groups]
+        # No swap can close a gap smaller than the smallest difference between two scores
+        values = sorted({score(member) for group in groups for member in group})
+        self.step = min((b - a for a, b in zip(values, values[1:], strict=False)), default=math.inf)
+
+        # (total, group number) kept sorted, so the extremes are at either end
+        self.ranked = sorted((total, number) for number, total in enumerate(self.totals))
+
+    def run(self) -> None:
+        if len(self.groups) < 2:
+            return
+        while time.perf_counter() < self.deadline:
+            high, low = self.ranked[-1][1], self.ranked[0][1]
+            # Each generator is dropped as soon as a swap reorders the ranking
+            if not (
+                any(self._swap(high, other) for other in self._closable(self.ranked, high))
+                or any(self._swap(other, low) for other in self._closable(reversed(self.ranked), low))
+            ):
+                return
+
+    def _closable(self, ranked, extreme: int):
+        """
+        Yield up to SWAP_WIDTH group numbers, in ranked order, while their gap
+        to the extreme group is wider than one score step.
+        """
+        for total, other in itertools.islice(ranked, SWAP_WIDTH):
+            if other == extreme:
+                continue
+            if abs(self.totals[extreme] - total) <= self.step:
+                return
+            yield other
+
+    def _allowed(self, member, group, leaving) -> bool:
+        """Whether member may join group once leaving has left it."""
+        banned = self.apart.get(self.key(member))
+        if not banned:
+            return True
+        return not any(other is not leaving and self.key(other) in banned for other in self.groups[group])
+
+    def _repeats(self, member, group, leaving) -> int:
+        """Past pairings member would have in group once leaving has left it."""
+        counts = self.repeats.get(self.key(member))
+        if not counts:
+            return 0
+        return sum(counts.get(self.key(other), 0) for other in self.groups[group] if other is not leaving)
+
+    def _fits(self, member, partner, high: int, low: int) -> bool:
+        """Whether member (in high) and partner (in low) may trade places."""
+        if not (self._allowed(member, low, partner) and self._allowed(partner, high, member)):
+            return False
+        if not self.repeats:
+            return True
+        before = self._repeats(member, high, member) + self._repeats(partner, low, partner)
+        after = self._repeats(member, low, partner) + self._repeats(partner, high, member)
+        return after <= before
+
+    def _swap(self, high: int, low: int) -> bool:
+        """Apply the best total-evening swap from group high to group low; return whether one was made."""
+        gap = self.totals[high] - self.totals[low]
+        if gap <= 0:
+            return False
+        candidates = sorted(
+            (self.score(member), position)
+            for position, member in enumerate(self.groups[low])
+            if self.key(member) not in self.locked
+        )
+        if not candidates:
+            return False
+        scores = [value for value, _ in candidates]
+
+        best: tuple[float, int, int] | None = None
+        for position, member in enumerate(self.groups[high]):
+            if self.key(member) in self.locked:
+                continue
+            value = self.score(member)
+            # The ideal partner closes half the gap: value - partner == gap / 2
+            at = bisect.bisect_left(scores, value - gap / 2)
+            for index in (at - 1, at):
+                if not 0 <= index < len(scores):
+                    continue
+                difference = value - scores[index]
+                if not 0 < difference < gap:
+                    continue
+                miss = abs(gap / 2 - difference)
+                if best is not None and miss >= best[0]:
+                    continue
+                partner = self.groups[low][candidates[index][1]]
+                if self._fits(member, partner, high, low):
+                    best = (miss, position, candidates[index][1])
+        if best is None:
+            return False
+
+        _, position, partner_position = best
+        member, partner = self.groups[high][position], self.groups[low][partner_position]
+        self.groups[high][position], self.groups[low][partner_position] = partner, member
+        difference = self.score(member) - self.score(partner)
+        for number, change in ((high, -difference), (low, difference)):
+            self.ranked.pop(bisect.bisect_left(self.ranked, (self.totals[number], number)))
+            self.totals[number] += change
+            bisect.insort(self.ranked, (self.totals[number], number))
+        return True
+
+
+def score_balanced_split(
+    members: Iterable[Any],
+    group_size: int,
+    score: Callable[[Any], float],
+    must_link: Iterable[tuple[Hashable, Hashable]] = (),
+    cannot_link: Iterable[tuple[Hashable, Hashable]] = (),
+    key: Callable[[Any], Hashable] | None = None,
+    rng: random.Random | None = None,
+    time_budget: float = DEFAULT_TIME_BUDGET,
+    repeat_counts: Mapping[tuple[Hashable, Hashable], int] | None = None,
+) -> list[list[Any]]:
+    """
+    Split members into size-balanced groups with score totals as even as possible.
+
+    Link constraints are honored exactly as by balanced_split(). With
+    repeat_counts, the start avoids past pairings as balanced_split() does
+    and no swap adds to them.
+
+    Args:
+        members: Members to divide
+        group_size: Maximum members per group
+        score: Function mapping a member to its score
+        must_link: Pairs of member keys that must share a group
+        cannot_link: Pairs of member keys that must not share a group
+        key: Function mapping a member to the key used in constraints (default: the member itself)
+        rng: random.Random instance to draw with (optional, for seeding)
+        time_budget: Seconds the placement and refinement may spend in total
+        repeat_counts: Times each pair of member keys already shared a group (optional)
+
+    Returns:
+        List of groups, each a list of members
+    """
+    must_link, cannot_link = list(must_link), list(cannot_link)
+    rng = rng or random.Random()
+    key = key or _identity
+    deadline = time.perf_counter() + time_budget
+
+    if must_link or cannot_link or repeat_counts:
+        # Leave half the budget for the refinement
+        groups = balanced_split(
+            members,
+            group_size,
+            must_link,
+            cannot_link,
+            key=key,
+            rng=rng,
+            time_budget=time_budget / 2,
+            repeat_counts=repeat_counts,
+        )
+    else:
+        groups = lpt_split(members, group_size, score, rng=rng)
+
+    apart: dict[Hashable, set[Hashable]] = {}
+    for a, b in cannot_link:
+        apart.setdefault(a, set()).add(b)
+        apart.setdefault(b, set()).add(a)
+    repeats: dict[Hashable, dict[Hashable, int]] = {}
+    for (a, b), count in (repeat_counts or {}).items():
+        repeats.setdefault(a, {})[b] = count
+        repeats.setdefault(b, {})[a] = count
+    locked = {value for pair in must_link for value in pair}
+    _Refiner(groups, score, key, locked, apart, repeats, deadline).run()
+    return groups
+
+
+def member_scores(group, members: list[Any], balance_by: str) -> dict[int, int]:
+    """
+    Look up the score each member is balanced by.
+
+    Args:
+        group: GroupCreationModel the members belong to
+        members: Member instances of the group
+        balance_by: 'net' for positive minus negative totals, or
+            'field:<id>' for one of the group's numerical columns
+
+    Returns:
+        Dict mapping member ID to score
+
+    Raises:
+        ValidationError: If balance_by names no numerical column of the group
+    """
+    if balance_by == "net":
+        return {member.id: member.positive_total - member.negative_total for member in members}
+
+    prefix, _, field_id = balance_by.partition(":")
+    field = None
+    if prefix == "field" and field_id.isdigit():
+        field = FieldDefinition.objects.filter(group=group, id=int(field_id), type="int").first()
+    if field is None:
+        raise ValidationError("Choose a numerical column of this group to balance by.")
+
+    if ScoreStorage.enabled():
+        ScoreStorage.attach(members)
+    scores = {}
+    for member in members:
+        value = getattr(member, f"{field.definition}_data").get(field.name, 0)
+        scores[member.id] = value if isinstance(value, int) else 0
+    return scores
@@ -0,0 +1,66 @@
+"""Wall-clock benchmarks for the divider; skipped unless pytest runs with --benchmark."""
+
+import random
+import timeit
+
+import pytest
+
+from apps.group_divider.services.pair_history import PairMatrix
+from apps.group_divider.services.partition import balanced_split
+from apps.group_divider.services.score_balance import score_balanced_split
+from apps.group_divider.tests.test_services import random_constraints
+
+
+class TestDividerBenchmark:
+    """Roster sizes 30, 100 and 200 split into groups of 4 with dozens of constraints."""
+
+    @pytest.mark.benchmark
+    def test_constrained_split_is_fast(self):
+        rng = random.Random(2024)
+        for n in (30, 100, 200):
+            members = list(range(n))
+            must_link, cannot_link = random_constraints(n, min(n // 2, 48), rng)
+
+            def run(members=members, must_link=must_link, cannot_link=cannot_link):
+                return balanced_split(members, 4, must_link, cannot_link, rng=random.Random(1))
+
+            constrained = min(timeit.repeat(run, number=5, repeat=3)) / 5
+            assert constrained < 0.1, f"{n} members: {constrained * 1000:.2f} ms constrained"
+
+
+class TestScoreBalanceBenchmark:
+    """Score-balanced teams of 4 for whole year groups of 500 to 8000 members."""
+
+    @pytest.mark.benchmark
+    def test_scales_near_linearly(self):
+        rng = random.Random(11)
+        timings = {}
+        for n in (500, 1000, 2000, 4000, 8000):
+            scores = [rng.randint(0, 200) for _ in range(n)]
+            members = list(range(n))
+
+            def run(members=members, scores=scores):
+                return score_balanced_split(members, 4, scores.__getitem__, rng=random.Random(1), time_budget=1.0)
+
+            timings[n] = min(timeit.repeat(run, number=1, repeat=3))
+
+        # 16x the members: linear is 16x, quadratic would be 256x
+        assert timings[8000] < 40 * timings[500] + 0.05, f"{timings[500]:.4f} s for 500, {timings[8000]:.4f} s for 8000"
+
+
+class TestRepeatAvoidanceBenchmark:
+    """Ten rounds of teams of 4 for 200 members, avoiding repeats from the pair matrix."""
+
+    @pytest.mark.benchmark
+    def test_each_round_within_budget(self):
+        members = list(range(200))
+        matrix = PairMatrix()
+        slowest = 0.0
+        for round_number in range(10):
+            counts = matrix.pair_counts(members)
+            start = timeit.default_timer()
+            teams = balanced_split(members, 4, rng=random.Random(round_number), repeat_counts=counts)
+            slowest = max(slowest, timeit.default_timer() - start)
+            matrix.add_teams(teams)
+
+        assert slowest < 0.1, f"slowest round {slowest * 1000:.1f} ms"
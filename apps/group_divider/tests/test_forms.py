@@ -28,3 +28,16 @@ class TestGroupMakerForm:
     def test_large_size_is_valid(self):
         form = GroupMakerForm(data={"group_id": 1, "size": 100})
         assert form.is_valid()
+
+    def test_constraints_parsed_into_name_sets(self):
+        form = GroupMakerForm(
+            data={"group_id": 1, "size": 2, "keep_together": "Alice, Bob\n\n Cleo ,Dan ", "keep_apart": "Eve,Finn,Gus"}
+        )
+        assert form.is_valid()
+        assert form.cleaned_data["keep_together"] == [["Alice", "Bob"], ["Cleo", "Dan"]]
+        assert form.cleaned_data["keep_apart"] == [["Eve", "Finn", "Gus"]]
+
+    def test_constraint_line_needs_two_names(self):
+        form = GroupMakerForm(data={"group_id": 1, "size": 2, "keep_apart": "Alice"})
+        assert not form.is_valid()
+        assert "keep_apart" in form.errors
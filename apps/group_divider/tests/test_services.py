@@ -1,4 +1,40 @@
-from apps.group_divider.services.group_split import group_split
+import json
+import random
+from io import StringIO
+from operator import attrgetter
+from types import SimpleNamespace
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from apps.core.exceptions import ValidationError
+from apps.group_divider.models import Division, PairHistory
+from apps.group_divider.services.batch import divide_groups
+from apps.group_divider.services.group_split import DEFAULT_COLOR, group_split, split_result, team_names
+from apps.group_divider.services.pair_history import (
+    PairMatrix,
+    load_matrix,
+    rebuild_pair_history,
+    record_division,
+    record_divisions,
+)
+from apps.group_divider.services.partition import balanced_split, broken_pairs, constraint_pairs
+from apps.group_divider.services.score_balance import lpt_split, member_scores, score_balanced_split
+from apps.group_maker.tests.factories import GroupCreationModelFactory
+from apps.point_system.models import FieldDefinition, Member
+from apps.point_system.services import MemberService
+
+
+def random_constraints(n: int, count: int, rng: random.Random):
+    """Random disjoint must-link pairs and cannot-link pairs over n members."""
+    shuffled = list(range(n))
+    rng.shuffle(shuffled)
+    must_link = [(shuffled[i], shuffled[i + 1]) for i in range(0, count, 2)]
+    cannot_link: list[tuple[int, int]] = []
+    while len(cannot_link) < count:
+        a, b = rng.sample(range(n), 2)
+        cannot_link.append((a, b))
+    return must_link, cannot_link
 
 
 class TestGroupSplit:
@@ -46,3 +82,404 @@ class TestGroupSplit:
         flat_results = [tuple(tuple(g) for g in r) for r in results]
         # With 8 members, very unlikely to get same order 10 times
         assert len(set(flat_results)) > 1
+
+    def test_uneven_split_is_balanced(self):
+        members = [f"S{i}" for i in range(31)]
+        result = group_split(members, 5)
+        assert sorted(len(group) for group in result) == [4, 4, 4, 4, 5, 5, 5]
+
+
+class TestBalancedSplit:
+    def test_sizes_differ_by_at_most_one(self):
+        for n, size in [(7, 3), (10, 4), (31, 5), (200, 6)]:
+            result = balanced_split(range(n), size, rng=random.Random(n))
+            lengths = [len(group) for group in result]
+            assert len(result) == -(-n // size)
+            assert max(lengths) - min(lengths) <= 1
+            assert sorted(m for group in result for m in group) == list(range(n))
+
+    def test_empty(self):
+        assert balanced_split([], 3) == []
+
+    def test_invalid_size(self):
+        with pytest.raises(ValidationError):
+            balanced_split(["A"], 0)
+
+    def test_must_link_kept_together(self):
+        members = list("ABCDEFGHIJ")
+        for seed in range(20):
+            result = balanced_split(members, 2, must_link=[("A", "J"), ("C", "D")], rng=random.Random(seed))
+            group_of = {m: i for i, group in enumerate(result) for m in group}
+            assert group_of["A"] == group_of["J"]
+            assert group_of["C"] == group_of["D"]
+
+    def test_cannot_link_kept_apart(self):
+        members = list("ABCDEFGH")
+        apart = [("A", "B"), ("A", "C"), ("B", "C"), ("D", "E")]
+        for seed in range(20):
+            result = balanced_split(members, 4, cannot_link=apart, rng=random.Random(seed))
+            # Two groups cannot hold A, B and C apart: one pair is unavoidable
+            assert len(broken_pairs(result, apart)) == 1
+            assert ("D", "E") not in broken_pairs(result, apart)
+
+    def test_constraints_with_key(self):
+        members = [SimpleNamespace(id=i, name=f"S{i}") for i in range(12)]
+        result = balanced_split(
+            members, 3, must_link=[(0, 1), (1, 2)], cannot_link=[(0, 3), (3, 4)], key=attrgetter("id")
+        )
+        group_of = {m.id: i for i, group in enumerate(result) for m in group}
+        assert group_of[0] == group_of[1] == group_of[2]
+        assert group_of[0] != group_of[3]
+        assert group_of[3] != group_of[4]
+
+    def test_block_too_large(self):
+        with pytest.raises(ValidationError, match="stay together"):
+            balanced_split(list("ABCD"), 2, must_link=[("A", "B"), ("B", "C")])
+
+    def test_contradictory_constraints(self):
+        with pytest.raises(ValidationError, match="both together and apart"):
+            balanced_split(list("ABCD"), 2, must_link=[("A", "B")], cannot_link=[("B", "A")])
+
+    def test_unknown_member(self):
+        with pytest.raises(ValidationError, match="Unknown member"):
+            balanced_split(list("ABCD"), 2, cannot_link=[("A", "Z")])
+
+    def test_seeded_rng_is_reproducible(self):
+        members = list(range(30))
+        apart = [(i, i + 1) for i in range(0, 29, 2)]
+        first = balanced_split(members, 4, cannot_link=apart, rng=random.Random(7))
+        second = balanced_split(members, 4, cannot_link=apart, rng=random.Random(7))
+        assert first == second
+
+    def test_dozens_of_constraints_on_large_rosters(self):
+        rng = random.Random(2024)
+        for n in (30, 100, 200):
+            must_link, cannot_link = random_constraints(n, min(n // 2, 48), rng)
+
+            result = balanced_split(list(range(n)), 4, must_link, cannot_link, rng=random.Random(1))
+
+            lengths = [len(group) for group in result]
+            assert max(lengths) - min(lengths) <= 1
+            assert broken_pairs(result, cannot_link) == []
+
+
+class TestConstraintPairs:
+    def test_all_pairs_of_each_set(self):
+        members = [SimpleNamespace(id=i, name=name) for i, name in enumerate(["Alice", "Bob", "Cleo"])]
+        assert constraint_pairs(members, [["alice", "Bob ", "CLEO"]]) == [(0, 1), (0, 2), (1, 2)]
+
+    def test_unknown_name(self):
+        members = [SimpleNamespace(id=1, name="Alice")]
+        with pytest.raises(ValidationError, match="Zed"):
+            constraint_pairs(members, [["Alice", "Zed"]])
+
+
+def _spread(groups, score):
+    totals = [sum(score(m) for m in group) for group in groups]
+    return max(totals) - min(totals)
+
+
+class TestScoreBalancedSplit:
+    def test_lpt_balances_sizes_and_totals(self):
+        scores = [9, 8, 7, 6, 5, 4, 3, 2, 1, 1, 1, 1]
+        members = list(range(len(scores)))
+        result = lpt_split(members, 4, scores.__getitem__, rng=random.Random(1))
+        assert sorted(len(group) for group in result) == [4, 4, 4]
+        assert sorted(m for group in result for m in group) == members
+
+    def test_totals_nearly_even(self):
+        rng = random.Random(3)
+        scores = [rng.randint(0, 100) for _ in range(60)]
+        members = list(range(60))
+        result = score_balanced_split(members, 4, scores.__getitem__, rng=random.Random(3))
+        assert sorted(len(group) for group in result) == [4] * 15
+        # Uniform groups of 4 would typically spread by ~100; balanced teams by a few points
+        assert _spread(result, scores.__getitem__) <= 5
+
+    def test_refinement_improves_on_lpt_start(self):
+        scores = [10, 10, 9, 9, 8, 7, 6, 6, 5, 2, 1, 1]
+        members = list(range(len(scores)))
+        result = score_balanced_split(members, 3, scores.__getitem__, rng=random.Random(0))
+        assert _spread(result, scores.__getitem__) <= 1
+
+    def test_constraints_still_honored(self):
+        rng = random.Random(5)
+        scores = [rng.randint(0, 50) for _ in range(40)]
+        members = list(range(40))
+        together = [(0, 1), (2, 3)]
+        apart = [(4, 5), (5, 6), (0, 7)]
+        for seed in range(10):
+            result = score_balanced_split(
+                members, 4, scores.__getitem__, must_link=together, cannot_link=apart, rng=random.Random(seed)
+            )
+            group_of = {m: i for i, group in enumerate(result) for m in group}
+            assert group_of[0] == group_of[1]
+            assert group_of[2] == group_of[3]
+            assert broken_pairs(result, apart) == []
+            assert max(len(g) for g in result) - min(len(g) for g in result) <= 1
+
+    def test_empty(self):
+        assert score_balanced_split([], 3, lambda m: 0) == []
+
+    def test_whole_year_groups_nearly_even(self):
+        rng = random.Random(11)
+        for n in (500, 2000, 8000):
+            scores = [rng.randint(0, 200) for _ in range(n)]
+
+            result = score_balanced_split(list(range(n)), 4, scores.__getitem__, rng=random.Random(1), time_budget=1.0)
+
+            totals = [sum(scores[m] for m in group) for group in result]
+            assert max(totals) - min(totals) <= 10
+
+
+@pytest.mark.django_db
+class TestMemberScores:
+    @pytest.fixture
+    def group(self, user):
+        return GroupCreationModelFactory(user=user, members_string="Alice, Bob")
+
+    def test_net_points(self, group):
+        alice, bob = group.members.order_by("id")
+        Member.objects.filter(id=alice.id).update(positive_total=7, negative_total=2)
+        members = list(group.members.order_by("id"))
+        assert member_scores(group, members, "net") == {alice.id: 5, bob.id: 0}
+
+    def test_column(self, group):
+        field = FieldDefinition.objects.create(group=group, name="hw", type="int", definition="positive")
+        alice, bob = group.members.order_by("id")
+        MemberService.update_member_data(alice, positive_data={"hw": 4})
+        members = list(group.members.order_by("id"))
+        assert member_scores(group, members, f"field:{field.id}") == {alice.id: 4, bob.id: 0}
+
+    def test_rejects_text_or_foreign_column(self, group, other_user):
+        text = FieldDefinition.objects.create(group=group, name="notes", type="str", definition="positive")
+        other = GroupCreationModelFactory(user=other_user, members_string="Zed")
+        foreign = FieldDefinition.objects.create(group=other, name="hw", type="int", definition="positive")
+        members = list(group.members.all())
+        for balance_by in (f"field:{text.id}", f"field:{foreign.id}", "field:x", "grades"):
+            with pytest.raises(ValidationError):
+                member_scores(group, members, balance_by)
+
+
+class TestRepeatAvoidance:
+    def test_second_split_repeats_no_pairs(self):
+        members = list(range(12))
+        first = [[0, 1, 2], [3, 4, 5], [6, 7, 8], [9, 10, 11]]
+        matrix = PairMatrix()
+        matrix.add_teams(first)
+        for seed in range(10):
+            result = balanced_split(members, 3, rng=random.Random(seed), repeat_counts=matrix.pair_counts(members))
+            assert sorted(len(group) for group in result) == [3, 3, 3, 3]
+            assert all(matrix.get(a, b) == 0 for group in result for a in group for b in group if a != b)
+
+    def test_cannot_link_outranks_repeats(self):
+        matrix = PairMatrix()
+        matrix.add_teams([[0, 1], [2, 3]])
+        for seed in range(10):
+            result = balanced_split(
+                range(4),
+                2,
+                cannot_link=[(0, 2), (1, 3), (0, 3)],
+                rng=random.Random(seed),
+                repeat_counts=matrix.pair_counts(range(4)),
+            )
+            # Only {0, 1} and {2, 3} keep every pair apart, repeats or not
+            assert sorted(sorted(group) for group in result) == [[0, 1], [2, 3]]
+
+    def test_score_refinement_adds_no_repeats(self):
+        rng = random.Random(8)
+        scores = [rng.randint(0, 30) for _ in range(24)]
+        members = list(range(24))
+        matrix = PairMatrix()
+        matrix.add_teams([members[i : i + 4] for i in range(0, 24, 4)])
+        result = score_balanced_split(
+            members, 4, scores.__getitem__, rng=random.Random(2), repeat_counts=matrix.pair_counts(members)
+        )
+        assert sum(matrix.get(a, b) for group in result for a in group for b in group if a < b) == 0
+
+    def test_ten_rounds_of_a_large_roster_without_repeats(self):
+        members = list(range(200))
+        matrix = PairMatrix()
+        repeats = 0
+        for round_number in range(10):
+            counts = matrix.pair_counts(members)
+            teams = balanced_split(members, 4, rng=random.Random(round_number), repeat_counts=counts)
+            repeats += sum(matrix.get(a, b) > 0 for team in teams for a in team for b in team if a < b)
+            matrix.add_teams(teams)
+
+        assert repeats == 0
+
+
+class TestPairMatrix:
+    def test_counts_pairs_symmetrically(self):
+        matrix = PairMatrix()
+        matrix.add_teams([[10, 20, 30], [40, 50]])
+        matrix.add_teams([[20, 10], [30, 40, 50]])
+        assert matrix.get(10, 20) == matrix.get(20, 10) == 2
+        assert matrix.get(10, 30) == 1
+        assert matrix.get(30, 40) == 1
+        assert matrix.get(10, 50) == 0
+        assert matrix.get(10, 10) == 0
+        assert matrix.get(10, 99) == 0
+
+    def test_packed_upper_triangle_round_trips(self):
+        matrix = PairMatrix()
+        matrix.add_teams([[1, 2, 3, 4]])
+        blob = matrix.to_bytes()
+        assert len(blob) == 2 * 6  # 4 members: 6 cells of 2 bytes
+
+        restored = PairMatrix([1, 2, 3, 4], blob)
+        restored.add_teams([[5, 1]])
+        assert restored.get(1, 5) == 1
+        assert restored.get(3, 4) == 1
+        assert len(restored.to_bytes()) == 2 * 10
+
+    def test_counts_saturate(self):
+        matrix = PairMatrix([1, 2], (0xFFFF).to_bytes(2, "little"))
+        matrix.add_teams([[1, 2]])
+        assert matrix.get(1, 2) == 0xFFFF
+
+    def test_pair_counts_only_nonzero_among_given_members(self):
+        matrix = PairMatrix()
+        matrix.add_teams([[1, 2], [3, 4]])
+        matrix.add_teams([[1, 3]])
+        assert matrix.pair_counts([1, 2, 3]) == {(1, 2): 1, (1, 3): 1}
+
+
+@pytest.mark.django_db
+class TestPairHistory:
+    @pytest.fixture
+    def group(self, user):
+        return GroupCreationModelFactory(user=user, members_string="A, B, C, D")
+
+    def test_record_division_saves_and_updates_matrix(self, user, group):
+        a, b, c, d = group.members.order_by("id").values_list("id", flat=True)
+        record_division(group, [[a, b], [c, d]], 2, user=user)
+        division = record_division(group, [[a, c], [b, d]], 2, user=user, avoid_repeats=True)
+
+        assert Division.objects.filter(group=group).count() == 2
+        assert division.avoid_repeats
+        matrix = load_matrix(group.id)
+        assert matrix.get(a, b) == 1
+        assert matrix.get(b, d) == 1
+        assert matrix.get(a, d) == 0
+
+    def test_record_division_query_count_is_flat(self, user, group, django_assert_max_num_queries):
+        ids = list(group.members.values_list("id", flat=True))
+        record_division(group, [ids[:2], ids[2:]], 2)
+        # Savepoint, division insert, history insert-or-ignore, locked read, update, release
+        with django_assert_max_num_queries(6):
+            record_division(group, [ids[::2], ids[1::2]], 2)
+
+    def test_load_matrix_of_undivided_group_is_empty(self, group):
+        assert load_matrix(group.id).pair_counts(group.members.values_list("id", flat=True)) == {}
+
+    def test_rebuild_matches_incremental_and_drops_deleted_members(self, user, group):
+        a, b, c, d = group.members.order_by("id").values_list("id", flat=True)
+        record_division(group, [[a, b], [c, d]], 2)
+        record_division(group, [[a, c], [b, d]], 2)
+        Member.objects.filter(id=d).delete()
+        PairHistory.objects.all().delete()
+
+        assert rebuild_pair_history(group=group) == 2
+
+        matrix = load_matrix(group.id)
+        assert matrix.member_ids == [a, b, c]
+        assert matrix.get(a, b) == matrix.get(a, c) == 1
+        assert matrix.get(b, d) == 0
+
+    def test_command(self, group):
+        ids = list(group.members.values_list("id", flat=True))
+        record_division(group, [ids[:2], ids[2:]], 2)
+        out = StringIO()
+
+        call_command("rebuild_pair_history", group=group.id, stdout=out)
+
+        assert "Rebuilt pair history from 1 divisions." in out.getvalue()
+
+    def test_command_rejects_unknown_group(self, db):
+        with pytest.raises(CommandError):
+            call_command("rebuild_pair_history", group=999)
+
+
+@pytest.mark.django_db
+class TestDivideGroups:
+    @pytest.fixture
+    def groups(self, user):
+        return [
+            GroupCreationModelFactory(user=user, members_string="A, B, C, D"),
+            GroupCreationModelFactory(user=user, members_string="E, F, G, H, I, J"),
+            GroupCreationModelFactory(user=user, members_string="K, L, M"),
+        ]
+
+    def test_divides_each_group_and_saves_divisions(self, user, groups):
+        results, names = divide_groups(groups, 2, user=user)
+
+        assert [result["group_id"] for result in results] == [group.id for group in groups]
+        assert [len(result["teams"]) for result in results] == [2, 3, 2]
+        for result, group in zip(results, groups, strict=True):
+            member_ids = {member_id for team in result["teams"] for member_id in team["member_ids"]}
+            assert member_ids == set(group.members.values_list("id", flat=True))
+            assert Division.objects.get(id=result["division_id"]).group == group
+            assert all(team["score"] is None for team in result["teams"])
+        assert len(names) == 13
+        assert Division.objects.filter(user=user).count() == 3
+        assert PairHistory.objects.count() == 3
+
+    def test_query_count_does_not_grow_with_groups(self, user, groups, django_assert_max_num_queries):
+        # Members, histories, then savepoint, division insert, history insert-or-ignore,
+        # locked read, update, release
+        with django_assert_max_num_queries(8):
+            divide_groups(groups, 2, user=user, avoid_repeats=True)
+
+    def test_balances_net_points(self, user, groups):
+        first = groups[0]
+        for points, member in zip((10, 10, 0, 0), first.members.order_by("id"), strict=True):
+            Member.objects.filter(id=member.id).update(positive_total=points)
+
+        results, _ = divide_groups([first], 2, balance_by="net")
+
+        assert [team["score"] for team in results[0]["teams"]] == [10, 10]
+
+    def test_avoid_repeats_reads_history(self, user, groups):
+        a, b, c, d = groups[0].members.order_by("id").values_list("id", flat=True)
+        record_division(groups[0], [[a, b], [c, d]], 2)
+
+        results, _ = divide_groups(groups[:1], 2, avoid_repeats=True)
+
+        teams = [set(team["member_ids"]) for team in results[0]["teams"]]
+        assert {a, b} not in teams and {c, d} not in teams
+
+    def test_record_divisions_of_nothing(self, db):
+        assert record_divisions([]) == []
+
+
+class TestSplitResult:
+    def _member(self, id, color="#ff0000"):
+        return SimpleNamespace(id=id, name=f"M{id}", color=color)
+
+    def test_compact_and_json_ready(self):
+        group = SimpleNamespace(id=7, title="Class A")
+        teams = [[self._member(1), self._member(2)], [self._member(3, color="")]]
+
+        result = split_result(group, teams, scores={1: 4, 2: 1, 3: 2})
+
+        assert result == {
+            "group_id": 7,
+            "group_title": "Class A",
+            "teams": [
+                {"member_ids": (1, 2), "color": "#ff0000", "score": 5},
+                {"member_ids": (3,), "color": DEFAULT_COLOR, "score": 2},
+            ],
+        }
+        assert json.loads(json.dumps(result))["teams"][0]["member_ids"] == [1, 2]
+
+    def test_color_is_one_of_the_members(self):
+        team = [self._member(1, "#111111"), self._member(2, "#222222")]
+        result = split_result(SimpleNamespace(id=1, title="A"), [team], rng=random.Random(3))
+        assert result["teams"][0]["color"] in {"#111111", "#222222"}
+        assert result["teams"][0]["score"] is None
+
+    def test_team_names_skips_unknown_members(self):
+        result = {"teams": [{"member_ids": (1, 2), "color": "#000000", "score": None}]}
+        assert team_names(result, {1: "Alice"})[0]["names"] == ["Alice"]
@@ -1,7 +1,14 @@
+import json
+
 import pytest
 from django.urls import reverse
 
+from apps.group_divider.models import Division
+from apps.group_divider.services.pair_history import PairMatrix, load_matrix, record_division
 from apps.group_maker.tests.factories import GroupCreationModelFactory
+from apps.point_system.models import FieldDefinition, Member
+from apps.point_system.services import MemberService
+from apps.users.models import UserStats
 
 
 class TestGroupDividerHomeView:
@@ -32,14 +39,14 @@ class TestGroupDividerHomeView:
     def test_post_splits_group(self, authenticated_client, url, group):
         response = authenticated_client.post(url, {"group_id": group.id, "size": 2})
         assert response.status_code == 200
-        assert "splitted_group" in response.context
-        assert len(response.context["splitted_group"]) == 3  # 6 members / 2 = 3 groups
+        assert "result" in response.context
+        assert len(response.context["result"]["teams"]) == 3  # 6 members / 2 = 3 groups
 
     def test_post_with_different_size(self, authenticated_client, url, group):
         response = authenticated_client.post(url, {"group_id": group.id, "size": 3})
         assert response.status_code == 200
-        assert "splitted_group" in response.context
-        assert len(response.context["splitted_group"]) == 2  # 6 members / 3 = 2 groups
+        assert "result" in response.context
+        assert len(response.context["result"]["teams"]) == 2  # 6 members / 3 = 2 groups
 
     def test_post_returns_selected_group(self, authenticated_client, url, group):
         response = authenticated_client.post(url, {"group_id": group.id, "size": 2})
@@ -59,3 +66,260 @@ class TestGroupDividerHomeView:
         client.login(username="otheruser", password="otherpass123")
         response = client.post(url, {"group_id": group.id, "size": 2})
         assert response.status_code == 404
+
+    def test_post_balances_uneven_split(self, authenticated_client, url, group):
+        response = authenticated_client.post(url, {"group_id": group.id, "size": 4})
+        # 6 members by 4: two groups of 3, not 4 + 2
+        assert [len(team["member_ids"]) for team in response.context["result"]["teams"]] == [3, 3]
+
+    def test_post_honors_constraints(self, authenticated_client, url, group):
+        response = authenticated_client.post(
+            url,
+            {
+                "group_id": group.id,
+                "size": 2,
+                "keep_together": "Alice, Frank",
+                "keep_apart": "Bob, Charlie\nCharlie, Dave",
+            },
+        )
+        groups = [set(team["names"]) for team in response.context["result"]["teams"]]
+        assert {"Alice", "Frank"} in groups
+        assert not any({"Bob", "Charlie"} <= g or {"Charlie", "Dave"} <= g for g in groups)
+        assert response.context["broken_pairs"] == []
+
+    def test_post_reports_unavoidable_broken_pairs(self, authenticated_client, url, group):
+        response = authenticated_client.post(
+            url, {"group_id": group.id, "size": 3, "keep_apart": "Alice, Bob, Charlie"}
+        )
+        assert len(response.context["broken_pairs"]) == 1
+
+    def test_post_unknown_name_shows_error(self, authenticated_client, url, group):
+        response = authenticated_client.post(url, {"group_id": group.id, "size": 2, "keep_apart": "Alice, Zed"})
+        assert "result" not in response.context
+        assert "Zed" in response.context["form"].non_field_errors()[0]
+
+    def test_post_balances_by_net_points(self, authenticated_client, url, group):
+        for points, member in zip([9, 8, 1, 1, 0, 0], group.members.order_by("id"), strict=True):
+            Member.objects.filter(id=member.id).update(positive_total=points)
+        response = authenticated_client.post(url, {"group_id": group.id, "size": 3, "balance_by": "net"})
+        assert sorted(team["score"] for team in response.context["result"]["teams"]) == [9, 10]
+
+    def test_post_balances_by_column(self, authenticated_client, url, group):
+        field = FieldDefinition.objects.create(group=group, name="hw", type="int", definition="positive")
+        for value, member in zip([5, 4, 3, 3, 2, 1], group.members.order_by("id"), strict=True):
+            MemberService.update_member_data(member, positive_data={"hw": value})
+        response = authenticated_client.post(url, {"group_id": group.id, "size": 2, "balance_by": f"field:{field.id}"})
+        assert sorted(team["score"] for team in response.context["result"]["teams"]) == [6, 6, 6]
+
+    def test_post_rejects_unknown_balance_column(self, authenticated_client, url, group):
+        response = authenticated_client.post(url, {"group_id": group.id, "size": 2, "balance_by": "field:999"})
+        assert "result" not in response.context
+        assert response.context["form"].non_field_errors()
+
+    def test_get_lists_score_columns(self, authenticated_client, url, group):
+        field = FieldDefinition.objects.create(group=group, name="hw", type="int", definition="positive")
+        FieldDefinition.objects.create(group=group, name="notes", type="str", definition="positive")
+        response = authenticated_client.get(url)
+        assert response.context["score_columns"] == [field]
+
+    def test_post_saves_nothing(self, authenticated_client, url, group, user):
+        response = authenticated_client.post(url, {"group_id": group.id, "size": 2})
+
+        assert response.context["team_ids"] == [
+            list(team["member_ids"]) for team in response.context["result"]["teams"]
+        ]
+        assert not Division.objects.exists()
+        assert not UserStats.objects.filter(user=user, divider_uses__gt=0).exists()
+
+    def test_post_avoid_repeats_uses_history(self, authenticated_client, url, group):
+        ids = list(group.members.order_by("id").values_list("id", flat=True))
+        record_division(group, [ids[:3], ids[3:]], 3)
+
+        response = authenticated_client.post(url, {"group_id": group.id, "size": 2, "avoid_repeats": "on"})
+
+        matrix = PairMatrix()
+        matrix.add_teams([ids[:3], ids[3:]])
+        teams = [team["member_ids"] for team in response.context["result"]["teams"]]
+        assert all(matrix.get(*team) == 0 for team in teams)
+
+
+class TestDivideApiView:
+    @pytest.fixture
+    def url(self):
+        return reverse("group_divider:api-divide")
+
+    @pytest.fixture
+    def group(self, user):
+        return GroupCreationModelFactory(user=user, members_string="Alice, Bob, Charlie, Dave, Eve, Frank")
+
+    def test_requires_login(self, client, url):
+        response = client.post(url)
+        assert response.status_code == 302
+
+    def test_returns_teams_as_json(self, authenticated_client, url, group, user):
+        response = authenticated_client.post(url, {"group_id": group.id, "size": 2, "keep_apart": "Alice, Bob"})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["group_id"] == group.id
+        assert len(data["teams"]) == 3
+        assert sorted(name for team in data["teams"] for name in team["names"]) == [
+            "Alice",
+            "Bob",
+            "Charlie",
+            "Dave",
+            "Eve",
+            "Frank",
+        ]
+        assert data["broken_pairs"] == []
+
+    def test_reshuffles_save_nothing(self, authenticated_client, url, group, user):
+        for _ in range(3):
+            authenticated_client.post(url, {"group_id": group.id, "size": 2, "avoid_repeats": "on"})
+
+        assert not Division.objects.exists()
+        assert load_matrix(group.id).pair_counts(group.members.values_list("id", flat=True)) == {}
+        assert not UserStats.objects.filter(user=user, divider_uses__gt=0).exists()
+
+    def test_invalid_form(self, authenticated_client, url, group):
+        response = authenticated_client.post(url, {"group_id": group.id, "size": 0})
+        assert response.status_code == 400
+        assert "size" in response.json()["errors"]
+
+    def test_unknown_name(self, authenticated_client, url, group):
+        response = authenticated_client.post(url, {"group_id": group.id, "size": 2, "keep_apart": "Alice, Zed"})
+        assert response.status_code == 400
+        assert "Zed" in response.json()["error"]
+
+    def test_other_users_group_not_found(self, client, other_user, url, group):
+        client.force_login(other_user)
+        response = client.post(url, {"group_id": group.id, "size": 2})
+        assert response.status_code == 404
+
+
+class TestKeepDivisionView:
+    @pytest.fixture
+    def url(self):
+        return reverse("group_divider:api-keep")
+
+    @pytest.fixture
+    def group(self, user):
+        return GroupCreationModelFactory(user=user, members_string="Alice, Bob, Charlie, Dave")
+
+    @pytest.fixture
+    def ids(self, group):
+        return list(group.members.order_by("id").values_list("id", flat=True))
+
+    def _post(self, client, url, group, teams, **data):
+        return client.post(url, {"group_id": group.id, "size": 2, "teams": json.dumps(teams), **data})
+
+    def test_requires_login(self, client, url):
+        response = client.post(url)
+        assert response.status_code == 302
+
+    def test_saves_division_pairs_and_use(self, authenticated_client, url, group, user, ids):
+        response = self._post(authenticated_client, url, group, [ids[:2], ids[2:]], avoid_repeats="on")
+
+        assert response.status_code == 200
+        division = Division.objects.get(id=response.json()["division_id"])
+        assert division.user == user
+        assert division.teams == [ids[:2], ids[2:]]
+        assert division.avoid_repeats
+        assert load_matrix(group.id).get(ids[0], ids[1]) == 1
+        assert UserStats.objects.get(user=user).divider_uses == 1
+
+    @pytest.mark.parametrize("teams", ["not json", "[]", "[[]]", '[["a"]]'])
+    def test_invalid_teams(self, authenticated_client, url, group, teams):
+        response = authenticated_client.post(url, {"group_id": group.id, "size": 2, "teams": teams})
+
+        assert response.status_code == 400
+        assert "teams" in response.json()["errors"]
+
+    def test_rejects_foreign_or_repeated_members(self, authenticated_client, url, group, user, ids):
+        other = GroupCreationModelFactory(user=user, members_string="Zed")
+
+        foreign = self._post(authenticated_client, url, group, [ids[:2], [other.members.get().id]])
+        repeated = self._post(authenticated_client, url, group, [ids[:2], ids[1:]])
+
+        assert foreign.status_code == repeated.status_code == 400
+        assert not Division.objects.exists()
+
+    def test_other_users_group_not_found(self, client, other_user, url, group, ids):
+        client.force_login(other_user)
+        response = self._post(client, url, group, [ids])
+        assert response.status_code == 404
+
+
+class TestBatchDivideView:
+    @pytest.fixture
+    def url(self):
+        return reverse("group_divider:batch")
+
+    @pytest.fixture
+    def groups(self, user):
+        return [
+            GroupCreationModelFactory(user=user, members_string="Alice, Bob, Charlie, Dave"),
+            GroupCreationModelFactory(user=user, members_string="Eve, Frank, Grace"),
+        ]
+
+    def test_requires_login(self, client, url):
+        response = client.get(url)
+        assert response.status_code == 302
+        assert "/login" in response.url
+
+    def test_get_lists_groups(self, authenticated_client, url, groups):
+        response = authenticated_client.get(url)
+        assert response.status_code == 200
+        assert set(groups) <= set(response.context["groups"])
+
+    def test_post_divides_every_group(self, authenticated_client, url, groups, user):
+        response = authenticated_client.post(url, {"groups": [group.id for group in groups], "size": 2})
+
+        results = response.context["results"]
+        assert {result["group_id"] for result in results} == {group.id for group in groups}
+        assert [len(result["teams"]) for result in results] == [2, 2]
+        assert Division.objects.filter(user=user).count() == 2
+        assert UserStats.objects.get(user=user).divider_uses == 2
+        assert response.context["sheet_url"].startswith(reverse("group_divider:batch-sheet"))
+
+    def test_post_rejects_other_users_group(self, authenticated_client, url, groups, other_user):
+        theirs = GroupCreationModelFactory(user=other_user, members_string="Zed, Yan")
+
+        response = authenticated_client.post(url, {"groups": [groups[0].id, theirs.id], "size": 2})
+
+        assert response.context["form"].errors["groups"]
+        assert not Division.objects.exists()
+
+    def test_post_requires_a_group(self, authenticated_client, url, groups):
+        response = authenticated_client.post(url, {"size": 2})
+        assert response.context["form"].errors["groups"]
+        assert response.context["results"] is None
+
+
+class TestBatchSheetView:
+    @pytest.fixture
+    def url(self):
+        return reverse("group_divider:batch-sheet")
+
+    @pytest.fixture
+    def division(self, user):
+        group = GroupCreationModelFactory(user=user, title="Class A", members_string="Alice, Bob")
+        return record_division(group, [list(group.members.values_list("id", flat=True))], 2, user=user)
+
+    def test_downloads_printable_sheet(self, authenticated_client, url, division):
+        response = authenticated_client.get(url, {"division": division.id})
+
+        assert response.status_code == 200
+        assert response["Content-Disposition"].startswith('attachment; filename="teams-')
+        content = response.content.decode()
+        assert "Class A" in content
+        assert "Alice" in content and "Bob" in content
+
+    def test_other_users_division_not_found(self, client, other_user, url, division):
+        client.force_login(other_user)
+        response = client.get(url, {"division": division.id})
+        assert response.status_code == 404
+
+    def test_no_divisions_not_found(self, authenticated_client, url):
+        response = authenticated_client.get(url, {"division": "x"})
+        assert response.status_code == 404
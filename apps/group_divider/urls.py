@@ -1,9 +1,13 @@
 from django.urls import path
 
-from .views import GroupDividerHome
+from .views import BatchDivideView, BatchSheetView, DivideApiView, GroupDividerHome, KeepDivisionView
 
 app_name = "group_divider"
 
 urlpatterns = [
     path("", GroupDividerHome.as_view(), name="home"),
+    path("api/divide/", DivideApiView.as_view(), name="api-divide"),
+    path("api/keep/", KeepDivisionView.as_view(), name="api-keep"),
+    path("batch/", BatchDivideView.as_view(), name="batch"),
+    path("batch/sheet/", BatchSheetView.as_view(), name="batch-sheet"),
 ]
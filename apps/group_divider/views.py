@@ -1,13 +1,71 @@
+from operator import attrgetter
+from urllib.parse import urlencode
+
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, render
-from django.views.generic import TemplateView
+from django.urls import reverse
+from django.utils import timezone
+from django.views.generic import TemplateView, View
 
+from apps.core.exceptions import ValidationError
+from apps.core.models import Member
 from apps.group_maker.models import GroupCreationModel
-from apps.users.models import UserStats
+from apps.group_maker.selectors import get_user_groups
+from apps.users.services import UsageCounters
 
-from .forms import GroupMakerForm
-from .services.group_split import get_split_group_color
+from .forms import BatchDivideForm, GroupMakerForm, KeepDivisionForm
+from .models import Division
+from .selectors import get_score_columns
+from .services.batch import divide_groups
 from .services.group_split import group_split as group_split_f
+from .services.group_split import split_result, team_names
+from .services.pair_history import load_matrix, record_division
+from .services.partition import broken_pairs, constraint_pairs
+from .services.score_balance import member_scores
+
+
+def _divide(request, form):
+    """
+    Divide the group chosen in a valid GroupMakerForm.
+
+    Nothing is saved: the result is only a proposal until the teacher keeps
+    it through KeepDivisionView, so discarded shuffles never reach the pair
+    history or the usage counters.
+
+    Returns:
+        Tuple of the group, its split_result() with member names attached to the
+        teams, and the names of cannot-link pairs that had to stay together
+
+    Raises:
+        ValidationError: If the constraints or the balance column do not fit the group
+    """
+    size = form.cleaned_data["size"]
+    group = get_object_or_404(GroupCreationModel, id=form.cleaned_data["group_id"], user=request.user)
+    members = list(group.get_members())
+    must_link = constraint_pairs(members, form.cleaned_data["keep_together"])
+    cannot_link = constraint_pairs(members, form.cleaned_data["keep_apart"])
+    repeat_counts = None
+    if form.cleaned_data["avoid_repeats"]:
+        repeat_counts = load_matrix(group.id).pair_counts(member.id for member in members)
+    scores = None
+    if form.cleaned_data["balance_by"]:
+        scores = member_scores(group, members, form.cleaned_data["balance_by"])
+    teams = group_split_f(
+        members,
+        size,
+        must_link,
+        cannot_link,
+        key=attrgetter("id"),
+        score=(lambda member: scores[member.id]) if scores is not None else None,
+        repeat_counts=repeat_counts,
+    )
+
+    result = split_result(group, teams, scores)
+    names = {member.id: member.name for member in members}
+    result["teams"] = team_names(result, names)
+    broken = broken_pairs(teams, cannot_link, key=attrgetter("id"))
+    return group, result, [(names[a], names[b]) for a, b in broken]
 
 
 class GroupDividerHome(LoginRequiredMixin, TemplateView):
@@ -16,34 +74,153 @@ class GroupDividerHome(LoginRequiredMixin, TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["groups"] = GroupCreationModel.objects.filter(user=self.request.user)
+        context["groups"] = get_user_groups(self.request.user)
+        context["score_columns"] = get_score_columns(self.request.user)
         context["form"] = self.form_class()
         return context
 
+    def _render(self, request, form, **context):
+        context["groups"] = get_user_groups(request.user)
+        context["score_columns"] = get_score_columns(request.user)
+        return render(request, self.template_name, {"form": form, **context})
+
     def post(self, request, *args, **kwargs):
         form = self.form_class(request.POST)
 
         if form.is_valid():
-            selected_group_id = form.cleaned_data["group_id"]
-            selected_group_size = form.cleaned_data["size"]
-            selected_group = get_object_or_404(GroupCreationModel, id=selected_group_id, user=request.user)
-            members = list(selected_group.get_members())
-            raw_splitted_group = group_split_f(members, selected_group_size)
-            groups = GroupCreationModel.objects.filter(user=self.request.user)
-
-            stats, _ = UserStats.objects.get_or_create(user=request.user)
-            stats.divider_uses += 1
-            stats.save(update_fields=["divider_uses"])
-            colored_splitted_groups = get_split_group_color(raw_splitted_group)
-            return render(
-                request,
-                "group_divider/home.html",
-                {
-                    "form": form,
-                    "splitted_group": colored_splitted_groups,
-                    "selected_group": selected_group,
-                    "groups": groups,
-                },
-            )
-        groups = GroupCreationModel.objects.filter(user=request.user)
-        return render(request, "group_divider/home.html", {"form": form, "groups": groups})
+            try:
+                selected_group, result, broken = _divide(request, form)
+            except ValidationError as e:
+                form.add_error(None, str(e))
+            else:
+                return self._render(
+                    request,
+                    form,
+                    result=result,
+                    selected_group=selected_group,
+                    broken_pairs=broken,
+                    team_ids=[list(team["member_ids"]) for team in result["teams"]],
+                )
+        return self._render(request, form)
+
+
+class DivideApiView(LoginRequiredMixin, View):
+    """
+    Divide a group and return the teams as JSON, so the page can re-shuffle without reloading.
+
+    Side-effect free like the page's own divide; see KeepDivisionView.
+    """
+
+    def post(self, request, *args, **kwargs):
+        form = GroupMakerForm(request.POST)
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors.get_json_data()}, status=400)
+        try:
+            _, result, broken = _divide(request, form)
+        except ValidationError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+        return JsonResponse({**result, "broken_pairs": broken})
+
+
+class KeepDivisionView(LoginRequiredMixin, View):
+    """Save the split the teacher decided to use and count it as one divider use."""
+
+    def post(self, request, *args, **kwargs):
+        form = KeepDivisionForm(request.POST)
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors.get_json_data()}, status=400)
+
+        group = get_object_or_404(GroupCreationModel, id=form.cleaned_data["group_id"], user=request.user)
+        teams = form.cleaned_data["teams"]
+        member_ids = [member_id for team in teams for member_id in team]
+        if len(set(member_ids)) != len(member_ids) or not set(member_ids) <= set(
+            group.members.values_list("id", flat=True)
+        ):
+            return JsonResponse({"error": "The teams do not match the group's members."}, status=400)
+
+        division = record_division(
+            group,
+            teams,
+            form.cleaned_data["size"],
+            user=request.user,
+            balance_by=form.cleaned_data["balance_by"],
+            avoid_repeats=form.cleaned_data["avoid_repeats"],
+        )
+        UsageCounters.increment(request.user.id, "divider_uses")
+        return JsonResponse({"division_id": division.id})
+
+
+class BatchDivideView(LoginRequiredMixin, TemplateView):
+    template_name = "group_divider/batch.html"
+    form_class = BatchDivideForm
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["groups"] = get_user_groups(self.request.user)
+        context["form"] = self.form_class(user=self.request.user)
+        return context
+
+    @staticmethod
+    def _sheet_url(results):
+        query = urlencode({"division": [result["division_id"] for result in results]}, doseq=True)
+        return f"{reverse('group_divider:batch-sheet')}?{query}"
+
+    def post(self, request, *args, **kwargs):
+        form = self.form_class(request.POST, user=request.user)
+        results = None
+
+        if form.is_valid():
+            try:
+                results, names = divide_groups(
+                    form.cleaned_data["groups"],
+                    form.cleaned_data["size"],
+                    user=request.user,
+                    balance_by=form.cleaned_data["balance_by"],
+                    avoid_repeats=form.cleaned_data["avoid_repeats"],
+                )
+            except ValidationError as e:
+                form.add_error(None, str(e))
+            else:
+                # One stats update for the whole batch
+                UsageCounters.increment(request.user.id, "divider_uses", len(results))
+                for result in results:
+                    result["teams"] = team_names(result, names)
+
+        return render(
+            request,
+            self.template_name,
+            {
+                "form": form,
+                "groups": get_user_groups(request.user),
+                "results": results,
+                "sheet_url": self._sheet_url(results) if results else None,
+            },
+        )
+
+
+class BatchSheetView(LoginRequiredMixin, View):
+    """Printable sheet of saved divisions, downloaded as a standalone HTML file."""
+
+    template_name = "group_divider/batch_sheet.html"
+
+    def get(self, request, *args, **kwargs):
+        ids = [value for value in request.GET.getlist("division") if value.isdigit()]
+        divisions = list(
+            Division.objects.filter(id__in=ids, group__user=request.user).select_related("group").order_by("id")
+        )
+        if not divisions:
+            raise Http404("No divisions to print.")
+
+        member_ids = {member_id for division in divisions for team in division.teams for member_id in team}
+        names = dict(Member.objects.filter(id__in=member_ids).values_list("id", "name"))
+        sheets = [
+            {
+                "division": division,
+                "teams": [[names[member_id] for member_id in team if member_id in names] for team in division.teams],
+            }
+            for division in divisions
+        ]
+
+        response = render(request, self.template_name, {"sheets": sheets})
+        response["Content-Disposition"] = f'attachment; filename="teams-{timezone.localdate():%Y-%m-%d}.html"'
+        return response
@@ -16,3 +16,14 @@ class GroupCreationForm(forms.ModelForm):
                 "unique": "A group with this name already exists. Please choose a different name.",
             },
         }
+
+
+class RosterImportForm(forms.Form):
+    DELIMITER_CHOICES = [
+        ("", "Detect automatically"),
+        (",", "Comma (CSV)"),
+        ("\t", "Tab (TSV)"),
+    ]
+
+    roster = forms.FileField(widget=forms.ClearableFileInput(attrs={"accept": ".csv,.tsv,.txt"}))
+    delimiter = forms.ChoiceField(choices=DELIMITER_CHOICES, required=False)
@@ -1,7 +1,8 @@
-from django.apps import apps
 from django.conf import settings
 from django.db import models
 
+from .services import member_sync
+
 
 class GroupCreationModel(models.Model):
     """Model for creating and managing groups of members."""
@@ -50,49 +51,5 @@ class GroupCreationModel(models.Model):
         two separate Member records are created for John (with different IDs).
 
         Note: This is also called automatically via post_save signal.
-        Use apps.get_model() to avoid circular imports.
         """
-        from collections import Counter
-
-        try:
-            Member = apps.get_model("core", "Member")
-            FieldDefinition = apps.get_model("point_system", "FieldDefinition")
-        except LookupError:
-            # core or point_system app not installed
-            return
-
-        current_names = self.get_members_list()
-        current_name_counts = Counter(current_names)
-
-        existing_members = list(self.members.all())
-        existing_name_counts = Counter(m.name for m in existing_members)
-
-        # Delete members that are no longer needed (or have too many)
-        for member in existing_members:
-            if existing_name_counts[member.name] > current_name_counts.get(member.name, 0):
-                member.delete()
-                existing_name_counts[member.name] -= 1
-
-        # Fetch field definitions once for creating new members
-        positive_fields = list(FieldDefinition.objects.filter(group=self, definition="positive"))
-        negative_fields = list(FieldDefinition.objects.filter(group=self, definition="negative"))
-
-        # existing_name_counts is already up-to-date from the deletion loop above
-        for name in current_names:
-            needed = current_name_counts[name]
-            have = existing_name_counts.get(name, 0)
-
-            if have < needed:
-                member = Member.objects.create(group=self, name=name)
-
-                member.positive_data = {}
-                for field in positive_fields:
-                    member.positive_data[field.name] = 0 if field.type == "int" else ""
-
-                member.negative_data = {}
-                for field in negative_fields:
-                    member.negative_data[field.name] = 0 if field.type == "int" else ""
-
-                member.assign_color()
-                member.save()
-                existing_name_counts[name] = have + 1
+        return member_sync.sync_members(self)
@@ -0,0 +1,69 @@
+"""
+Selectors for group_maker app.
+
+Shared group listing used by the group pickers of every tool. Groups come
+back annotated with live member counts, last activity and net points from a
+single aggregate query, and the result is cached per user until one of the
+user's groups or members changes. Invalidation deletes the cached listing,
+so it relies on the cache being shared by all worker processes (see CACHES).
+"""
+
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import Coalesce
+
+from apps.users.selectors import invalidate_dashboard
+
+from .models import GroupCreationModel
+
+logger = logging.getLogger(__name__)
+
+
+def _user_groups_key(user_id: int) -> str:
+    return f"group_maker:user_groups:{user_id}"
+
+
+def get_user_groups(user) -> list[GroupCreationModel]:
+    """
+    Get all groups owned by a user, newest first.
+
+    Each group carries member_count, last_activity (latest member update, or
+    the group's creation time when it has none) and total_points (positive
+    minus negative totals of its members).
+
+    Args:
+        user: User instance
+
+    Returns:
+        List of annotated GroupCreationModel instances
+    """
+    key = _user_groups_key(user.pk)
+    groups: list[GroupCreationModel] | None = cache.get(key)
+    if groups is None:
+        groups = list(
+            GroupCreationModel.objects.filter(user=user)
+            .annotate(
+                member_count=Count("members"),
+                last_activity=Coalesce(Max("members__updated_at"), "created"),
+                total_points=Coalesce(Sum("members__positive_total"), 0) - Coalesce(Sum("members__negative_total"), 0),
+            )
+            .order_by("-created", "-id")
+        )
+        cache.set(key, groups, getattr(settings, "USER_GROUPS_CACHE_TIMEOUT", 60 * 60))
+    return groups
+
+
+def invalidate_user_groups(user_id: int) -> None:
+    """Drop the cached group listing of a user, and the dashboard numbers built from the same groups."""
+    cache.delete(_user_groups_key(user_id))
+    invalidate_dashboard(user_id)
+
+
+def invalidate_group_owner(group_id: int) -> None:
+    """Drop the cached group listing of whoever owns a group."""
+    user_id = GroupCreationModel.objects.filter(id=group_id).values_list("user_id", flat=True).first()
+    if user_id is not None:
+        invalidate_user_groups(user_id)
@@ -0,0 +1,95 @@
+"""
+Member sync engine for group_maker app.
+
+Brings a group's Member rows in line with its members_string using a
+multiset diff: one DELETE for surplus members and one bulk INSERT for new
+ones, regardless of roster size.
+"""
+
+import logging
+from collections import Counter
+
+from django.apps import apps
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+@transaction.atomic
+def sync_members(group) -> tuple[int, int]:
+    """
+    Sync Member records with the group's current members_string.
+
+    Handles duplicate names correctly - if a user enters "John, Alice, John",
+    two separate Member records are created for John (with different IDs).
+    Surplus members are removed oldest first; new members get wheel colors
+    from a running counter and default values for every point column.
+
+    Uses apps.get_model() to avoid circular imports. Cached group listings
+    are not touched here; the group's post_save receiver invalidates the
+    owner's listing once after the sync.
+
+    Args:
+        group: GroupCreationModel instance
+
+    Returns:
+        Tuple of (created, deleted) member counts
+    """
+    try:
+        Member = apps.get_model("core", "Member")
+        FieldDefinition = apps.get_model("point_system", "FieldDefinition")
+    except LookupError:
+        # core or point_system app not installed
+        logger.debug("core/point_system app not available, skipping member sync")
+        return 0, 0
+
+    current_names = group.get_members_list()
+    existing = list(Member.objects.filter(group=group).order_by("id").values_list("id", "name"))
+
+    # Positive counts are members to delete, negative counts are members to create
+    surplus = Counter(name for _, name in existing)
+    surplus.subtract(current_names)
+
+    # Delete members that are no longer needed (or have too many), oldest first
+    delete_ids = []
+    kept = 0
+    for member_id, name in existing:
+        if surplus[name] > 0:
+            delete_ids.append(member_id)
+            surplus[name] -= 1
+        else:
+            kept += 1
+    if delete_ids:
+        Member.objects.filter(id__in=delete_ids).delete()
+
+    # Names still missing after the diff (negative surplus), in roster order
+    missing = Counter({name: -count for name, count in surplus.items() if count < 0})
+    new_names = []
+    for name in current_names:
+        if missing[name] > 0:
+            new_names.append(name)
+            missing[name] -= 1
+
+    if new_names:
+        defaults: dict[str, dict] = {"positive": {}, "negative": {}}
+        for name, field_type, definition in FieldDefinition.objects.filter(group=group).values_list(
+            "name", "type", "definition"
+        ):
+            defaults[definition][name] = 0 if field_type == "int" else ""
+
+        colors = Member.WHEEL_COLORS
+        Member.objects.bulk_create(
+            [
+                Member(
+                    group=group,
+                    name=name,
+                    color=colors[(kept + index) % len(colors)],
+                    positive_data=dict(defaults["positive"]),
+                    negative_data=dict(defaults["negative"]),
+                )
+                for index, name in enumerate(new_names)
+            ]
+        )
+
+    logger.debug(f"Synced members of group {group.title}: {len(new_names)} created, {len(delete_ids)} deleted")
+    return len(new_names), len(delete_ids)
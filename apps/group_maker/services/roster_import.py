@@ -0,0 +1,201 @@
+"""
+Roster import for group_maker app.
+
+Streams a CSV/TSV roster (name, optional color, optional initial score per
+point column) into a group's members. Rows are parsed lazily and inserted
+in fixed-size bulk_create batches inside one transaction, so memory stays
+flat however many students are imported.
+"""
+
+import csv
+import io
+import itertools
+import logging
+import re
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from django.apps import apps
+from django.db import transaction
+
+from apps.core.exceptions import ValidationError
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+COLOR_RE = re.compile(r"^#[0-9a-fA-F]{6}$")
+
+
+def open_upload(upload) -> io.TextIOWrapper:
+    """Wrap an uploaded file as a streaming UTF-8 text file (a leading BOM is dropped)."""
+    return io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+
+
+def iter_roster_rows(lines: Iterable[str], delimiter: str | None = None) -> Iterator[dict[str, str]]:
+    """
+    Lazily parse roster lines into dicts keyed by lower-cased header.
+
+    Args:
+        lines: Text lines (an open file or any iterable of strings)
+        delimiter: ',' or '\\t'; detected from the header line when None
+
+    Yields:
+        One dict per non-empty row, with the 1-based line number under '__line__'
+    """
+    lines = iter(lines)
+    header_line = next(lines, "")
+    if not header_line.strip():
+        raise ValidationError("The roster is empty.")
+    if delimiter is None:
+        delimiter = "\t" if "\t" in header_line else ","
+
+    reader = csv.reader(itertools.chain([header_line], lines), delimiter=delimiter)
+    header = [column.strip().lower() for column in next(reader)]
+    if "name" not in header:
+        raise ValidationError("The roster needs a 'name' column.")
+
+    for row in reader:
+        if not any(cell.strip() for cell in row):
+            continue
+        values = {column: (row[index].strip() if index < len(row) else "") for index, column in enumerate(header)}
+        values["__line__"] = str(reader.line_num)
+        yield values
+
+
+def _column_map(group, header: Iterable[str]) -> dict[str, Any]:
+    """
+    Map score headers to the group's FieldDefinitions.
+
+    A header matches a column by name, or as 'positive:<name>' / 'negative:<name>'
+    when the same name exists in both tables.
+    """
+    FieldDefinition = apps.get_model("point_system", "FieldDefinition")
+    fields = list(FieldDefinition.objects.filter(group=group))
+
+    by_name: dict[str, list] = {}
+    lookup: dict[str, Any] = {}
+    for field in fields:
+        by_name.setdefault(field.name.lower(), []).append(field)
+        lookup[f"{field.definition}:{field.name.lower()}"] = field
+    for name, matches in by_name.items():
+        if len(matches) == 1:
+            lookup[name] = matches[0]
+
+    columns = {}
+    unknown = []
+    for column in header:
+        if column in ("name", "color", "__line__"):
+            continue
+        if column in lookup:
+            columns[column] = lookup[column]
+        else:
+            unknown.append(column)
+    if unknown:
+        raise ValidationError(f"Unknown roster columns: {', '.join(unknown)}.")
+    return {"columns": columns, "fields": fields}
+
+
+@transaction.atomic
+def import_roster(group, rows: Iterable[dict[str, str]], batch_size: int = BATCH_SIZE) -> int:
+    """
+    Append roster rows to a group as new members.
+
+    Numeric scores are clamped at zero and recorded as opening ledger events;
+    members without a valid color get the next wheel color. Any invalid row
+    rolls back the whole import.
+
+    Args:
+        group: GroupCreationModel instance to import into
+        rows: Parsed rows, e.g. from iter_roster_rows()
+        batch_size: Members inserted per bulk_create
+
+    Returns:
+        Number of members imported
+    """
+    from apps.point_system.services import LedgerService, ScoreStorage
+
+    Member = apps.get_model("core", "Member")
+    PointEvent = apps.get_model("point_system", "PointEvent")
+
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return 0
+    mapping = _column_map(group, first.keys())
+    columns = mapping["columns"]
+
+    defaults: dict[str, dict[str, Any]] = {"positive": {}, "negative": {}}
+    for field in mapping["fields"]:
+        defaults[field.definition][field.name] = 0 if field.type == "int" else ""
+
+    max_name_length = Member._meta.get_field("name").max_length
+    colors = Member.WHEEL_COLORS
+    color_index = Member.objects.filter(group=group).count()
+    imported_names: list[str] = []
+    batch: list = []
+
+    def flush() -> None:
+        Member.objects.bulk_create(batch)
+        events = [
+            PointEvent(member=member, field_name=name, definition=definition, delta=value)
+            for member in batch
+            for definition in ("positive", "negative")
+            for name, value in getattr(member, f"{definition}_data").items()
+            if isinstance(value, int) and value
+        ]
+        LedgerService.record(events)
+        if ScoreStorage.enabled():
+            ScoreStorage.write(batch)
+        batch.clear()
+
+    for row in itertools.chain([first], rows):
+        name = row.get("name", "")
+        if not name:
+            raise ValidationError(f"Line {row['__line__']}: missing name.")
+        if "," in name or "\n" in name:
+            raise ValidationError(f"Line {row['__line__']}: names cannot contain commas or line breaks.")
+        if len(name) > max_name_length:
+            raise ValidationError(f"Line {row['__line__']}: names can be at most {max_name_length} characters long.")
+
+        data = {"positive": dict(defaults["positive"]), "negative": dict(defaults["negative"])}
+        for column, field in columns.items():
+            raw = row.get(column, "")
+            if field.type != "int":
+                data[field.definition][field.name] = raw
+            elif raw:
+                try:
+                    data[field.definition][field.name] = max(0, int(raw))
+                except ValueError:
+                    raise ValidationError(
+                        f"Line {row['__line__']}: '{raw}' is not a whole number for column '{field.name}'."
+                    ) from None
+
+        color = row.get("color", "")
+        if not COLOR_RE.match(color):
+            color = colors[color_index % len(colors)]
+        color_index += 1
+
+        batch.append(
+            Member(
+                group=group,
+                name=name,
+                color=color,
+                positive_data=data["positive"],
+                negative_data=data["negative"],
+                positive_total=sum(v for v in data["positive"].values() if isinstance(v, int)),
+                negative_total=sum(v for v in data["negative"].values() if isinstance(v, int)),
+            )
+        )
+        imported_names.append(name)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    # Keep members_string in step so the next sync leaves the imported members alone
+    existing = group.members_string.strip().rstrip(",")
+    group.members_string = ", ".join(filter(None, [existing, ", ".join(imported_names)]))
+    group.save()
+
+    logger.info(f"Imported {len(imported_names)} members into group {group.title}")
+    return len(imported_names)
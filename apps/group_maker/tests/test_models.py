@@ -101,3 +101,66 @@ class TestGroupSignals:
         # Bob should be removed, Charlie added
         member_names = set(group.karma_members.values_list("name", flat=True))
         assert member_names == {"Alice", "Charlie"}
+
+    def test_duplicate_names_create_separate_members(self, user):
+        """Test that repeated names become separate members."""
+        group = GroupCreationModel.objects.create(user=user, title="Dupes", members_string="John, Alice, John")
+
+        assert sorted(group.members.values_list("name", flat=True)) == ["Alice", "John", "John"]
+
+    def test_surplus_duplicates_are_removed_oldest_first(self, user):
+        """Test that shrinking a duplicate name removes the oldest member."""
+        group = GroupCreationModel.objects.create(user=user, title="Dupes", members_string="John, John, Alice")
+        newest_john = group.members.filter(name="John").order_by("id").last()
+
+        group.members_string = "John, Alice"
+        group.save()
+
+        assert list(group.members.filter(name="John").values_list("id", flat=True)) == [newest_john.id]
+
+    def test_new_members_get_running_colors_and_column_defaults(self, user):
+        """Test that new members continue the wheel color sequence and get point defaults."""
+        from apps.core.models import Member
+        from apps.point_system.models import FieldDefinition
+
+        group = GroupCreationModel.objects.create(user=user, title="Colors", members_string="A, B")
+        FieldDefinition.objects.create(group=group, name="homework", type="int", definition="positive")
+        FieldDefinition.objects.create(group=group, name="notes", type="str", definition="negative")
+
+        group.members_string = "A, B, C, D"
+        group.save()
+
+        members = list(group.members.order_by("id"))
+        assert [m.color for m in members] == Member.WHEEL_COLORS[:4]
+        assert members[2].positive_data == {"homework": 0}
+        assert members[3].negative_data == {"notes": ""}
+
+    def test_sync_query_count_is_constant(self, user):
+        """Test that growing or shrinking a roster does not issue queries per member."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        def sync_query_count(before, after):
+            group = GroupCreationModel.objects.create(
+                user=user, title=f"Roster {before}-{after}", members_string=", ".join(before)
+            )
+            group.members_string = ", ".join(after)
+
+            with CaptureQueriesContext(connection) as ctx:
+                group.save()
+            statements = [q["sql"] for q in ctx.captured_queries]
+            # bulk_create and cascaded deletes may split into a few batches on backends with parameter limits
+            batched = [sql for sql in statements if sql.startswith(("INSERT", "DELETE"))]
+            assert len(batched) <= 20
+            assert group.members.count() == len(after)
+            return len(statements) - len(batched)
+
+        def roster(size):
+            return [f"Student {i}" for i in range(size)]
+
+        grow = [sync_query_count(["Seed"], roster(size)) for size in (5, 500)]
+        shrink = [sync_query_count(roster(size), ["Student 0"]) for size in (5, 200)]
+
+        assert grow[0] == grow[1]
+        assert shrink[0] == shrink[1]
+        assert shrink[1] <= grow[1]
@@ -0,0 +1,91 @@
+"""Tests for group_maker app selectors."""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.group_maker import selectors, signals
+from apps.group_maker.models import GroupCreationModel
+from apps.point_system.models import FieldDefinition
+from apps.point_system.services import MemberService
+
+
+@pytest.mark.django_db
+class TestGetUserGroups:
+    """Tests for the shared, cached group listing."""
+
+    def test_annotates_counts_activity_and_points(self, user, group):
+        FieldDefinition.objects.create(group=group, name="hw", type="int", definition="positive")
+        FieldDefinition.objects.create(group=group, name="late", type="int", definition="negative")
+        alice, bob, _ = group.members.order_by("id")
+        MemberService.update_member_data(alice, positive_data={"hw": 5}, negative_data={"late": 1})
+        MemberService.update_member_data(bob, positive_data={"hw": 2})
+
+        [listed] = selectors.get_user_groups(user)
+
+        alice.refresh_from_db()
+        assert listed.member_count == 3
+        assert listed.total_points == 6
+        assert listed.last_activity >= alice.updated_at
+
+    def test_group_without_members_falls_back_to_created(self, user, group):
+        group.members.all().delete()
+        selectors.invalidate_user_groups(user.id)
+
+        [listed] = selectors.get_user_groups(user)
+
+        assert listed.member_count == 0
+        assert listed.total_points == 0
+        assert listed.last_activity == listed.created
+
+    def test_single_query_then_cached(self, user):
+        for index in range(5):
+            GroupCreationModel.objects.create(user=user, title=f"G{index}", members_string="A, B")
+
+        with CaptureQueriesContext(connection) as first:
+            groups = selectors.get_user_groups(user)
+        with CaptureQueriesContext(connection) as second:
+            selectors.get_user_groups(user)
+
+        assert len(groups) == 5
+        assert len(first) == 1
+        assert len(second) == 0
+
+    def test_group_save_and_delete_invalidate(self, user, group):
+        selectors.get_user_groups(user)
+
+        group.members_string = "Alice, Bob, Charlie, Dana"
+        group.save()
+        assert selectors.get_user_groups(user)[0].member_count == 4
+
+        group.delete()
+        assert selectors.get_user_groups(user) == []
+
+    def test_point_write_invalidates(self, user, group):
+        FieldDefinition.objects.create(group=group, name="hw", type="int", definition="positive")
+        assert selectors.get_user_groups(user)[0].total_points == 0
+
+        MemberService.update_member_data(group.members.first(), positive_data={"hw": 4})
+
+        assert selectors.get_user_groups(user)[0].total_points == 4
+
+    def test_each_write_invalidates_the_owner_once(self, user, group, monkeypatch):
+        calls = []
+        monkeypatch.setattr(selectors, "invalidate_user_groups", calls.append)
+        monkeypatch.setattr(signals, "invalidate_user_groups", calls.append)
+
+        group.members_string = "Alice"
+        group.save()
+        assert calls == [user.id]
+
+        calls.clear()
+        MemberService.update_member_data(group.members.first(), positive_data={"hw": 1})
+        assert calls == [user.id]
+
+        calls.clear()
+        group.members.first().delete()
+        assert calls == [user.id]
+
+    def test_listing_is_per_user(self, user, other_user, group):
+        assert selectors.get_user_groups(other_user) == []
+        assert selectors.get_user_groups(user) == [group]
@@ -0,0 +1,114 @@
+"""Tests for group_maker app services."""
+
+import io
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.exceptions import ValidationError
+from apps.group_maker.services.roster_import import import_roster, iter_roster_rows
+from apps.point_system.models import FieldDefinition, PointEvent
+
+
+def _rows(text, delimiter=None):
+    return iter_roster_rows(io.StringIO(text), delimiter)
+
+
+class TestIterRosterRows:
+    """Tests for the streaming roster parser."""
+
+    def test_parses_csv_with_header(self):
+        rows = list(_rows("Name,Color\nAlice,#112233\nBob,\n"))
+
+        assert [row["name"] for row in rows] == ["Alice", "Bob"]
+        assert rows[0]["color"] == "#112233"
+        assert rows[1]["__line__"] == "3"
+
+    def test_detects_tabs_and_skips_blank_lines(self):
+        rows = list(_rows("name\thomework\nAlice\t3\n\n\t\nBob\n"))
+
+        assert [(row["name"], row["homework"]) for row in rows] == [("Alice", "3"), ("Bob", "")]
+
+    def test_parses_lazily(self):
+        def lines():
+            yield "name\n"
+            yield "Alice\n"
+            raise AssertionError("read past the first row")
+
+        assert next(iter_roster_rows(lines()))["name"] == "Alice"
+
+    def test_requires_name_column(self):
+        with pytest.raises(ValidationError, match="'name' column"):
+            list(_rows("student,color\nAlice,\n"))
+
+    def test_rejects_empty_file(self):
+        with pytest.raises(ValidationError, match="empty"):
+            list(_rows(""))
+
+
+@pytest.mark.django_db
+class TestImportRoster:
+    """Tests for batched roster import."""
+
+    def test_imports_members_scores_and_ledger(self, group):
+        FieldDefinition.objects.create(group=group, name="homework", type="int", definition="positive")
+        FieldDefinition.objects.create(group=group, name="notes", type="str", definition="negative")
+
+        imported = import_roster(group, _rows("name,color,homework,notes\nDana,#abcdef,4,late\nEli,,-2,\n"))
+
+        assert imported == 2
+        dana = group.members.get(name="Dana")
+        assert dana.color == "#abcdef"
+        assert dana.positive_data == {"homework": 4}
+        assert dana.positive_total == 4
+        assert dana.negative_data == {"notes": "late"}
+        assert group.members.get(name="Eli").positive_data == {"homework": 0}
+        assert list(PointEvent.objects.filter(member=dana).values_list("field_name", "delta")) == [("homework", 4)]
+
+    def test_members_survive_the_next_group_save(self, group):
+        import_roster(group, _rows("name\nDana\nEli\n"))
+        group.refresh_from_db()
+
+        group.title = "Renamed"
+        group.save()
+
+        assert group.size == 5
+        assert group.members.count() == 5
+
+    def test_prefixed_headers_pick_the_table(self, group):
+        FieldDefinition.objects.create(group=group, name="effort", type="int", definition="positive")
+        FieldDefinition.objects.create(group=group, name="effort", type="int", definition="negative")
+
+        import_roster(group, _rows("name,positive:effort,negative:effort\nDana,3,1\n"))
+
+        dana = group.members.get(name="Dana")
+        assert (dana.positive_total, dana.negative_total) == (3, 1)
+
+    def test_invalid_row_rolls_back_everything(self, group):
+        FieldDefinition.objects.create(group=group, name="homework", type="int", definition="positive")
+
+        with pytest.raises(ValidationError, match="Line 3"):
+            import_roster(group, _rows("name,homework\nDana,1\nEli,lots\n"), batch_size=1)
+
+        assert not group.members.filter(name="Dana").exists()
+
+    def test_overlong_name_is_rejected(self, group):
+        with pytest.raises(ValidationError, match="Line 3: names can be at most 50 characters"):
+            import_roster(group, _rows("name\nDana\n" + "x" * 51 + "\n"), batch_size=1)
+
+        assert not group.members.filter(name="Dana").exists()
+
+    def test_unknown_columns_are_rejected(self, group):
+        with pytest.raises(ValidationError, match="shoe size"):
+            import_roster(group, _rows("name,shoe size\nDana,42\n"))
+
+    def test_inserts_in_fixed_size_batches(self, group):
+        text = "name\n" + "".join(f"Student {i}\n" for i in range(25))
+
+        with CaptureQueriesContext(connection) as ctx:
+            import_roster(group, _rows(text), batch_size=10)
+
+        member_inserts = [q for q in ctx.captured_queries if q["sql"].startswith('INSERT INTO "core_member"')]
+        assert len(member_inserts) == 3
+        assert group.members.count() == 28
@@ -1,6 +1,7 @@
 """Tests for group_maker app views."""
 
 import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
 
 from apps.group_maker.models import GroupCreationModel
 
@@ -60,3 +61,42 @@ class TestGroupDeleteView:
         response = authenticated_client.post(f"/groups/group_maker_delete/{group.pk}")
         assert response.status_code == 302
         assert not GroupCreationModel.objects.filter(pk=group.pk).exists()
+
+
+@pytest.mark.django_db
+class TestGroupRosterImportView:
+    """Tests for GroupRosterImport view."""
+
+    def _upload(self, text, name="roster.csv"):
+        return SimpleUploadedFile(name, text.encode("utf-8"), content_type="text/csv")
+
+    def test_requires_login(self, client, group):
+        """Test that view requires authentication."""
+        response = client.get(f"/groups/group_maker_import/{group.id}")
+        assert response.status_code == 302
+
+    def test_other_users_group_returns_404(self, client, group, other_user):
+        """Test that users cannot import into someone else's group."""
+        client.login(username="otheruser", password="otherpass123")
+        response = client.post(f"/groups/group_maker_import/{group.id}", {"roster": self._upload("name\nEve\n")})
+        assert response.status_code == 404
+
+    def test_imports_and_redirects_to_edit(self, authenticated_client, group):
+        """Test a successful upload."""
+        response = authenticated_client.post(
+            f"/groups/group_maker_import/{group.id}", {"roster": self._upload("name\nDana\nEli\n")}
+        )
+
+        assert response.status_code == 302
+        assert response.url == f"/groups/group_maker_edit/{group.id}"
+        assert group.members.filter(name__in=["Dana", "Eli"]).count() == 2
+
+    def test_invalid_roster_shows_error(self, authenticated_client, group):
+        """Test that validation errors are reported without importing anything."""
+        response = authenticated_client.post(
+            f"/groups/group_maker_import/{group.id}", {"roster": self._upload("student\nDana\n")}
+        )
+
+        assert response.status_code == 200
+        assert "name" in [str(m) for m in response.context["messages"]][0]
+        assert group.members.count() == 3
@@ -4,6 +4,7 @@ from .views import (
     GroupCreate,
     GroupDelete,
     GroupHome,
+    GroupRosterImport,
     GroupUpdate,
 )
 
@@ -14,4 +15,5 @@ urlpatterns = [
     path("group_maker_creation/", GroupCreate.as_view(), name="group-maker-creation"),
     path("group_maker_edit/<int:pk>", GroupUpdate.as_view(), name="group-maker-edit"),
     path("group_maker_delete/<int:pk>", GroupDelete.as_view(), name="group-maker-delete"),
+    path("group_maker_import/<int:pk>", GroupRosterImport.as_view(), name="group-maker-import"),
 ]
@@ -1,10 +1,18 @@
+from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils.http import url_has_allowed_host_and_scheme
-from django.views.generic import CreateView, DeleteView, TemplateView, UpdateView
+from django.views.generic import CreateView, DeleteView, TemplateView, UpdateView, View
 
-from .forms import GroupCreationForm
+from apps.core.exceptions import ValidationError
+from apps.core.models import Member
+from apps.point_system.services import TableCache
+
+from .forms import GroupCreationForm, RosterImportForm
 from .models import GroupCreationModel
+from .selectors import get_user_groups
+from .services.roster_import import import_roster, iter_roster_rows, open_upload
 
 ALLOWED_ORIGIN_APPS = {"group_maker", "karma", "group_divider", "wheel"}
 
@@ -16,7 +24,7 @@ class GroupHome(LoginRequiredMixin, TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["groups"] = GroupCreationModel.objects.filter(user=self.request.user)
+        context["groups"] = get_user_groups(self.request.user)
         context["form"] = self.form_class()
         return context
 
@@ -66,13 +74,18 @@ class GroupUpdate(LoginRequiredMixin, UpdateView):
 
     def form_valid(self, form):
         response = super().form_valid(form)
+        recolored = []
         for member in self.object.members.all():
             color_key = f"member_color_{member.id}"
             if color_key in self.request.POST:
                 new_color = self.request.POST[color_key]
                 if new_color and new_color != member.color:
                     member.color = new_color
-                    member.save(update_fields=["color"])
+                    recolored.append(member)
+        if recolored:
+            Member.objects.bulk_update(recolored, ["color"])
+            # Colors are part of the wheel's cached member list
+            TableCache.bump(self.object.id)
         return response
 
 
@@ -102,3 +115,33 @@ class GroupDelete(LoginRequiredMixin, DeleteView):  # type: ignore[misc]
             # Direct access, cancel goes to referer or home
             context["cancel_url"] = self.request.META.get("HTTP_REFERER") or reverse("home")
         return context
+
+
+class GroupRosterImport(LoginRequiredMixin, View):
+    """Append members to a group from an uploaded CSV/TSV roster."""
+
+    template_name = "group_maker/roster_import.html"
+
+    def get(self, request, pk):
+        group = get_object_or_404(GroupCreationModel, id=pk, user=request.user)
+        return render(request, self.template_name, {"group": group, "form": RosterImportForm()})
+
+    def post(self, request, pk):
+        group = get_object_or_404(GroupCreationModel, id=pk, user=request.user)
+        form = RosterImportForm(request.POST, request.FILES)
+
+        if form.is_valid():
+            try:
+                rows = iter_roster_rows(
+                    open_upload(form.cleaned_data["roster"]), form.cleaned_data["delimiter"] or None
+                )
+                imported = import_roster(group, rows)
+            except UnicodeDecodeError:
+                messages.error(request, "The roster must be a UTF-8 encoded text file.")
+            except ValidationError as e:
+                messages.error(request, str(e))
+            else:
+                messages.success(request, f"Imported {imported} members into {group.title}.")
+                return redirect("group_maker:group-maker-edit", pk=group.id)
+
+        return render(request, self.template_name, {"group": group, "form": form})
@@ -1,8 +1,9 @@
 from django.contrib import admin
 
-from .models import FieldDefinition, Member
+from .models import FieldDefinition, Member, PointEvent
 
 # Register your models here.
 
 admin.site.register(Member)
 admin.site.register(FieldDefinition)
+admin.site.register(PointEvent)
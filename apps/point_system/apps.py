@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class PointSystemConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.point_system"
+
+    def ready(self):
+        # Import signals to register them
+        from . import signals  # noqa: F401
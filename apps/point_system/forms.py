@@ -57,3 +57,9 @@ class EditColumnForm(forms.Form):
     new_name = forms.CharField(max_length=50)
     old_name = forms.CharField(max_length=50)
     field_definition = forms.ChoiceField(choices=[("positive", "Positive"), ("negative", "Negative")])
+
+
+class IncrementPointsForm(forms.Form):
+    field_name = forms.CharField(max_length=100)
+    definition = forms.ChoiceField(choices=[("positive", "Positive"), ("negative", "Negative")])
+    delta = forms.IntegerField(min_value=-100, max_value=100, required=False)
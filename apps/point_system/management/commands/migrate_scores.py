@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.point_system.services.score_storage import ScoreStorage
+
+
+class Command(BaseCommand):
+    help = "Copy member point data from the JSON fields into the normalized Score table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=500, help="Members processed per chunk.")
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be at least 1.")
+
+        copied = ScoreStorage.copy_from_json(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Copied point data of {copied} members into Score rows."))
+        if not ScoreStorage.enabled():
+            self.stdout.write('Set POINT_STORAGE="scores" to start reading and writing the Score table.')
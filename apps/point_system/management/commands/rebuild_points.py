@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.group_maker.models import GroupCreationModel
+from apps.point_system.services.ledger_service import LedgerService
+
+
+class Command(BaseCommand):
+    help = "Rebuild member point data and totals by replaying the point ledger."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--group", type=int, help="Only rebuild members of this group ID.")
+        parser.add_argument("--chunk-size", type=int, default=500, help="Members processed per chunk.")
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be at least 1.")
+
+        group = None
+        if options["group"] is not None:
+            group = GroupCreationModel.objects.filter(id=options["group"]).first()
+            if group is None:
+                raise CommandError(f"Group {options['group']} does not exist.")
+
+        corrected = LedgerService.rebuild_projection(chunk_size=options["chunk_size"], group=group)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt point data from ledger; {corrected} members corrected."))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.group_maker.models import GroupCreationModel
+from apps.point_system.services.calculation_service import CalculationService
+
+
+class Command(BaseCommand):
+    help = "Check stored member totals against their point data and correct any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--group", type=int, help="Only check members of this group ID.")
+        parser.add_argument("--chunk-size", type=int, default=500, help="Members processed per chunk.")
+        parser.add_argument("--dry-run", action="store_true", help="Report drift without correcting it.")
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be at least 1.")
+
+        group = None
+        if options["group"] is not None:
+            group = GroupCreationModel.objects.filter(id=options["group"]).first()
+            if group is None:
+                raise CommandError(f"Group {options['group']} does not exist.")
+
+        result = CalculationService.recalculate_totals(
+            chunk_size=options["chunk_size"], group=group, dry_run=options["dry_run"]
+        )
+
+        drifted = result["drifted"]
+        for group_id, count in sorted(drifted.items()):
+            self.stdout.write(f"Group {group_id}: {count} members with drifted totals")
+
+        action = "found" if options["dry_run"] else "corrected"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Checked {result['checked']} members; {action} drift in {sum(drifted.values())} members."
+            )
+        )
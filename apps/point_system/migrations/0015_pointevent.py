@@ -0,0 +1,61 @@
+# Generated by Django 5.2.1 on 2026-10-17 01:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def seed_opening_balances(apps, schema_editor):
+    """Record each member's current numeric values as opening ledger entries."""
+    Member = apps.get_model("core", "Member")
+    FieldDefinition = apps.get_model("point_system", "FieldDefinition")
+    PointEvent = apps.get_model("point_system", "PointEvent")
+
+    int_fields = {}
+    for group_id, definition, name in FieldDefinition.objects.filter(type="int").values_list(
+        "group_id", "definition", "name"
+    ):
+        int_fields.setdefault(group_id, []).append((definition, name))
+
+    events = []
+    for member in Member.objects.filter(group_id__in=int_fields).iterator(chunk_size=1000):
+        for definition, name in int_fields[member.group_id]:
+            data = (member.positive_data if definition == "positive" else member.negative_data) or {}
+            try:
+                value = int(data.get(name) or 0)
+            except (ValueError, TypeError):
+                continue
+            if value:
+                events.append(PointEvent(member_id=member.id, field_name=name, definition=definition, delta=value))
+        if len(events) >= 1000:
+            PointEvent.objects.bulk_create(events)
+            events = []
+    PointEvent.objects.bulk_create(events)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_member_color'),
+        ('point_system', '0014_move_member_to_core'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PointEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field_name', models.CharField(max_length=100)),
+                ('definition', models.CharField(choices=[('positive', 'Positive'), ('negative', 'Negative')], max_length=10)),
+                ('delta', models.IntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='point_events', to='core.member')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['member', 'created_at'], name='pointevent_member_time'), models.Index(fields=['member', 'definition', 'field_name', 'created_at'], name='pointevent_member_field_time')],
+            },
+        ),
+        migrations.RunPython(seed_opening_balances, migrations.RunPython.noop),
+    ]
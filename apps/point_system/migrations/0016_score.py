@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2026-10-17 01:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_member_color'),
+        ('point_system', '0015_pointevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Score',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('int_value', models.IntegerField(default=0)),
+                ('text_value', models.CharField(blank=True, default='', max_length=255)),
+                ('field', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scores', to='point_system.fielddefinition')),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scores', to='core.member')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('member', 'field'), name='unique_score_per_member_and_field')],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.1 on 2026-10-17 01:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('group_maker', '0005_alter_groupcreationmodel_title'),
+        ('point_system', '0016_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PointTableVersion',
+            fields=[
+                ('group', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='point_table_version', serialize=False, to='group_maker.groupcreationmodel')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
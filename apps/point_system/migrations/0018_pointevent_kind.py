@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-17 04:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('point_system', '0017_pointtableversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pointevent',
+            name='kind',
+            field=models.CharField(choices=[('change', 'Change'), ('rename', 'Rename'), ('remove', 'Remove')], default='change', max_length=10),
+        ),
+    ]
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.db import models
 
 from apps.core.models import Member  # noqa: F401 - re-exported for backward compatibility
@@ -27,3 +28,86 @@ class FieldDefinition(models.Model):
 
     def __str__(self):
         return f"{self.name}_({self.definition})_({self.type})"
+
+
+class Score(models.Model):
+    """
+    Normalized storage for one member's value in one column.
+
+    Used instead of the Member.positive_data/negative_data blobs when
+    settings.POINT_STORAGE is "scores". A missing row means the column's
+    default value (0 or empty text).
+    """
+
+    member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name="scores")
+    field = models.ForeignKey(FieldDefinition, on_delete=models.CASCADE, related_name="scores")
+    int_value = models.IntegerField(default=0)
+    text_value = models.CharField(max_length=255, blank=True, default="")
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["member", "field"], name="unique_score_per_member_and_field")]
+
+    def __str__(self):
+        return f"{self.member_id}_{self.field_id}_{self.int_value}"
+
+
+class PointEvent(models.Model):
+    """
+    Append-only ledger entry for a change to one numeric point field.
+
+    Member.positive_data/negative_data and the totals are a projection of
+    these events; rebuild_points replays the ledger to restore them. Rows are
+    never edited or deleted: renaming or removing a field appends compensating
+    events that move or zero the field's balance.
+    """
+
+    KIND_CHOICES = [
+        ("change", "Change"),
+        ("rename", "Rename"),
+        ("remove", "Remove"),
+    ]
+
+    member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name="point_events")
+    field_name = models.CharField(max_length=100)
+    definition = models.CharField(
+        max_length=10,
+        choices=[("positive", "Positive"), ("negative", "Negative")],
+    )
+    delta = models.IntegerField()
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, default="change")
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["member", "created_at"], name="pointevent_member_time"),
+            models.Index(
+                fields=["member", "definition", "field_name", "created_at"], name="pointevent_member_field_time"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.member_id}_{self.definition}_{self.field_name}_{self.delta:+d}"
+
+
+class PointTableVersion(models.Model):
+    """
+    Per-group counter bumped whenever anything shown in the points tables changes.
+
+    Cached table fragments are keyed by this version, so a bump invalidates
+    exactly one group's fragments on every worker.
+    """
+
+    group = models.OneToOneField(
+        GroupCreationModel, on_delete=models.CASCADE, primary_key=True, related_name="point_table_version"
+    )
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.group_id}_v{self.version}"
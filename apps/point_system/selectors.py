@@ -5,29 +5,33 @@ Contains optimized queries with prefetch_related to avoid N+1 issues.
 """
 
 import logging
+from typing import Any
 
 from django.db.models import QuerySet
 from django.shortcuts import get_object_or_404
 
+from apps.group_maker import selectors as group_selectors
 from apps.group_maker.models import GroupCreationModel
 
-from .models import FieldDefinition, Member
-from .services.member_service import MemberService
+from .models import FieldDefinition, Member, PointEvent
+from .services.score_storage import ScoreStorage
 
 logger = logging.getLogger(__name__)
 
 
-def get_user_groups(user) -> QuerySet[GroupCreationModel]:
+def get_user_groups(user) -> list[GroupCreationModel]:
     """
-    Get all groups owned by a user.
+    Get all groups owned by a user, newest first.
+
+    Delegates to the shared, cached group listing of group_maker.
 
     Args:
         user: User instance
 
     Returns:
-        QuerySet of GroupCreationModel
+        List of annotated GroupCreationModel instances
     """
-    return GroupCreationModel.objects.filter(user=user).order_by("-created")
+    return group_selectors.get_user_groups(user)
 
 
 def get_group_with_members(group_id: int, user) -> tuple[GroupCreationModel, QuerySet[Member]]:
@@ -65,7 +69,7 @@ def get_group_with_fields(group_id: int, user) -> tuple[GroupCreationModel, dict
     positive_fields = list(FieldDefinition.objects.filter(group=group, definition="positive").order_by("created_at"))
     negative_fields = list(FieldDefinition.objects.filter(group=group, definition="negative").order_by("created_at"))
 
-    fields = {
+    fields: dict[str, Any] = {
         "positive": positive_fields,
         "negative": negative_fields,
         "positive_names": [f.name for f in positive_fields],
@@ -77,6 +81,63 @@ def get_group_with_fields(group_id: int, user) -> tuple[GroupCreationModel, dict
     return group, fields
 
 
+def _total_level(total: int) -> str:
+    """Return the highlight level of a row total: 'high' (10+), 'medium' (5+) or ''."""
+    if total >= 10:
+        return "high"
+    if total >= 5:
+        return "medium"
+    return ""
+
+
+def build_table_rows(members, definition: str, column_names: list[str], column_types: dict[str, str]) -> list[dict]:
+    """
+    Build the row/cell matrix rendered by one points table in a single pass.
+
+    Each cell carries its input name, value and type so the template iterates
+    plain lists instead of looking every cell up through template filters.
+    Numbers are stored as strings because the template engine would otherwise
+    run each one through localization, which dominates render time.
+
+    Args:
+        members: Iterable of Member instances
+        definition: 'positive' or 'negative'
+        column_names: Ordered column names of the table
+        column_types: Map of column name to input type ('number' or 'text')
+
+    Returns:
+        List of row dicts with id, name, total, level and cells
+    """
+    data_field = f"{definition}_data"
+    total_field = f"{definition}_total"
+    columns = [(name, column_types.get(name, "text")) for name in column_names]
+
+    rows = []
+    for member in members:
+        data = getattr(member, data_field) or {}
+        total = getattr(member, total_field) or 0
+        member_id = str(member.id)
+        rows.append(
+            {
+                "id": member_id,
+                "name": member.name,
+                "total": str(total),
+                "level": _total_level(total),
+                "cells": [
+                    {
+                        "input_name": f"{member_id}_{definition}_{name}",
+                        "column": name,
+                        "value": str(data.get(name, 0)),
+                        "type": input_type,
+                        "is_number": input_type == "number",
+                    }
+                    for name, input_type in columns
+                ],
+            }
+        )
+    return rows
+
+
 def get_group_full_data(group_id: int, user) -> dict:
     """
     Get complete group data including members and fields.
@@ -95,23 +156,82 @@ def get_group_full_data(group_id: int, user) -> dict:
     # Reuse the group object instead of fetching it again
     positive_fields = list(FieldDefinition.objects.filter(group=group, definition="positive").order_by("created_at"))
     negative_fields = list(FieldDefinition.objects.filter(group=group, definition="negative").order_by("created_at"))
-    fields = {
+    fields: dict[str, Any] = {
         "positive_names": [f.name for f in positive_fields],
         "negative_names": [f.name for f in negative_fields],
         "positive_types": {f.name: "number" if f.type == "int" else "text" for f in positive_fields},
         "negative_types": {f.name: "number" if f.type == "int" else "text" for f in negative_fields},
     }
 
-    # Calculate totals for each member
-    for member in members:
-        member.positive_total = MemberService._calculate_total(member.positive_data)
-        member.negative_total = MemberService._calculate_total(member.negative_data)
+    # Stored totals are kept in sync by MemberService on every write (and can be
+    # audited with the recalculate_totals command), so reads never recompute them
+    if ScoreStorage.enabled():
+        members = members.only("id", "group_id", "name", "positive_total", "negative_total")
+        # attach fills the queryset's cached instances with the Score values
+        ScoreStorage.attach(list(members))
+    else:
+        members = members.only("id", "name", "positive_data", "negative_data", "positive_total", "negative_total")
 
     return {
         "group": group,
         "members": members,
+        "positive_rows": build_table_rows(members, "positive", fields["positive_names"], fields["positive_types"]),
+        "negative_rows": build_table_rows(members, "negative", fields["negative_names"], fields["negative_types"]),
         "positive_column_names": fields["positive_names"],
         "negative_column_names": fields["negative_names"],
         "column_type_positive": fields["positive_types"],
         "column_type_negative": fields["negative_types"],
     }
+
+
+def get_member_point_history(
+    member_id: int, user, field_name: str | None = None, definition: str | None = None
+) -> QuerySet[PointEvent]:
+    """
+    Get the ledger entries for one member, newest first.
+
+    Served by the (member, definition, field_name, created_at) index, so it
+    never touches the Member data blobs.
+
+    Args:
+        member_id: Member ID
+        user: User instance (for permission check)
+        field_name: Restrict to one field (optional)
+        definition: Restrict to 'positive' or 'negative' (optional)
+
+    Returns:
+        QuerySet of PointEvent
+    """
+    member = get_object_or_404(Member.objects.only("id"), id=member_id, group__user=user)
+
+    events = PointEvent.objects.filter(member=member)
+    if definition:
+        events = events.filter(definition=definition)
+    if field_name:
+        events = events.filter(field_name=field_name)
+    return events.order_by("-created_at", "-id")
+
+
+def get_group_point_history(
+    group_id: int, user, field_name: str | None = None, definition: str | None = None
+) -> QuerySet[PointEvent]:
+    """
+    Get the ledger entries for every member of a group, newest first.
+
+    Args:
+        group_id: Group ID
+        user: User instance (for permission check)
+        field_name: Restrict to one field (optional)
+        definition: Restrict to 'positive' or 'negative' (optional)
+
+    Returns:
+        QuerySet of PointEvent with member names loaded
+    """
+    group = get_object_or_404(GroupCreationModel.objects.only("id"), id=group_id, user=user)
+
+    events = PointEvent.objects.filter(member__group=group).select_related("member")
+    if definition:
+        events = events.filter(definition=definition)
+    if field_name:
+        events = events.filter(field_name=field_name)
+    return events.order_by("-created_at", "-id")
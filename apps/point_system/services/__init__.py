@@ -5,6 +5,9 @@ Contains business logic separated from views.
 """
 
 from .calculation_service import CalculationService
+from .ledger_service import LedgerService
 from .member_service import MemberService
+from .score_storage import ScoreStorage
+from .table_cache import TableCache
 
-__all__ = ["MemberService", "CalculationService"]
+__all__ = ["MemberService", "CalculationService", "LedgerService", "ScoreStorage", "TableCache"]
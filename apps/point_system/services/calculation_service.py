@@ -7,6 +7,9 @@ Handles score calculations and aggregations.
 import logging
 from typing import Any
 
+from django.db.models import Count, F, Sum, Window
+from django.db.models.functions import Coalesce, DenseRank, Rank
+
 from ..models import Member
 
 logger = logging.getLogger(__name__)
@@ -15,10 +18,16 @@ logger = logging.getLogger(__name__)
 class CalculationService:
     """Service class for calculations and aggregations."""
 
+    RANKING_FIELDS = {
+        "net": "net_total",
+        "positive": "positive_total",
+        "negative": "negative_total",
+    }
+
     @staticmethod
     def calculate_group_totals(group) -> dict[str, Any]:
         """
-        Calculate aggregate totals for a group.
+        Calculate aggregate totals for a group in a single aggregate query.
 
         Args:
             group: GroupCreationModel instance
@@ -26,62 +35,88 @@ class CalculationService:
         Returns:
             Dict with total_positive, total_negative, net_total, member_count
         """
-        members = Member.objects.filter(group=group)
-
-        total_positive = 0
-        total_negative = 0
-
-        for member in members:
-            total_positive += member.positive_total or 0
-            total_negative += member.negative_total or 0
+        totals = Member.objects.filter(group=group).aggregate(
+            total_positive=Coalesce(Sum("positive_total"), 0),
+            total_negative=Coalesce(Sum("negative_total"), 0),
+            member_count=Count("id"),
+        )
 
         return {
-            "total_positive": total_positive,
-            "total_negative": total_negative,
-            "net_total": total_positive - total_negative,
-            "member_count": members.count(),
+            "total_positive": totals["total_positive"],
+            "total_negative": totals["total_negative"],
+            "net_total": totals["total_positive"] - totals["total_negative"],
+            "member_count": totals["member_count"],
         }
 
     @staticmethod
-    def get_member_ranking(group, order_by: str = "net") -> list[dict[str, Any]]:
+    def get_member_ranking(
+        group,
+        order_by: str = "net",
+        dense: bool = False,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[dict[str, Any]]:
         """
         Get members ranked by score.
 
+        Ranks are computed by the database with a RANK() (or DENSE_RANK())
+        window, so tied scores share a rank. Only the requested slice is
+        fetched, which keeps top-N and paginated leaderboards cheap on large
+        groups.
+
         Args:
             group: GroupCreationModel instance
             order_by: 'net', 'positive', or 'negative'
+            dense: Use DENSE_RANK() so ranks after a tie are not skipped
+            limit: Maximum number of rows to return (None for all)
+            offset: Number of leading rows to skip
 
         Returns:
             List of dicts with member info and rank
         """
-        members = Member.objects.filter(group=group)
-
-        member_scores: list[dict[str, Any]] = []
-        for member in members:
-            net = (member.positive_total or 0) - (member.negative_total or 0)
-            member_scores.append(
-                {
-                    "id": member.id,
-                    "name": member.name,
-                    "positive_total": member.positive_total or 0,
-                    "negative_total": member.negative_total or 0,
-                    "net_total": net,
-                }
+        score_field = CalculationService.RANKING_FIELDS.get(order_by, "net_total")
+        rank_function = DenseRank if dense else Rank
+
+        ranking = (
+            Member.objects.filter(group=group)
+            .annotate(
+                net_total=F("positive_total") - F("negative_total"),
+                rank=Window(expression=rank_function(), order_by=F(score_field).desc()),
             )
+            .order_by("rank", "id")
+            .values("id", "name", "positive_total", "negative_total", "net_total", "rank")
+        )
 
-        # Sort based on order_by
-        if order_by == "positive":
-            member_scores.sort(key=lambda x: int(x["positive_total"]), reverse=True)
-        elif order_by == "negative":
-            member_scores.sort(key=lambda x: int(x["negative_total"]), reverse=True)
-        else:  # net
-            member_scores.sort(key=lambda x: int(x["net_total"]), reverse=True)
+        if limit is not None:
+            return list(ranking[offset : offset + limit])
+        return list(ranking[offset:])
 
-        # Add rank
-        for i, score_dict in enumerate(member_scores, 1):
-            score_dict["rank"] = i
+    @staticmethod
+    def get_leaderboard(group, page: int = 1, per_page: int = 10, order_by: str = "net") -> dict[str, Any]:
+        """
+        Get one page of the member ranking.
 
-        return member_scores
+        Args:
+            group: GroupCreationModel instance
+            page: 1-based page number (clamped to the valid range)
+            per_page: Rows per page
+            order_by: 'net', 'positive', or 'negative'
+
+        Returns:
+            Dict with entries, page, num_pages and member_count
+        """
+        member_count = Member.objects.filter(group=group).count()
+        num_pages = max(1, -(-member_count // per_page))
+        page = min(max(1, page), num_pages)
+
+        return {
+            "entries": CalculationService.get_member_ranking(
+                group, order_by=order_by, limit=per_page, offset=(page - 1) * per_page
+            ),
+            "page": page,
+            "num_pages": num_pages,
+            "member_count": member_count,
+        }
 
     @staticmethod
     def recalculate_all_totals(group) -> int:
@@ -107,3 +142,69 @@ class CalculationService:
 
         logger.info(f"Recalculated totals for {count} members in group {group.title}")
         return count
+
+    @staticmethod
+    def recalculate_totals(chunk_size: int = 500, group=None, dry_run: bool = False) -> dict[str, Any]:
+        """
+        Compare every member's stored totals with its point data and fix drift.
+
+        Members are streamed with iterator(chunk_size=...) and corrected with
+        one bulk_update per chunk, so memory stays flat on large tables.
+
+        Args:
+            chunk_size: Number of members per chunk
+            group: Restrict the scan to one GroupCreationModel (optional)
+            dry_run: Report drift without writing corrections
+
+        Returns:
+            Dict with checked (member count) and drifted ({group_id: member count})
+        """
+        from .member_service import MemberService
+        from .score_storage import ScoreStorage
+        from .table_cache import TableCache
+
+        use_scores = ScoreStorage.enabled()
+        members_qs = Member.objects.order_by("id")
+        if group is not None:
+            members_qs = members_qs.filter(group=group)
+        if use_scores:
+            members_qs = members_qs.only("id", "group_id", "positive_total", "negative_total")
+        else:
+            members_qs = members_qs.only(
+                "id", "group_id", "positive_data", "negative_data", "positive_total", "negative_total"
+            )
+
+        checked = 0
+        drifted: dict[int, int] = {}
+
+        def flush(chunk: list[Member]) -> None:
+            if use_scores:
+                ScoreStorage.attach(chunk)
+
+            changed = []
+            for member in chunk:
+                positive_total = MemberService._calculate_total(member.positive_data)
+                negative_total = MemberService._calculate_total(member.negative_data)
+                if positive_total != member.positive_total or negative_total != member.negative_total:
+                    member.positive_total = positive_total
+                    member.negative_total = negative_total
+                    drifted[member.group_id] = drifted.get(member.group_id, 0) + 1
+                    changed.append(member)
+
+            if changed and not dry_run:
+                Member.objects.bulk_update(changed, ["positive_total", "negative_total"])
+
+        chunk: list[Member] = []
+        for member in members_qs.iterator(chunk_size=chunk_size):
+            chunk.append(member)
+            checked += 1
+            if len(chunk) >= chunk_size:
+                flush(chunk)
+                chunk = []
+        if chunk:
+            flush(chunk)
+        if not dry_run:
+            TableCache.bump_many(drifted)
+
+        logger.info(f"Checked totals of {checked} members, {sum(drifted.values())} had drifted")
+        return {"checked": checked, "drifted": drifted}
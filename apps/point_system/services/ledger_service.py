@@ -0,0 +1,224 @@
+"""
+Ledger service for point_system app.
+
+Records point changes as PointEvent rows and rebuilds the Member
+projection (data dicts and totals) from them.
+"""
+
+import logging
+from typing import Any
+
+from django.db import transaction
+from django.db.models import Sum
+
+from ..models import FieldDefinition, Member, PointEvent
+
+logger = logging.getLogger(__name__)
+
+
+class LedgerService:
+    """Service class for the append-only point ledger."""
+
+    @staticmethod
+    def _to_int(value: Any) -> int | None:
+        """Return value as an int, or None if it is not numeric."""
+        try:
+            return int(value)
+        except (ValueError, TypeError):
+            return None
+
+    @staticmethod
+    def build_events(
+        member: Member,
+        definition: str,
+        old_data: dict[str, Any] | None,
+        new_data: dict[str, Any] | None,
+        actor=None,
+    ) -> list[PointEvent]:
+        """
+        Build ledger events for the numeric differences between two data dicts.
+
+        Missing keys count as zero; keys holding text on either side are skipped.
+
+        Args:
+            member: Member the data belongs to
+            definition: 'positive' or 'negative'
+            old_data: Data before the change
+            new_data: Data after the change
+            actor: User making the change (optional)
+
+        Returns:
+            List of unsaved PointEvent instances
+        """
+        old_data = old_data or {}
+        new_data = new_data or {}
+
+        events = []
+        for key in old_data.keys() | new_data.keys():
+            old_value = LedgerService._to_int(old_data.get(key) or 0)
+            new_value = LedgerService._to_int(new_data.get(key) or 0)
+            if old_value is None or new_value is None or old_value == new_value:
+                continue
+            events.append(
+                PointEvent(
+                    member=member,
+                    field_name=key,
+                    definition=definition,
+                    delta=new_value - old_value,
+                    actor=actor,
+                )
+            )
+        return events
+
+    @staticmethod
+    def build_field_closing_events(
+        group, field_name: str, definition: str, new_name: str | None = None, actor=None
+    ) -> list[PointEvent]:
+        """
+        Build compensating events that close a field's ledger balance.
+
+        Each member's balance on field_name is reversed with a 'remove' event,
+        or, when new_name is given, moved onto new_name with a pair of 'rename'
+        events. Existing rows are never touched, so replaying the ledger up to
+        any point still reproduces the table as it was then.
+
+        Args:
+            group: GroupCreationModel whose members are affected
+            field_name: Field being removed or renamed
+            definition: 'positive' or 'negative'
+            new_name: Target name for a rename (optional)
+            actor: User making the change (optional)
+
+        Returns:
+            List of unsaved PointEvent instances
+        """
+        kind = "remove" if new_name is None else "rename"
+        balances = (
+            PointEvent.objects.filter(member__group=group, definition=definition, field_name=field_name)
+            .values("member_id")
+            .annotate(total=Sum("delta"))
+            .order_by("member_id")
+        )
+
+        events = []
+        for row in balances:
+            if not row["total"]:
+                continue
+            events.append(
+                PointEvent(
+                    member_id=row["member_id"],
+                    field_name=field_name,
+                    definition=definition,
+                    delta=-row["total"],
+                    kind=kind,
+                    actor=actor,
+                )
+            )
+            if new_name is not None:
+                events.append(
+                    PointEvent(
+                        member_id=row["member_id"],
+                        field_name=new_name,
+                        definition=definition,
+                        delta=row["total"],
+                        kind=kind,
+                        actor=actor,
+                    )
+                )
+        return events
+
+    @staticmethod
+    def record(events: list[PointEvent]) -> None:
+        """Write ledger events in a single bulk insert."""
+        if events:
+            PointEvent.objects.bulk_create(events)
+
+    @staticmethod
+    def rebuild_projection(chunk_size: int = 500, group=None) -> int:
+        """
+        Replay the ledger into Member data and totals.
+
+        Members are processed in primary-key order, chunk_size at a time, so
+        memory stays flat regardless of table size. Only numeric fields with a
+        FieldDefinition are rebuilt; text values are left as they are.
+
+        Args:
+            chunk_size: Number of members per chunk
+            group: Restrict the rebuild to one GroupCreationModel (optional)
+
+        Returns:
+            Number of members whose stored data or totals were corrected
+        """
+        members_qs = Member.objects.order_by("id")
+        if group is not None:
+            members_qs = members_qs.filter(group=group)
+
+        corrected = 0
+        last_id = 0
+        while True:
+            members = list(members_qs.filter(id__gt=last_id)[:chunk_size])
+            if not members:
+                break
+            last_id = members[-1].id
+            corrected += LedgerService._rebuild_chunk(members)
+
+        logger.info(f"Rebuilt point projection from ledger, corrected {corrected} members")
+        return corrected
+
+    @staticmethod
+    @transaction.atomic
+    def _rebuild_chunk(members: list[Member]) -> int:
+        """Rebuild one chunk of members from their ledger sums."""
+        from .member_service import MemberService
+        from .score_storage import ScoreStorage
+        from .table_cache import TableCache
+
+        use_scores = ScoreStorage.enabled()
+        if use_scores:
+            ScoreStorage.attach(members)
+
+        int_fields: dict[int, list[tuple[str, str]]] = {}
+        for group_id, definition, name in FieldDefinition.objects.filter(
+            group_id__in={m.group_id for m in members}, type="int"
+        ).values_list("group_id", "definition", "name"):
+            int_fields.setdefault(group_id, []).append((definition, name))
+
+        sums: dict[tuple[int, str, str], int] = {}
+        for row in (
+            PointEvent.objects.filter(member__in=members)
+            .values("member_id", "definition", "field_name")
+            .annotate(total=Sum("delta"))
+        ):
+            sums[(row["member_id"], row["definition"], row["field_name"])] = row["total"]
+
+        changed = []
+        for member in members:
+            positive_data = dict(member.positive_data or {})
+            negative_data = dict(member.negative_data or {})
+            for definition, name in int_fields.get(member.group_id, []):
+                data = positive_data if definition == "positive" else negative_data
+                data[name] = sums.get((member.id, definition, name), 0)
+
+            positive_total = MemberService._calculate_total(positive_data)
+            negative_total = MemberService._calculate_total(negative_data)
+            if (
+                positive_data != member.positive_data
+                or negative_data != member.negative_data
+                or positive_total != member.positive_total
+                or negative_total != member.negative_total
+            ):
+                member.positive_data = positive_data
+                member.negative_data = negative_data
+                member.positive_total = positive_total
+                member.negative_total = negative_total
+                changed.append(member)
+
+        if changed:
+            if use_scores:
+                ScoreStorage.write(changed)
+            else:
+                Member.objects.bulk_update(
+                    changed, ["positive_data", "negative_data", "positive_total", "negative_total"]
+                )
+            TableCache.bump_many(member.group_id for member in changed)
+        return len(changed)
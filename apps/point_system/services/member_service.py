@@ -4,12 +4,18 @@ Member service for point_system app.
 Handles member data operations.
 """
 
+import json
 import logging
+from collections.abc import Iterable
 from typing import Any
 
-from django.db import transaction
+from django.db import connection, transaction
+from django.utils import timezone
 
-from ..models import FieldDefinition, Member
+from ..models import FieldDefinition, Member, PointEvent
+from .ledger_service import LedgerService
+from .score_storage import ScoreStorage
+from .table_cache import TableCache
 
 logger = logging.getLogger(__name__)
 
@@ -30,35 +36,244 @@ class MemberService:
         return sanitized
 
     @staticmethod
+    @transaction.atomic
     def update_member_data(
         member: Member,
         positive_data: dict[str, Any] | None = None,
         negative_data: dict[str, Any] | None = None,
+        actor=None,
     ) -> Member:
         """
         Update member's positive and/or negative data.
 
+        Numeric changes are recorded in the point ledger. With the Score
+        layout enabled, the stored values are loaded first and written back as
+        Score rows instead of JSON.
+
         Args:
             member: The Member instance to update
             positive_data: New positive data dict (optional)
             negative_data: New negative data dict (optional)
+            actor: User making the change (optional)
 
         Returns:
             Updated Member instance
         """
+        use_scores = ScoreStorage.enabled()
+        if use_scores:
+            ScoreStorage.attach([member])
+
+        events = []
         if positive_data is not None:
-            member.positive_data = MemberService._sanitize_data(positive_data)
+            positive_data = MemberService._sanitize_data(positive_data)
+            events += LedgerService.build_events(member, "positive", member.positive_data, positive_data, actor)
+            member.positive_data = positive_data
         if negative_data is not None:
-            member.negative_data = MemberService._sanitize_data(negative_data)
+            negative_data = MemberService._sanitize_data(negative_data)
+            events += LedgerService.build_events(member, "negative", member.negative_data, negative_data, actor)
+            member.negative_data = negative_data
 
         # Recalculate totals
         member.positive_total = MemberService._calculate_total(member.positive_data)
         member.negative_total = MemberService._calculate_total(member.negative_data)
 
-        member.save()
+        if use_scores:
+            ScoreStorage.write([member])
+        else:
+            member.save()
+        LedgerService.record(events)
+        TableCache.bump(member.group_id)
         logger.debug(f"Updated member {member.name}: +{member.positive_total}/-{member.negative_total}")
         return member
 
+    @staticmethod
+    @transaction.atomic
+    def bulk_update_member_data(
+        members: Iterable[Member],
+        definition: str,
+        changes: dict[int, dict[str, Any]],
+        actor=None,
+    ) -> list[Member]:
+        """
+        Apply column changes to many members and save them in a single query.
+
+        Only columns already present in a member's data are updated, mirroring
+        the per-member save path. Data is sanitized and totals are recalculated
+        in memory, then every member whose data or total actually changed is
+        written with one bulk_update. Numeric changes are recorded in the
+        point ledger with one bulk insert.
+
+        Args:
+            members: Member instances to update
+            definition: 'positive' or 'negative'
+            changes: Mapping of member ID to {column_name: value}
+            actor: User making the change (optional)
+
+        Returns:
+            List of Member instances that were written
+        """
+        data_field = "positive_data" if definition == "positive" else "negative_data"
+        total_field = "positive_total" if definition == "positive" else "negative_total"
+        now = timezone.now()
+
+        use_scores = ScoreStorage.enabled()
+        if use_scores:
+            members = ScoreStorage.attach(list(members))
+
+        updated = []
+        events = []
+        for member in members:
+            data = dict(getattr(member, data_field) or {})
+            for col_name, value in changes.get(member.id, {}).items():
+                if col_name in data:
+                    data[col_name] = value
+
+            data = MemberService._sanitize_data(data)
+            total = MemberService._calculate_total(data)
+            if data == getattr(member, data_field) and total == getattr(member, total_field):
+                continue
+
+            events += LedgerService.build_events(member, definition, getattr(member, data_field), data, actor)
+            setattr(member, data_field, data)
+            setattr(member, total_field, total)
+            member.updated_at = now
+            updated.append(member)
+
+        if updated:
+            if use_scores:
+                ScoreStorage.write(updated, [definition])
+            else:
+                Member.objects.bulk_update(updated, [data_field, total_field, "updated_at"])
+            LedgerService.record(events)
+            TableCache.bump_many(member.group_id for member in updated)
+
+        logger.debug(f"Bulk updated {definition} data for {len(updated)} members")
+        return updated
+
+    @staticmethod
+    def increment_field(
+        member_id: int, field_name: str, definition: str, delta: int = 1, actor=None
+    ) -> tuple[int, int] | None:
+        """
+        Add delta to one numeric field of a member and adjust the matching total.
+
+        On PostgreSQL and SQLite this is a single UPDATE evaluated by the
+        database, so concurrent increments never overwrite each other. The
+        member row lock is held only for that UPDATE and the ledger insert;
+        the group's table version is bumped after they commit, so taps in one
+        group do not queue on its PointTableVersion row. Decrements that
+        would go below zero, other backends and the Score layout fall back to a
+        locked read-modify-write that clamps at zero like _sanitize_data does.
+
+        Args:
+            member_id: ID of the member to update
+            field_name: Name of a numeric field
+            definition: 'positive' or 'negative'
+            delta: Amount to add (negative to subtract)
+            actor: User making the change (optional)
+
+        Returns:
+            Tuple of (new_value, new_total), or None if the member doesn't exist
+        """
+        data_field = "positive_data" if definition == "positive" else "negative_data"
+        total_field = "positive_total" if definition == "positive" else "negative_total"
+
+        statement = None
+        if not ScoreStorage.enabled():
+            statement = MemberService._increment_sql(data_field, total_field, field_name, delta, member_id)
+        if statement is not None:
+            sql, params = statement
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute(sql, params)
+                    applied = cursor.rowcount > 0
+
+                if applied:
+                    LedgerService.record(
+                        [
+                            PointEvent(
+                                member_id=member_id,
+                                field_name=field_name,
+                                definition=definition,
+                                delta=delta,
+                                actor=actor,
+                            )
+                        ]
+                    )
+                    group_id, data, total = (
+                        Member.objects.filter(id=member_id).values_list("group_id", data_field, total_field).get()
+                    )
+
+            if applied:
+                TableCache.bump(group_id)
+                return data[field_name], total
+
+        return MemberService._increment_field_locked(member_id, field_name, data_field, total_field, delta, actor)
+
+    @staticmethod
+    def _increment_sql(
+        data_field: str, total_field: str, field_name: str, delta: int, member_id: int
+    ) -> tuple[str, list[Any]] | None:
+        """
+        Build the single-statement increment for the current backend, or None if unsupported.
+
+        The statement only matches when the result stays non-negative, so the
+        stored change always equals delta. The cast is guarded by the JSON type
+        like _remove_field_sql, and the statement only matches numeric or missing
+        values; text such as "5" or "n/a" falls back to the locked path, which
+        reads it the way _calculate_total does.
+        """
+        if connection.vendor == "postgresql":
+            old_value = (
+                f"CASE WHEN jsonb_typeof({data_field} -> %s) = 'number' "
+                f"THEN trunc(({data_field} ->> %s)::numeric)::int ELSE 0 END"
+            )
+            data_sql = (
+                f"jsonb_set(COALESCE({data_field}, '{{}}'::jsonb), ARRAY[%s]::text[], to_jsonb({old_value} + %s))"
+            )
+            numeric_or_missing = f"COALESCE(jsonb_typeof({data_field} -> %s), 'null') IN ('number', 'null')"
+            key = field_name
+        elif connection.vendor == "sqlite" and '"' not in field_name:
+            old_value = (
+                f"CASE WHEN json_type({data_field}, %s) IN ('integer', 'real') "
+                f"THEN CAST(json_extract({data_field}, %s) AS INTEGER) ELSE 0 END"
+            )
+            data_sql = f"json_set(COALESCE({data_field}, '{{}}'), %s, {old_value} + %s)"
+            numeric_or_missing = f"COALESCE(json_type({data_field}, %s), 'null') IN ('integer', 'real', 'null')"
+            key = f'$."{field_name}"'
+        else:
+            return None
+
+        table = connection.ops.quote_name(Member._meta.db_table)
+        sql = (
+            f"UPDATE {table} SET {data_field} = {data_sql}, "
+            f"{total_field} = {total_field} + %s, updated_at = %s "
+            f"WHERE id = %s AND {numeric_or_missing} AND {old_value} + %s >= 0"
+        )
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        params = [key, key, key, delta, delta, now, member_id, key, key, key, delta]
+        return sql, params
+
+    @staticmethod
+    @transaction.atomic
+    def _increment_field_locked(
+        member_id: int, field_name: str, data_field: str, total_field: str, delta: int, actor=None
+    ) -> tuple[int, int] | None:
+        """Portable increment using SELECT ... FOR UPDATE for backends without JSON update support."""
+        member = Member.objects.select_for_update().filter(id=member_id).first()
+        if member is None:
+            return None
+
+        data = dict(getattr(member, data_field) or {})
+        try:
+            old_value = int(data.get(field_name) or 0)
+        except (ValueError, TypeError):
+            old_value = 0
+        data[field_name] = old_value + delta
+
+        MemberService.update_member_data(member, actor=actor, **{data_field: data})
+        return getattr(member, data_field)[field_name], getattr(member, total_field)
+
     @staticmethod
     def _calculate_total(data: dict[str, Any] | None) -> int:
         """Calculate total from a data dict, handling non-numeric values."""
@@ -73,85 +288,213 @@ class MemberService:
                 pass
         return total
 
+    @staticmethod
+    def _run_column_sql(statement: tuple[str, list[Any]]) -> int:
+        """Execute a set-based column statement and return the number of rows changed."""
+        sql, params = statement
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return int(cursor.rowcount)
+
+    @staticmethod
+    def _add_field_sql(
+        data_field: str, field_name: str, default_value: Any, group_id: int
+    ) -> tuple[str, list[Any]] | None:
+        """Build a single UPDATE that sets field_name to its default for a group, or None if unsupported."""
+        table = connection.ops.quote_name(Member._meta.db_table)
+        if connection.vendor == "postgresql":
+            data_sql = f"jsonb_set(COALESCE({data_field}, '{{}}'::jsonb), ARRAY[%s]::text[], %s::jsonb)"
+            key = field_name
+        elif connection.vendor == "sqlite" and '"' not in field_name:
+            data_sql = f"json_set(COALESCE({data_field}, '{{}}'), %s, json(%s))"
+            key = f'$."{field_name}"'
+        else:
+            return None
+        return f"UPDATE {table} SET {data_field} = {data_sql} WHERE group_id = %s", [
+            key,
+            json.dumps(default_value),
+            group_id,
+        ]
+
+    @staticmethod
+    def _remove_field_sql(
+        data_field: str, total_field: str, field_name: str, group_id: int
+    ) -> tuple[str, list[Any]] | None:
+        """Build a single UPDATE that drops field_name and its numeric value from the totals, or None."""
+        table = connection.ops.quote_name(Member._meta.db_table)
+        if connection.vendor == "postgresql":
+            data_sql = f"{data_field} - %s"
+            numeric_value = (
+                f"CASE WHEN jsonb_typeof({data_field} -> %s) = 'number' "
+                f"THEN trunc(({data_field} ->> %s)::numeric)::int ELSE 0 END"
+            )
+            present = f"({data_field} -> %s) IS NOT NULL"
+            key = field_name
+        elif connection.vendor == "sqlite" and '"' not in field_name:
+            data_sql = f"json_remove({data_field}, %s)"
+            numeric_value = (
+                f"CASE WHEN json_type({data_field}, %s) IN ('integer', 'real') "
+                f"THEN CAST(json_extract({data_field}, %s) AS INTEGER) ELSE 0 END"
+            )
+            present = f"json_type({data_field}, %s) IS NOT NULL"
+            key = f'$."{field_name}"'
+        else:
+            return None
+        sql = (
+            f"UPDATE {table} SET {data_field} = {data_sql}, {total_field} = {total_field} - {numeric_value} "
+            f"WHERE group_id = %s AND {present}"
+        )
+        return sql, [key, key, key, group_id, key]
+
+    @staticmethod
+    def _rename_field_sql(data_field: str, old_name: str, new_name: str, group_id: int) -> tuple[str, list[Any]] | None:
+        """Build a single UPDATE that moves a key to a new name for a group, or None if unsupported."""
+        table = connection.ops.quote_name(Member._meta.db_table)
+        if connection.vendor == "postgresql":
+            data_sql = f"({data_field} - %s) || jsonb_build_object(%s::text, {data_field} -> %s)"
+            present = f"({data_field} -> %s) IS NOT NULL"
+            old_key, new_key = old_name, new_name
+        elif connection.vendor == "sqlite" and '"' not in old_name + new_name:
+            data_sql = f"json_set(json_remove({data_field}, %s), %s, json_extract({data_field}, %s))"
+            present = f"json_type({data_field}, %s) IS NOT NULL"
+            old_key, new_key = f'$."{old_name}"', f'$."{new_name}"'
+        else:
+            return None
+        sql = f"UPDATE {table} SET {data_field} = {data_sql} WHERE group_id = %s AND {present}"
+        return sql, [old_key, new_key, old_key, group_id, old_key]
+
     @staticmethod
     @transaction.atomic
     def add_field_to_members(group, field_name: str, field_type: str, definition: str) -> None:
         """
         Add a new field to all members in a group.
 
+        On PostgreSQL and SQLite this is one set-based UPDATE scoped to the
+        group; other backends load and bulk_update the members.
+
         Args:
             group: GroupCreationModel instance
             field_name: Name of the new field
             field_type: 'int' or 'str'
             definition: 'positive' or 'negative'
         """
+        if ScoreStorage.enabled():
+            # Missing Score rows already read as the column default
+            TableCache.bump(group.id)
+            logger.info(f"Added field '{field_name}' to group {group.title}")
+            return
+
         default_value = 0 if field_type == "int" else ""
-        members = list(Member.objects.filter(group=group))
         update_field = "positive_data" if definition == "positive" else "negative_data"
 
-        for member in members:
-            data = getattr(member, update_field)
-            if data is None:
-                data = {}
-                setattr(member, update_field, data)
-            data[field_name] = default_value
-
-        if members:
-            Member.objects.bulk_update(members, [update_field])
-
-        logger.info(f"Added field '{field_name}' to {len(members)} members in group {group.title}")
+        statement = MemberService._add_field_sql(update_field, field_name, default_value, group.id)
+        if statement is not None:
+            count = MemberService._run_column_sql(statement)
+        else:
+            members = list(Member.objects.filter(group=group))
+            for member in members:
+                data = getattr(member, update_field)
+                if data is None:
+                    data = {}
+                    setattr(member, update_field, data)
+                data[field_name] = default_value
+
+            if members:
+                Member.objects.bulk_update(members, [update_field])
+            count = len(members)
+
+        TableCache.bump(group.id)
+        logger.info(f"Added field '{field_name}' to {count} members in group {group.title}")
 
     @staticmethod
     @transaction.atomic
-    def remove_field_from_members(group, field_name: str, definition: str) -> None:
+    def remove_field_from_members(group, field_name: str, definition: str, actor=None) -> None:
         """
         Remove a field from all members in a group.
 
+        Numeric values of the removed field are subtracted from the matching
+        totals. On PostgreSQL and SQLite this is one set-based UPDATE scoped to
+        the group; other backends load and bulk_update the members. The
+        field's ledger balance is closed with 'remove' events.
+
         Args:
             group: GroupCreationModel instance
             field_name: Name of the field to remove
             definition: 'positive' or 'negative'
+            actor: User making the change (optional)
         """
-        members = list(Member.objects.filter(group=group))
-        update_field = "positive_data" if definition == "positive" else "negative_data"
+        LedgerService.record(LedgerService.build_field_closing_events(group, field_name, definition, actor=actor))
 
-        for member in members:
-            data = getattr(member, update_field)
-            if data:
-                data.pop(field_name, None)
+        if ScoreStorage.enabled():
+            # Score rows cascade with the field definition; totals are re-summed in one UPDATE
+            FieldDefinition.objects.filter(group=group, name=field_name, definition=definition).delete()
+            ScoreStorage.refresh_totals(Member.objects.filter(group=group).values("id"))
+            TableCache.bump(group.id)
+            logger.info(f"Removed field '{field_name}' from group {group.title}")
+            return
 
-        if members:
-            Member.objects.bulk_update(members, [update_field])
+        update_field = "positive_data" if definition == "positive" else "negative_data"
+        total_field = "positive_total" if definition == "positive" else "negative_total"
+
+        statement = MemberService._remove_field_sql(update_field, total_field, field_name, group.id)
+        if statement is not None:
+            MemberService._run_column_sql(statement)
+        else:
+            members = list(Member.objects.filter(group=group))
+            for member in members:
+                data = getattr(member, update_field)
+                if data:
+                    data.pop(field_name, None)
+                setattr(member, total_field, MemberService._calculate_total(data))
+
+            if members:
+                Member.objects.bulk_update(members, [update_field, total_field])
 
         # Also delete the field definition
         FieldDefinition.objects.filter(group=group, name=field_name, definition=definition).delete()
+        TableCache.bump(group.id)
 
         logger.info(f"Removed field '{field_name}' from group {group.title}")
 
     @staticmethod
     @transaction.atomic
-    def rename_field_for_members(group, old_name: str, new_name: str, definition: str) -> None:
+    def rename_field_for_members(group, old_name: str, new_name: str, definition: str, actor=None) -> None:
         """
         Rename a field for all members in a group.
 
+        On PostgreSQL and SQLite this is one set-based UPDATE scoped to the
+        group; other backends load and bulk_update the members. The ledger
+        balance moves to the new name through paired 'rename' events.
+
         Args:
             group: GroupCreationModel instance
             old_name: Current field name
             new_name: New field name
             definition: 'positive' or 'negative'
+            actor: User making the change (optional)
         """
-        members = list(Member.objects.filter(group=group))
-        update_field = "positive_data" if definition == "positive" else "negative_data"
-
-        for member in members:
-            data = getattr(member, update_field)
-            if data and old_name in data:
-                data[new_name] = data.pop(old_name)
-
-        if members:
-            Member.objects.bulk_update(members, [update_field])
-
-        # Update the field definition
+        # Score rows reference the field definition, so only the JSON layout needs member updates
+        if not ScoreStorage.enabled():
+            update_field = "positive_data" if definition == "positive" else "negative_data"
+
+            statement = MemberService._rename_field_sql(update_field, old_name, new_name, group.id)
+            if statement is not None:
+                MemberService._run_column_sql(statement)
+            else:
+                members = list(Member.objects.filter(group=group))
+                for member in members:
+                    data = getattr(member, update_field)
+                    if data and old_name in data:
+                        data[new_name] = data.pop(old_name)
+
+                if members:
+                    Member.objects.bulk_update(members, [update_field])
+
+        # Update the field definition and carry the ledger balance over
         FieldDefinition.objects.filter(group=group, name=old_name, definition=definition).update(name=new_name)
+        LedgerService.record(
+            LedgerService.build_field_closing_events(group, old_name, definition, new_name=new_name, actor=actor)
+        )
+        TableCache.bump(group.id)
 
         logger.info(f"Renamed field '{old_name}' to '{new_name}' in group {group.title}")
@@ -0,0 +1,163 @@
+"""
+Score storage for point_system app.
+
+Optional normalized layout that keeps one Score row per (member, column)
+instead of the Member.positive_data/negative_data JSON blobs. Enabled by
+setting POINT_STORAGE = "scores".
+"""
+
+import logging
+from collections.abc import Iterable
+from typing import Any
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from ..models import FieldDefinition, Member, Score
+
+logger = logging.getLogger(__name__)
+
+
+class ScoreStorage:
+    """Service class for reading and writing point data through the Score table."""
+
+    @staticmethod
+    def enabled() -> bool:
+        """Return True when the normalized Score layout is the source of truth."""
+        return getattr(settings, "POINT_STORAGE", "json") == "scores"
+
+    @staticmethod
+    def _fields_by_group(group_ids: Iterable[int], definitions: Iterable[str]) -> dict[int, list[FieldDefinition]]:
+        """Fetch field definitions for several groups in one query."""
+        fields: dict[int, list[FieldDefinition]] = {}
+        for field in FieldDefinition.objects.filter(group_id__in=set(group_ids), definition__in=list(definitions)):
+            fields.setdefault(field.group_id, []).append(field)
+        return fields
+
+    @staticmethod
+    def attach(members: list[Member]) -> list[Member]:
+        """
+        Populate positive_data/negative_data on members from their Score rows.
+
+        Uses two queries regardless of member or column count.
+
+        Args:
+            members: Member instances to populate
+
+        Returns:
+            The same list, with data dicts replaced
+        """
+        if not members:
+            return members
+
+        fields = ScoreStorage._fields_by_group((m.group_id for m in members), ("positive", "negative"))
+        scores = {(s.member_id, s.field_id): s for s in Score.objects.filter(member__in=members)}
+
+        for member in members:
+            data: dict[str, dict[str, Any]] = {"positive": {}, "negative": {}}
+            for field in fields.get(member.group_id, []):
+                score = scores.get((member.id, field.id))
+                if field.type == "int":
+                    data[field.definition][field.name] = score.int_value if score else 0
+                else:
+                    data[field.definition][field.name] = score.text_value if score else ""
+            member.positive_data = data["positive"]
+            member.negative_data = data["negative"]
+        return members
+
+    @staticmethod
+    @transaction.atomic
+    def write(members: list[Member], definitions: Iterable[str] = ("positive", "negative")) -> None:
+        """
+        Upsert the in-memory data of members into Score rows and refresh totals.
+
+        Args:
+            members: Member instances whose data dicts should be stored
+            definitions: Which tables to write ('positive' and/or 'negative')
+        """
+        if not members:
+            return
+
+        definitions = list(definitions)
+        fields = ScoreStorage._fields_by_group((m.group_id for m in members), definitions)
+
+        scores = []
+        for member in members:
+            for field in fields.get(member.group_id, []):
+                data = (member.positive_data if field.definition == "positive" else member.negative_data) or {}
+                if field.name not in data:
+                    continue
+                value = data[field.name]
+                if field.type == "int":
+                    try:
+                        int_value = int(value)
+                    except (ValueError, TypeError):
+                        int_value = 0
+                    scores.append(Score(member=member, field=field, int_value=int_value))
+                else:
+                    scores.append(Score(member=member, field=field, text_value="" if value is None else str(value)))
+
+        if scores:
+            Score.objects.bulk_create(
+                scores,
+                update_conflicts=True,
+                unique_fields=["member", "field"],
+                update_fields=["int_value", "text_value"],
+            )
+        ScoreStorage.refresh_totals([m.id for m in members])
+
+    @staticmethod
+    def refresh_totals(member_ids) -> int:
+        """
+        Recompute stored totals from Score rows with one UPDATE of SUM subqueries.
+
+        Args:
+            member_ids: IDs of the members to refresh (list or values() queryset)
+
+        Returns:
+            Number of members updated
+        """
+
+        def total_for(definition: str) -> Coalesce:
+            per_member = (
+                Score.objects.filter(member=OuterRef("pk"), field__definition=definition, field__type="int")
+                .values("member")
+                .annotate(total=Sum("int_value"))
+                .values("total")
+            )
+            return Coalesce(Subquery(per_member, output_field=IntegerField()), 0)
+
+        return Member.objects.filter(id__in=member_ids).update(
+            positive_total=total_for("positive"),
+            negative_total=total_for("negative"),
+            updated_at=timezone.now(),
+        )
+
+    @staticmethod
+    def copy_from_json(chunk_size: int = 500) -> int:
+        """
+        Copy every member's JSON data into Score rows, chunk_size members at a time.
+
+        Safe to run repeatedly; existing Score rows are overwritten.
+
+        Args:
+            chunk_size: Number of members per chunk
+
+        Returns:
+            Number of members copied
+        """
+        copied = 0
+        last_id = 0
+        while True:
+            members = list(Member.objects.filter(id__gt=last_id).order_by("id")[:chunk_size])
+            if not members:
+                break
+            last_id = members[-1].id
+            ScoreStorage.write(members)
+            copied += len(members)
+
+        logger.info(f"Copied JSON point data of {copied} members into Score rows")
+        return copied
@@ -0,0 +1,67 @@
+"""
+Table cache for point_system app.
+
+Caches the rendered positive/negative points tables per group. Fragments are
+keyed by (group, version, language, theme); every write that changes what the
+tables show bumps the group's PointTableVersion, so stale fragments are simply
+never read again and expire on their own.
+"""
+
+import logging
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.db.models import F
+
+from apps.group_maker.selectors import invalidate_group_owner
+
+from ..models import PointTableVersion
+
+logger = logging.getLogger(__name__)
+
+
+class TableCache:
+    """Service class for the versioned points-table fragment cache."""
+
+    @staticmethod
+    def timeout() -> int:
+        """Return how long rendered fragments are kept, in seconds."""
+        return getattr(settings, "POINT_TABLE_CACHE_TIMEOUT", 60 * 60 * 24)
+
+    @staticmethod
+    def version(group_id: int) -> int:
+        """Return the current table version of a group (0 if it was never bumped)."""
+        version = PointTableVersion.objects.filter(group_id=group_id).values_list("version", flat=True).first()
+        return version or 0
+
+    @staticmethod
+    def bump(group_id: int) -> None:
+        """Invalidate the cached tables of one group by incrementing its version."""
+        TableCache.bump_version(group_id)
+        # Point totals and last activity also show up in the owner's group listing
+        invalidate_group_owner(group_id)
+
+    @staticmethod
+    def bump_version(group_id: int) -> None:
+        """Increment a group's table version without touching the owner's group listing."""
+        if not PointTableVersion.objects.filter(group_id=group_id).update(version=F("version") + 1):
+            # First bump for this group: create the row (ignoring a concurrent insert) and retry
+            PointTableVersion.objects.bulk_create([PointTableVersion(group_id=group_id)], ignore_conflicts=True)
+            PointTableVersion.objects.filter(group_id=group_id).update(version=F("version") + 1)
+
+    @staticmethod
+    def bump_many(group_ids: Iterable[int]) -> None:
+        """Invalidate the cached tables of several groups."""
+        for group_id in set(group_ids):
+            TableCache.bump(group_id)
+
+    @staticmethod
+    def key(group_id: int, language: str, theme: str) -> str:
+        """
+        Build the vary-on key for a group's table fragments.
+
+        Reading the version here, before any table data, means a concurrent
+        write can at worst store fresh data under the old key, never stale
+        data under the new one.
+        """
+        return f"{group_id}:{TableCache.version(group_id)}:{language}:{theme}"
@@ -0,0 +1,40 @@
+"""
+Signals for point_system app.
+
+Invalidates cached points tables when columns or group members change.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import FieldDefinition
+from .services.table_cache import TableCache
+
+
+@receiver(post_save, sender=FieldDefinition)
+def bump_table_version_on_field_save(sender, instance, **kwargs):
+    """Invalidate the group's cached tables when a column is added or edited."""
+    TableCache.bump(instance.group_id)
+
+
+@receiver(post_delete, sender=FieldDefinition)
+def bump_table_version_on_field_delete(sender, instance, origin=None, **kwargs):
+    """
+    Invalidate the group's cached tables when a column is deleted.
+
+    Deletes cascaded from a group (or its owner) are skipped: the group's
+    version row is removed in the same cascade and must not be recreated.
+    """
+    if getattr(origin, "model", type(origin)) is not FieldDefinition:
+        return
+    TableCache.bump(instance.group_id)
+
+
+@receiver(post_save, sender="group_maker.GroupCreationModel")
+def bump_table_version_on_group_save(sender, instance, **kwargs):
+    """
+    Invalidate the group's cached tables when its title or member list may have changed.
+
+    The owner's group listing is dropped by group_maker's own receiver.
+    """
+    TableCache.bump_version(instance.id)
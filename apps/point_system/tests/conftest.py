@@ -46,3 +46,21 @@ def member_with_data(db, group_with_fields):
     member.negative_data = {"tardiness": 3}
     member.save()
     return member
+
+
+@pytest.fixture
+def make_group_with_fields(db, user):
+    """Return a factory that creates a group of `size` members with one field per table."""
+
+    def _make(size, title=None):
+        group = GroupCreationModel.objects.create(
+            user=user,
+            title=title or f"Group of {size}",
+            members_string=", ".join(f"Student {i}" for i in range(size)),
+        )
+        FieldDefinition.objects.create(group=group, name="homework", type="int", definition="positive")
+        FieldDefinition.objects.create(group=group, name="tardiness", type="int", definition="negative")
+        group.members.update(positive_data={"homework": 0}, negative_data={"tardiness": 0})
+        return group
+
+    return _make
@@ -0,0 +1,97 @@
+"""Render benchmark for the points table: per-cell filter lookups vs the precomputed row matrix."""
+
+import timeit
+from types import SimpleNamespace
+
+import pytest
+from django.template import engines
+
+from apps.point_system.selectors import build_table_rows
+
+# The per-member/per-column markup the points table used before the row matrix
+LEGACY_TABLE = """{% load custom_tags %}
+{% for member in members %}
+<tr class="{% if member.positive_total >= 10 %}high{% elif member.positive_total >= 5 %}medium{% endif %}">
+  <td>{{ member.name }}</td>
+  {% for column in columns %}
+  <td>
+    <input type="{{ column_types|get_item:column }}" name="{{ member.id }}_positive_{{ column }}"
+           value="{{ member.positive_data|get_item:column }}">
+    {% if column_types|get_item:column == "number" %}
+    <button data-member="{{ member.id }}" data-field="{{ column }}">+</button>
+    {% endif %}
+  </td>
+  {% endfor %}
+  <td><span id="total-positive-{{ member.id }}">{{ member.positive_total }}</span></td>
+</tr>
+{% endfor %}"""
+
+MATRIX_TABLE = """
+{% for row in rows %}
+<tr class="{% if row.level == "high" %}high{% elif row.level == "medium" %}medium{% endif %}">
+  <td>{{ row.name }}</td>
+  {% for cell in row.cells %}
+  <td>
+    <input type="{{ cell.type }}" name="{{ cell.input_name }}"
+           value="{{ cell.value }}">
+    {% if cell.is_number %}
+    <button data-member="{{ row.id }}" data-field="{{ cell.column }}">+</button>
+    {% endif %}
+  </td>
+  {% endfor %}
+  <td><span id="total-positive-{{ row.id }}">{{ row.total }}</span></td>
+</tr>
+{% endfor %}"""
+
+
+def _make_table(rows: int, columns: int):
+    names = [f"col{i}" for i in range(columns)]
+    types = {name: "number" if i % 3 else "text" for i, name in enumerate(names)}
+    members = [
+        SimpleNamespace(
+            id=1000 + i,
+            name=f"Student {i}",
+            positive_data={name: (i * j if types[name] == "number" else f"note {j}") for j, name in enumerate(names)},
+            positive_total=i,
+        )
+        for i in range(rows)
+    ]
+    return members, names, types
+
+
+def _input_values(html: str) -> list[str]:
+    return [chunk.split('"', 1)[0] for chunk in html.split('value="')[1:]]
+
+
+def _renderers():
+    members, names, types = _make_table(rows=40, columns=30)
+    engine = engines["django"]
+    legacy = engine.from_string(LEGACY_TABLE)
+    matrix = engine.from_string(MATRIX_TABLE)
+
+    def render_legacy():
+        return legacy.render({"members": members, "columns": names, "column_types": types})
+
+    def render_matrix():
+        rows = build_table_rows(members, "positive", names, types)
+        return matrix.render({"rows": rows})
+
+    return render_legacy, render_matrix
+
+
+class TestPointsTableRenderBenchmark:
+    """Benchmark for a 40 member x 30 column table."""
+
+    def test_row_matrix_renders_same_cells(self):
+        render_legacy, render_matrix = _renderers()
+
+        assert _input_values(render_matrix()) == _input_values(render_legacy())
+
+    @pytest.mark.benchmark
+    def test_row_matrix_renders_faster(self):
+        render_legacy, render_matrix = _renderers()
+
+        legacy_time = min(timeit.repeat(render_legacy, number=3, repeat=5)) / 3
+        matrix_time = min(timeit.repeat(render_matrix, number=3, repeat=5)) / 3
+
+        assert matrix_time < legacy_time, f"legacy {legacy_time * 1000:.1f} ms, row matrix {matrix_time * 1000:.1f} ms"
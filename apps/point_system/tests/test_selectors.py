@@ -6,6 +6,7 @@ from django.http import Http404
 from apps.group_maker.models import GroupCreationModel
 from apps.point_system import selectors
 from apps.point_system.models import FieldDefinition
+from apps.point_system.services import MemberService
 
 
 @pytest.mark.django_db
@@ -25,7 +26,7 @@ class TestGetUserGroups:
     def test_get_user_groups_empty(self, user):
         """Test getting groups when user has none."""
         groups = selectors.get_user_groups(user)
-        assert groups.count() == 0
+        assert len(groups) == 0
 
     def test_get_user_groups_multiple(self, user):
         """Test getting multiple groups."""
@@ -34,7 +35,7 @@ class TestGetUserGroups:
         group3 = GroupCreationModel.objects.create(user=user, title="Group 3", members_string="C")
 
         groups = selectors.get_user_groups(user)
-        assert groups.count() == 3
+        assert len(groups) == 3
         assert group1 in groups
         assert group2 in groups
         assert group3 in groups
@@ -188,12 +189,10 @@ class TestGetGroupFullData:
         assert "column_type_negative" in data
 
     def test_get_group_full_data_calculates_totals(self, user, group_with_fields):
-        """Test that member totals are calculated."""
+        """Test that member totals saved through the service are returned."""
         # Set some data
         member = group_with_fields.karma_members.first()
-        member.positive_data = {"homework": 10}
-        member.negative_data = {"tardiness": 5}
-        member.save()
+        MemberService.update_member_data(member, positive_data={"homework": 10}, negative_data={"tardiness": 5})
 
         data = selectors.get_group_full_data(group_with_fields.id, user)
 
@@ -204,6 +203,39 @@ class TestGetGroupFullData:
                 assert m.negative_total == 5
                 break
 
+    def test_get_group_full_data_trusts_stored_totals(self, user, group_with_fields):
+        """Test that reads return stored totals and fetch only the rendered columns."""
+        group_with_fields.karma_members.update(positive_data={"homework": 10}, positive_total=7)
+
+        data = selectors.get_group_full_data(group_with_fields.id, user)
+
+        members = list(data["members"])
+        assert all(m.positive_total == 7 for m in members)
+        assert all("color" in m.get_deferred_fields() for m in members)
+
+    def test_get_group_full_data_builds_row_matrix(self, user, group_with_fields):
+        """Test that each table gets one row per member with precomputed cells."""
+        member = group_with_fields.karma_members.order_by("id").first()
+        MemberService.update_member_data(member, positive_data={"homework": 12}, negative_data={"tardiness": 6})
+
+        data = selectors.get_group_full_data(group_with_fields.id, user)
+
+        positive_row = data["positive_rows"][0]
+        assert positive_row["id"] == str(member.id)
+        assert positive_row["total"] == "12"
+        assert positive_row["level"] == "high"
+        assert positive_row["cells"] == [
+            {
+                "input_name": f"{member.id}_positive_homework",
+                "column": "homework",
+                "value": "12",
+                "type": "number",
+                "is_number": True,
+            }
+        ]
+        assert data["negative_rows"][0]["level"] == "medium"
+        assert data["negative_rows"][1]["level"] == ""
+
     def test_get_group_full_data_permission_denied(self, other_user, group_with_fields):
         """Test that selector raises 404 for unauthorized user."""
         with pytest.raises(Http404):
@@ -260,6 +292,47 @@ class TestGetGroupFullData:
         assert len(data["negative_column_names"]) == 10
 
 
+@pytest.mark.django_db
+class TestPointHistory:
+    """Tests for the point ledger history selectors."""
+
+    def test_get_member_point_history(self, user, group_with_fields):
+        """Test that member history lists ledger entries newest first."""
+        member = group_with_fields.members.first()
+        MemberService.increment_field(member.id, "homework", "positive", actor=user)
+        MemberService.increment_field(member.id, "homework", "positive", delta=2, actor=user)
+
+        history = list(selectors.get_member_point_history(member.id, user))
+
+        assert [event.delta for event in history] == [2, 1]
+        assert all(event.actor == user for event in history)
+
+    def test_get_member_point_history_filters_field(self, user, group_with_fields):
+        """Test filtering member history by field."""
+        member = group_with_fields.members.first()
+        MemberService.increment_field(member.id, "homework", "positive")
+        MemberService.increment_field(member.id, "tardiness", "negative")
+
+        history = selectors.get_member_point_history(member.id, user, field_name="tardiness", definition="negative")
+
+        assert [event.field_name for event in history] == ["tardiness"]
+
+    def test_get_member_point_history_permission_denied(self, other_user, group_with_fields):
+        """Test that other users cannot read a member's history."""
+        member = group_with_fields.members.first()
+        with pytest.raises(Http404):
+            selectors.get_member_point_history(member.id, other_user)
+
+    def test_get_group_point_history(self, user, group_with_fields):
+        """Test that group history covers every member."""
+        for member in group_with_fields.members.all():
+            MemberService.increment_field(member.id, "homework", "positive")
+
+        history = selectors.get_group_point_history(group_with_fields.id, user, field_name="homework")
+
+        assert history.count() == 2
+
+
 @pytest.mark.django_db
 class TestSelectorEdgeCases:
     """Edge case tests for selectors."""
@@ -294,8 +367,7 @@ class TestSelectorEdgeCases:
         group.sync_members()
 
         member = group.karma_members.first()
-        member.positive_data = {"score": 100, "notes": "Excellent"}
-        member.save()
+        MemberService.update_member_data(member, positive_data={"score": 100, "notes": "Excellent"})
 
         data = selectors.get_group_full_data(group.id, user)
         for m in data["members"]:
@@ -1,10 +1,14 @@
 """Comprehensive tests for point_system app services."""
 
 import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from apps.group_maker.models import GroupCreationModel
-from apps.point_system.models import FieldDefinition
-from apps.point_system.services import CalculationService, MemberService
+from apps.point_system import selectors
+from apps.point_system.models import FieldDefinition, PointEvent, Score
+from apps.point_system.services import CalculationService, LedgerService, MemberService, ScoreStorage, TableCache
 
 
 @pytest.mark.django_db
@@ -260,6 +264,423 @@ class TestMemberService:
             assert member.negative_data.get("late_arrivals") == 5
 
 
+@pytest.mark.django_db
+class TestMemberServiceBulkUpdate:
+    """Tests for MemberService.bulk_update_member_data."""
+
+    def test_bulk_update_applies_changes(self, group_with_fields):
+        """Test that changes are applied and totals recalculated for every member."""
+        members = list(group_with_fields.karma_members.all())
+        changes = {members[0].id: {"homework": "7"}, members[1].id: {"homework": 3}}
+
+        MemberService.bulk_update_member_data(members, "positive", changes)
+
+        for member, expected in zip(members, (7, 3), strict=True):
+            member.refresh_from_db()
+            assert member.positive_data == {"homework": expected}
+            assert member.positive_total == expected
+
+    def test_bulk_update_sanitizes_and_ignores_unknown_columns(self, group_with_fields):
+        """Test that negative values are clamped and unknown columns are skipped."""
+        member = group_with_fields.karma_members.first()
+        member.negative_data = {"tardiness": 4}
+        member.save()
+
+        MemberService.bulk_update_member_data([member], "negative", {member.id: {"tardiness": -2, "unknown": 9}})
+
+        member.refresh_from_db()
+        assert member.negative_data == {"tardiness": 0}
+        assert member.negative_total == 0
+
+    def test_bulk_update_leaves_other_table_untouched(self, member_with_data):
+        """Test that updating one table does not modify the other."""
+        MemberService.bulk_update_member_data([member_with_data], "positive", {member_with_data.id: {"homework": 1}})
+
+        member_with_data.refresh_from_db()
+        assert member_with_data.negative_data == {"tardiness": 3}
+
+    def test_bulk_update_skips_unchanged_members(self, member_with_data):
+        """Test that members whose data did not change are not written."""
+        member_with_data.positive_total = 10
+        member_with_data.save()
+
+        updated = MemberService.bulk_update_member_data(
+            [member_with_data], "positive", {member_with_data.id: {"homework": 10}}
+        )
+
+        assert updated == []
+
+    def test_bulk_update_empty_members(self):
+        """Test that an empty member list is a no-op."""
+        assert MemberService.bulk_update_member_data([], "positive", {}) == []
+
+    def test_bulk_update_query_count_is_constant(self, make_group_with_fields):
+        """Test that saving a table costs the same number of queries for any group size."""
+        query_counts = []
+        for size in (3, 35):
+            members = list(make_group_with_fields(size).members.all())
+            changes = {member.id: {"homework": index} for index, member in enumerate(members)}
+
+            with CaptureQueriesContext(connection) as ctx:
+                MemberService.bulk_update_member_data(members, "positive", changes)
+            query_counts.append(len(ctx.captured_queries))
+
+        assert query_counts[0] == query_counts[1]
+
+
+@pytest.mark.django_db
+class TestMemberServiceColumnUpdates:
+    """Tests for the set-based add/rename/remove column statements."""
+
+    def _member_queries(self, ctx):
+        return [q["sql"] for q in ctx.captured_queries if '"core_member"' in q["sql"]]
+
+    def test_add_field_is_single_update(self, make_group_with_fields):
+        group = make_group_with_fields(20)
+
+        with CaptureQueriesContext(connection) as ctx:
+            MemberService.add_field_to_members(group, "quiz", "int", "positive")
+
+        member_queries = self._member_queries(ctx)
+        assert len(member_queries) == 1
+        assert member_queries[0].startswith('UPDATE "core_member"')
+        assert all(m.positive_data["quiz"] == 0 for m in group.karma_members.all())
+
+    def test_add_field_leaves_other_groups_alone(self, group_with_fields, make_group_with_fields):
+        other = make_group_with_fields(2)
+
+        MemberService.add_field_to_members(group_with_fields, "quiz", "str", "negative")
+
+        assert all(m.negative_data["quiz"] == "" for m in group_with_fields.karma_members.all())
+        assert all("quiz" not in m.negative_data for m in other.members.all())
+
+    def test_remove_field_subtracts_numeric_values_from_total(self, group_with_fields):
+        member = group_with_fields.karma_members.first()
+        MemberService.add_field_to_members(group_with_fields, "quiz", "int", "positive")
+        MemberService.update_member_data(member, positive_data={"homework": 4, "quiz": 6})
+
+        with CaptureQueriesContext(connection) as ctx:
+            MemberService.remove_field_from_members(group_with_fields, "quiz", "positive")
+
+        assert not any(q.startswith('SELECT "core_member"') for q in self._member_queries(ctx))
+        member.refresh_from_db()
+        assert member.positive_data == {"homework": 4}
+        assert member.positive_total == 4
+
+    def test_remove_text_field_keeps_total(self, group_with_fields):
+        member = group_with_fields.karma_members.first()
+        MemberService.add_field_to_members(group_with_fields, "note", "str", "positive")
+        MemberService.update_member_data(member, positive_data={"homework": 3, "note": "late"})
+
+        MemberService.remove_field_from_members(group_with_fields, "note", "positive")
+
+        member.refresh_from_db()
+        assert member.positive_data == {"homework": 3}
+        assert member.positive_total == 3
+
+    def test_rename_field_is_single_update(self, group_with_fields):
+        member = group_with_fields.karma_members.first()
+        MemberService.update_member_data(member, negative_data={"tardiness": 2})
+
+        with CaptureQueriesContext(connection) as ctx:
+            MemberService.rename_field_for_members(group_with_fields, "tardiness", "late", "negative")
+
+        member_queries = self._member_queries(ctx)
+        assert [q for q in member_queries if q.startswith('UPDATE "core_member"')] == member_queries[:1]
+        assert not any(q.startswith('SELECT "core_member"') for q in member_queries)
+        member.refresh_from_db()
+        assert member.negative_data == {"late": 2}
+        assert member.negative_total == 2
+
+
+@pytest.mark.django_db
+class TestMemberServiceIncrement:
+    """Tests for MemberService.increment_field."""
+
+    def test_increment_updates_value_and_total(self, member_with_data):
+        """Test that an increment updates the field and the matching total."""
+        member_with_data.positive_total = 10
+        member_with_data.save()
+
+        result = MemberService.increment_field(member_with_data.id, "homework", "positive")
+
+        member_with_data.refresh_from_db()
+        assert result == (11, 11)
+        assert member_with_data.positive_data == {"homework": 11}
+        assert member_with_data.positive_total == 11
+
+    def test_increment_negative_table(self, member_with_data):
+        """Test incrementing a negative field leaves positive data alone."""
+        member_with_data.negative_total = 3
+        member_with_data.save()
+
+        result = MemberService.increment_field(member_with_data.id, "tardiness", "negative", delta=2)
+
+        member_with_data.refresh_from_db()
+        assert result == (5, 5)
+        assert member_with_data.positive_data == {"homework": 10}
+
+    def test_increment_clamps_at_zero(self, member_with_data):
+        """Test that decrementing below zero stops at zero and keeps the total consistent."""
+        member_with_data.negative_total = 3
+        member_with_data.save()
+
+        result = MemberService.increment_field(member_with_data.id, "tardiness", "negative", delta=-5)
+
+        assert result == (0, 0)
+
+    def test_increment_missing_key_starts_from_zero(self, member_with_data):
+        """Test that a field missing from the member's data is treated as zero."""
+        member_with_data.positive_total = 10
+        member_with_data.save()
+
+        result = MemberService.increment_field(member_with_data.id, "participation", "positive")
+
+        assert result == (1, 11)
+
+    def test_repeated_increments_accumulate(self, member_with_data):
+        """Test that consecutive increments are not lost."""
+        member_with_data.positive_total = 10
+        member_with_data.save()
+
+        for _ in range(5):
+            MemberService.increment_field(member_with_data.id, "homework", "positive")
+
+        member_with_data.refresh_from_db()
+        assert member_with_data.positive_data["homework"] == 15
+        assert member_with_data.positive_total == 15
+
+    @pytest.mark.parametrize("stored, expected", [("n/a", (1, 1)), ("5", (6, 6)), (2.5, (3, 3)), (None, (1, 1))])
+    def test_increment_non_integer_value(self, member_with_data, stored, expected):
+        """Test that text, fractional and null values increment like _calculate_total reads them."""
+        member_with_data.positive_data = {"homework": stored}
+        member_with_data.positive_total = MemberService._calculate_total(member_with_data.positive_data)
+        member_with_data.save()
+
+        result = MemberService.increment_field(member_with_data.id, "homework", "positive")
+
+        member_with_data.refresh_from_db()
+        assert result == expected
+        assert member_with_data.positive_total == MemberService._calculate_total(member_with_data.positive_data)
+
+    def test_increment_sql_guards_postgres_cast(self, monkeypatch):
+        """Test that the PostgreSQL statement only casts values whose JSON type is a number."""
+        monkeypatch.setattr(connection, "vendor", "postgresql")
+
+        sql, params = MemberService._increment_sql("positive_data", "positive_total", "homework", 1, 1)
+
+        assert "COALESCE((positive_data ->> %s)::int, 0)" not in sql
+        assert "CASE WHEN jsonb_typeof(positive_data -> %s) = 'number'" in sql
+        assert sql.count("%s") == len(params)
+
+    def test_increment_bumps_table_version_after_its_transaction(self, member_with_data, monkeypatch):
+        """Test that the version bump is not part of the member row's transaction."""
+        depth = len(connection.atomic_blocks)
+        bump_depths = []
+        monkeypatch.setattr(TableCache, "bump", lambda group_id: bump_depths.append(len(connection.atomic_blocks)))
+
+        MemberService.increment_field(member_with_data.id, "homework", "positive")
+
+        assert bump_depths == [depth]
+
+    def test_increment_nonexistent_member(self, db):
+        """Test that incrementing an unknown member returns None."""
+        assert MemberService.increment_field(999999, "homework", "positive") is None
+
+    def test_increment_locked_fallback(self, member_with_data):
+        """Test the portable read-modify-write fallback."""
+        result = MemberService._increment_field_locked(
+            member_with_data.id, "homework", "positive_data", "positive_total", 3
+        )
+
+        member_with_data.refresh_from_db()
+        assert result == (13, 13)
+        assert member_with_data.positive_total == 13
+
+
+@pytest.mark.django_db
+class TestLedgerService:
+    """Tests for the point ledger written by MemberService and replayed by LedgerService."""
+
+    def test_update_member_data_records_deltas(self, group_with_fields, user):
+        """Test that numeric changes are recorded and text changes are not."""
+        member = group_with_fields.members.first()
+
+        MemberService.update_member_data(member, positive_data={"homework": 4, "notes": "hi"}, actor=user)
+        MemberService.update_member_data(member, positive_data={"homework": 1, "notes": "bye"}, actor=user)
+
+        deltas = list(PointEvent.objects.filter(member=member).order_by("id").values_list("field_name", "delta"))
+        assert deltas == [("homework", 4), ("homework", -3)]
+
+    def test_bulk_update_records_events(self, group_with_fields):
+        """Test that the batched save writes one event per changed cell."""
+        members = list(group_with_fields.members.all())
+        MemberService.bulk_update_member_data(members, "negative", {m.id: {"tardiness": 2} for m in members})
+
+        assert PointEvent.objects.filter(definition="negative", delta=2).count() == 2
+
+    def test_clamped_decrement_records_effective_delta(self, group_with_fields):
+        """Test that a decrement clamped at zero records the actual change."""
+        member = group_with_fields.members.first()
+        MemberService.increment_field(member.id, "homework", "positive", delta=2)
+        MemberService.increment_field(member.id, "homework", "positive", delta=-5)
+
+        assert list(PointEvent.objects.filter(member=member).order_by("id").values_list("delta", flat=True)) == [2, -2]
+
+    def test_rename_and_remove_field_append_compensating_events(self, group_with_fields):
+        """Test that renaming moves the balance and removing zeroes it without touching history."""
+        member = group_with_fields.members.first()
+        MemberService.increment_field(member.id, "homework", "positive", delta=3)
+        original = list(PointEvent.objects.filter(member=member).values_list("id", "field_name", "delta"))
+
+        MemberService.rename_field_for_members(group_with_fields, "homework", "assignments", "positive")
+        MemberService.remove_field_from_members(group_with_fields, "assignments", "positive")
+
+        events = list(
+            PointEvent.objects.filter(member=member).order_by("id").values_list("field_name", "delta", "kind")
+        )
+        assert events == [
+            ("homework", 3, "change"),
+            ("homework", -3, "rename"),
+            ("assignments", 3, "rename"),
+            ("assignments", -3, "remove"),
+        ]
+        assert list(PointEvent.objects.filter(id=original[0][0]).values_list("id", "field_name", "delta")) == original
+
+    def test_rebuild_after_rename_and_remove(self, group_with_fields):
+        """Test that replaying the ledger matches the table after column changes."""
+        member = group_with_fields.members.first()
+        MemberService.increment_field(member.id, "homework", "positive", delta=4)
+        MemberService.increment_field(member.id, "tardiness", "negative", delta=2)
+        MemberService.rename_field_for_members(group_with_fields, "homework", "assignments", "positive")
+        MemberService.remove_field_from_members(group_with_fields, "tardiness", "negative")
+        MemberService.add_field_to_members(group_with_fields, "tardiness", "int", "negative")
+
+        assert LedgerService.rebuild_projection() == 0
+        member.refresh_from_db()
+        assert member.positive_data["assignments"] == 4
+        assert member.negative_data["tardiness"] == 0
+
+    def test_rebuild_projection_restores_data(self, group_with_fields):
+        """Test that replaying the ledger repairs overwritten data and totals."""
+        members = list(group_with_fields.members.all())
+        for member in members:
+            MemberService.increment_field(member.id, "homework", "positive", delta=3)
+            MemberService.increment_field(member.id, "tardiness", "negative", delta=1)
+        group_with_fields.members.update(
+            positive_data={"homework": 99}, positive_total=99, negative_data={"tardiness": 0}, negative_total=7
+        )
+
+        corrected = LedgerService.rebuild_projection(chunk_size=1)
+
+        assert corrected == 2
+        for member in members:
+            member.refresh_from_db()
+            assert member.positive_data == {"homework": 3}
+            assert member.positive_total == 3
+            assert member.negative_data == {"tardiness": 1}
+            assert member.negative_total == 1
+
+    def test_rebuild_projection_is_idempotent(self, group_with_fields):
+        """Test that a consistent projection needs no corrections."""
+        member = group_with_fields.members.first()
+        MemberService.increment_field(member.id, "homework", "positive")
+
+        assert LedgerService.rebuild_projection() == 0
+
+    def test_rebuild_points_command(self, group_with_fields, capsys):
+        """Test the management command wrapper."""
+        member = group_with_fields.members.first()
+        MemberService.increment_field(member.id, "homework", "positive")
+        group_with_fields.members.update(positive_data={"homework": 0}, positive_total=0)
+
+        call_command("rebuild_points", group=group_with_fields.id, chunk_size=10)
+
+        member.refresh_from_db()
+        assert member.positive_data["homework"] == 1
+        assert "1 members corrected" in capsys.readouterr().out
+
+
+@pytest.fixture
+def score_storage(settings):
+    """Switch the point system to the normalized Score layout."""
+    settings.POINT_STORAGE = "scores"
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("score_storage")
+class TestScoreStorage:
+    """Tests for the normalized Score storage layout."""
+
+    def test_bulk_update_writes_score_rows(self, group_with_fields):
+        """Test that table saves upsert Score rows and refresh totals from them."""
+        members = list(group_with_fields.members.all())
+
+        MemberService.bulk_update_member_data(members, "positive", {members[0].id: {"homework": 6}})
+        MemberService.bulk_update_member_data(members, "positive", {members[0].id: {"homework": 8}})
+
+        score = Score.objects.get(member=members[0], field__name="homework")
+        assert score.int_value == 8
+        members[0].refresh_from_db()
+        assert members[0].positive_total == 8
+
+    def test_attach_reads_defaults_for_missing_rows(self, group_with_fields):
+        """Test that members without Score rows read the column defaults."""
+        FieldDefinition.objects.create(group=group_with_fields, name="notes", type="str", definition="positive")
+        members = ScoreStorage.attach(list(group_with_fields.members.all()))
+
+        assert members[0].positive_data == {"homework": 0, "notes": ""}
+        assert members[0].negative_data == {"tardiness": 0}
+
+    def test_column_changes_do_not_touch_members(self, group_with_fields):
+        """Test that adding and renaming a column are metadata-only operations."""
+        member = group_with_fields.members.first()
+        MemberService.increment_field(member.id, "homework", "positive", delta=2)
+        member.refresh_from_db()
+        positive_data_before = member.positive_data
+
+        with CaptureQueriesContext(connection) as ctx:
+            MemberService.add_field_to_members(group_with_fields, "extra", "int", "positive")
+            MemberService.rename_field_for_members(group_with_fields, "homework", "assignments", "positive")
+        assert not any(query["sql"].startswith('UPDATE "core_member"') for query in ctx.captured_queries)
+
+        member.refresh_from_db()
+        assert member.positive_data == positive_data_before
+        assert ScoreStorage.attach([member])[0].positive_data["assignments"] == 2
+
+    def test_remove_field_drops_scores_and_totals(self, group_with_fields):
+        """Test that removing a column deletes its scores and re-sums totals."""
+        member = group_with_fields.members.first()
+        MemberService.increment_field(member.id, "homework", "positive", delta=5)
+
+        MemberService.remove_field_from_members(group_with_fields, "homework", "positive")
+
+        member.refresh_from_db()
+        assert not Score.objects.filter(member=member, field__definition="positive").exists()
+        assert member.positive_total == 0
+
+    def test_selector_uses_score_rows(self, user, group_with_fields):
+        """Test that the dashboard selector reads values from Score rows."""
+        member = group_with_fields.members.first()
+        MemberService.increment_field(member.id, "tardiness", "negative", delta=3)
+
+        data = selectors.get_group_full_data(group_with_fields.id, user)
+
+        row = next(m for m in data["members"] if m.id == member.id)
+        assert row.negative_data == {"tardiness": 3}
+        assert row.negative_total == 3
+
+    def test_migrate_scores_command(self, member_with_data, capsys):
+        """Test copying the JSON layout into Score rows."""
+        call_command("migrate_scores", chunk_size=1)
+
+        values = dict(Score.objects.filter(member=member_with_data).values_list("field__name", "int_value"))
+        assert values == {"homework": 10, "tardiness": 3}
+        member_with_data.refresh_from_db()
+        assert member_with_data.positive_total == 10
+        assert "Copied point data" in capsys.readouterr().out
+
+
 @pytest.mark.django_db
 class TestMemberServiceCalculateTotal:
     """Tests for MemberService._calculate_total."""
@@ -441,11 +862,67 @@ class TestCalculationService:
 
         ranking = CalculationService.get_member_ranking(group_with_fields)
 
-        # Both should have the same net_total
+        # Both should have the same net_total and share the rank
         assert ranking[0]["net_total"] == ranking[1]["net_total"]
-        # But different ranks (no tie handling in current implementation)
         assert ranking[0]["rank"] == 1
-        assert ranking[1]["rank"] == 2
+        assert ranking[1]["rank"] == 1
+
+    def test_get_member_ranking_rank_and_dense_rank(self, make_group_with_fields):
+        """Test that RANK() skips after ties while DENSE_RANK() does not."""
+        group = make_group_with_fields(4)
+        for member, score in zip(group.members.order_by("id"), (9, 9, 5, 1), strict=True):
+            member.positive_total = score
+            member.save()
+
+        ranks = [entry["rank"] for entry in CalculationService.get_member_ranking(group)]
+        dense_ranks = [entry["rank"] for entry in CalculationService.get_member_ranking(group, dense=True)]
+
+        assert ranks == [1, 1, 3, 4]
+        assert dense_ranks == [1, 1, 2, 3]
+
+    def test_get_member_ranking_top_n_is_single_limited_query(self, make_group_with_fields):
+        """Test that a top-N ranking is one query that fetches only N rows."""
+        group = make_group_with_fields(30)
+        for index, member in enumerate(group.members.order_by("id")):
+            member.positive_total = index
+            member.save()
+
+        with CaptureQueriesContext(connection) as ctx:
+            top = CalculationService.get_member_ranking(group, limit=3)
+
+        assert len(ctx.captured_queries) == 1
+        assert "LIMIT 3" in ctx.captured_queries[0]["sql"]
+        assert [entry["positive_total"] for entry in top] == [29, 28, 27]
+        assert [entry["rank"] for entry in top] == [1, 2, 3]
+
+    def test_get_leaderboard_pages_keep_global_rank(self, make_group_with_fields):
+        """Test that later pages carry ranks relative to the whole group."""
+        group = make_group_with_fields(5)
+        for index, member in enumerate(group.members.order_by("id")):
+            member.negative_total = index
+            member.save()
+
+        board = CalculationService.get_leaderboard(group, page=2, per_page=2)
+
+        assert board["page"] == 2
+        assert board["num_pages"] == 3
+        assert board["member_count"] == 5
+        assert [entry["rank"] for entry in board["entries"]] == [3, 4]
+        assert [entry["net_total"] for entry in board["entries"]] == [-2, -3]
+
+    def test_get_leaderboard_clamps_page(self, group_with_fields):
+        """Test that out-of-range pages fall back to the last page."""
+        board = CalculationService.get_leaderboard(group_with_fields, page=99, per_page=10)
+
+        assert board["page"] == 1
+        assert len(board["entries"]) == 2
+
+    def test_calculate_group_totals_is_single_query(self, group_with_fields):
+        """Test that group totals and member count come from one aggregate query."""
+        with CaptureQueriesContext(connection) as ctx:
+            CalculationService.calculate_group_totals(group_with_fields)
+
+        assert len(ctx.captured_queries) == 1
 
     def test_recalculate_all_totals(self, group_with_fields):
         """Test recalculating all totals."""
@@ -483,6 +960,42 @@ class TestCalculationService:
         assert count == 1
 
 
+@pytest.mark.django_db
+class TestRecalculateTotals:
+    """Tests for the chunked total drift scan."""
+
+    def _drift(self, group):
+        group.karma_members.update(positive_data={"homework": 4}, positive_total=1)
+
+    def test_reports_and_fixes_drift(self, group_with_fields, make_group_with_fields):
+        self._drift(group_with_fields)
+        make_group_with_fields(3)
+
+        result = CalculationService.recalculate_totals(chunk_size=2)
+
+        assert result["checked"] == 5
+        assert result["drifted"] == {group_with_fields.id: 2}
+        assert all(m.positive_total == 4 for m in group_with_fields.karma_members.all())
+
+    def test_dry_run_leaves_totals(self, group_with_fields):
+        self._drift(group_with_fields)
+
+        result = CalculationService.recalculate_totals(dry_run=True)
+
+        assert result["drifted"] == {group_with_fields.id: 2}
+        assert all(m.positive_total == 1 for m in group_with_fields.karma_members.all())
+
+    def test_recalculate_totals_command(self, group_with_fields, capsys):
+        self._drift(group_with_fields)
+
+        call_command("recalculate_totals", "--group", str(group_with_fields.id))
+
+        out = capsys.readouterr().out
+        assert f"Group {group_with_fields.id}: 2 members with drifted totals" in out
+        assert "Checked 2 members; corrected drift in 2 members." in out
+        assert CalculationService.recalculate_totals()["drifted"] == {}
+
+
 @pytest.mark.django_db
 class TestServiceTransactions:
     """Tests for service transaction behavior."""
@@ -1,10 +1,15 @@
 """Comprehensive tests for point_system views."""
 
 import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from apps.group_maker.models import GroupCreationModel
 from apps.point_system.models import FieldDefinition
+from apps.point_system.services import MemberService, TableCache
+from apps.point_system.views import HomeView
 
 
 @pytest.mark.django_db
@@ -126,6 +131,51 @@ class TestHomeView:
         member.refresh_from_db()
         assert "nonexistent" not in member.positive_data
 
+    def test_home_view_post_touches_only_changed_rows(self, authenticated_client, group_with_fields):
+        """Test that only members with submitted cells are written."""
+        changed, untouched = list(group_with_fields.karma_members.all())
+        untouched_updated_at = untouched.updated_at
+        url = reverse("karma:karma-home")
+        data = {
+            "group_id": group_with_fields.id,
+            "positive_save": "true",
+            f"{changed.id}_positive_homework": "4",
+        }
+        authenticated_client.post(url, data)
+        changed.refresh_from_db()
+        untouched.refresh_from_db()
+        assert changed.positive_data["homework"] == 4
+        assert untouched.updated_at == untouched_updated_at
+
+    def test_home_view_post_ignores_other_table_cells(self, authenticated_client, group_with_fields):
+        """Test that cells from the table not being saved are ignored."""
+        member = group_with_fields.karma_members.first()
+        url = reverse("karma:karma-home")
+        data = {
+            "group_id": group_with_fields.id,
+            "positive_save": "true",
+            f"{member.id}_negative_tardiness": "8",
+        }
+        authenticated_client.post(url, data)
+        member.refresh_from_db()
+        assert member.negative_data.get("tardiness") != 8
+
+    def test_home_view_post_query_count_is_constant(self, authenticated_client, make_group_with_fields):
+        """Test that saving a table does not issue one query per member."""
+        url = reverse("karma:karma-home")
+        query_counts = []
+        for size in (3, 35):
+            group = make_group_with_fields(size)
+            data = {"group_id": group.id, "positive_save": "true"}
+            for member in group.members.all():
+                data[f"{member.id}_positive_homework"] = "5"
+
+            with CaptureQueriesContext(connection) as ctx:
+                authenticated_client.post(url, data)
+            query_counts.append(len(ctx.captured_queries))
+
+        assert query_counts[0] == query_counts[1]
+
     def test_home_view_empty_groups(self, authenticated_client):
         """Test home view when user has no groups."""
         url = reverse("karma:karma-home")
@@ -134,6 +184,162 @@ class TestHomeView:
         assert len(response.context["groups"]) == 0
 
 
+@pytest.mark.django_db
+class TestHomeViewTableCache:
+    """Tests for the versioned points-table fragment cache."""
+
+    def _get(self, client, group):
+        return client.get(reverse("karma:karma-home"), {"group_id": group.id})
+
+    def _tables(self, response):
+        # The rest of the page carries a per-render CSRF token
+        html = response.content.decode()
+        return html[html.index("<!-- Negative Points Table -->") : html.index("</form>", html.index("pointsForm"))]
+
+    def test_repeated_view_is_served_from_cache(self, authenticated_client, group_with_fields):
+        first = self._get(authenticated_client, group_with_fields)
+
+        with CaptureQueriesContext(connection) as ctx:
+            second = self._get(authenticated_client, group_with_fields)
+
+        assert self._tables(second) == self._tables(first)
+        assert not any('"core_member"' in q["sql"] for q in ctx.captured_queries)
+
+    def test_fragment_evicted_before_render_still_shows_rows(
+        self, authenticated_client, group_with_fields, monkeypatch
+    ):
+        member = group_with_fields.karma_members.first()
+        self._get(authenticated_client, group_with_fields)
+        get_context_data = HomeView.get_context_data
+
+        def evict_before_render(view, group_id=None):
+            context = get_context_data(view, group_id)
+            cache.clear()
+            return context
+
+        monkeypatch.setattr(HomeView, "get_context_data", evict_before_render)
+        evicted = self._get(authenticated_client, group_with_fields)
+        monkeypatch.undo()
+        cached = self._get(authenticated_client, group_with_fields)
+
+        assert member.name in self._tables(evicted)
+        assert self._tables(cached) == self._tables(evicted)
+
+    def test_save_invalidates_group_tables(self, authenticated_client, group_with_fields):
+        member = group_with_fields.karma_members.first()
+        self._get(authenticated_client, group_with_fields)
+
+        response = authenticated_client.post(
+            reverse("karma:karma-home"),
+            {"group_id": group_with_fields.id, "positive_save": "true", f"{member.id}_positive_homework": "7"},
+        )
+
+        assert response.context["positive_rows"]
+        assert 'value="7"' in response.content.decode()
+
+    def test_increment_invalidates_group_tables(self, authenticated_client, group_with_fields):
+        member = group_with_fields.karma_members.first()
+        self._get(authenticated_client, group_with_fields)
+
+        authenticated_client.post(
+            reverse("karma:increment-points", args=[member.id]),
+            {"field_name": "homework", "definition": "positive", "delta": 3},
+        )
+
+        response = self._get(authenticated_client, group_with_fields)
+        assert response.context["positive_rows"][0]["cells"][0]["value"] == "3"
+
+    def test_column_change_invalidates_group_tables(self, authenticated_client, group_with_fields):
+        self._get(authenticated_client, group_with_fields)
+
+        FieldDefinition.objects.create(group=group_with_fields, name="quiz", type="int", definition="positive")
+
+        response = self._get(authenticated_client, group_with_fields)
+        assert "quiz" in response.context["positive_data"]
+
+    def test_writes_only_bump_the_affected_group(self, group_with_fields, make_group_with_fields):
+        other = make_group_with_fields(2)
+        other_version = TableCache.version(other.id)
+        version = TableCache.version(group_with_fields.id)
+
+        MemberService.update_member_data(group_with_fields.karma_members.first(), positive_data={"homework": 1})
+
+        assert TableCache.version(group_with_fields.id) == version + 1
+        assert TableCache.version(other.id) == other_version
+
+    def test_cache_key_varies_by_language_and_theme(self, group_with_fields):
+        keys = {
+            TableCache.key(group_with_fields.id, "en", "dark"),
+            TableCache.key(group_with_fields.id, "pt", "dark"),
+            TableCache.key(group_with_fields.id, "en", "pastel"),
+        }
+        assert len(keys) == 3
+
+    def test_deleting_group_with_columns_succeeds(self, group_with_fields):
+        TableCache.bump(group_with_fields.id)
+        group_id = group_with_fields.id
+
+        group_with_fields.delete()
+
+        assert not FieldDefinition.objects.filter(group_id=group_id).exists()
+        assert TableCache.version(group_id) == 0
+
+
+@pytest.mark.django_db
+class TestIncrementPointsView:
+    """Tests for the IncrementPoints JSON endpoint."""
+
+    def test_increment_requires_login(self, client, member_with_data):
+        """Test that unauthenticated users are redirected."""
+        url = reverse("karma:increment-points", args=[member_with_data.id])
+        response = client.post(url, {"field_name": "homework", "definition": "positive"})
+        assert response.status_code == 302
+
+    def test_increment_default_delta(self, authenticated_client, member_with_data):
+        """Test that a bare request adds one point."""
+        url = reverse("karma:increment-points", args=[member_with_data.id])
+        response = authenticated_client.post(url, {"field_name": "homework", "definition": "positive"})
+        assert response.status_code == 200
+        assert response.json()["value"] == 11
+        member_with_data.refresh_from_db()
+        assert member_with_data.positive_data["homework"] == 11
+
+    def test_increment_with_delta(self, authenticated_client, member_with_data):
+        """Test that an explicit delta is applied."""
+        url = reverse("karma:increment-points", args=[member_with_data.id])
+        response = authenticated_client.post(url, {"field_name": "tardiness", "definition": "negative", "delta": -1})
+        assert response.status_code == 200
+        assert response.json()["value"] == 2
+
+    def test_increment_invalid_request(self, authenticated_client, member_with_data):
+        """Test that an invalid definition is rejected."""
+        url = reverse("karma:increment-points", args=[member_with_data.id])
+        response = authenticated_client.post(url, {"field_name": "homework", "definition": "neutral"})
+        assert response.status_code == 400
+
+    def test_increment_unknown_field(self, authenticated_client, member_with_data):
+        """Test that fields without a definition are rejected."""
+        url = reverse("karma:increment-points", args=[member_with_data.id])
+        response = authenticated_client.post(url, {"field_name": "unknown", "definition": "positive"})
+        assert response.status_code == 404
+
+    def test_increment_text_field(self, authenticated_client, member_with_data, group_with_fields):
+        """Test that text fields cannot be incremented."""
+        FieldDefinition.objects.create(group=group_with_fields, name="notes", type="str", definition="positive")
+        url = reverse("karma:increment-points", args=[member_with_data.id])
+        response = authenticated_client.post(url, {"field_name": "notes", "definition": "positive"})
+        assert response.status_code == 404
+
+    def test_increment_other_user_member(self, authenticated_client, other_user):
+        """Test that members of another user's group cannot be incremented."""
+        other_group = GroupCreationModel.objects.create(user=other_user, title="Other", members_string="X")
+        FieldDefinition.objects.create(group=other_group, name="homework", type="int", definition="positive")
+        member = other_group.members.first()
+        url = reverse("karma:increment-points", args=[member.id])
+        response = authenticated_client.post(url, {"field_name": "homework", "definition": "positive"})
+        assert response.status_code == 404
+
+
 @pytest.mark.django_db
 class TestAddColumnView:
     """Tests for AddColumn view (new-column)."""
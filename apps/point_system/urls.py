@@ -1,6 +1,6 @@
 from django.urls import path
 
-from .views import AddColumn, DashboardView, DeleteColumn, EditColumn, HomeView
+from .views import AddColumn, DashboardView, DeleteColumn, EditColumn, HomeView, IncrementPoints
 
 app_name = "karma"
 
@@ -10,5 +10,6 @@ urlpatterns = [
     path("new_column/<int:pk>", AddColumn.as_view(), name="new-column"),
     path("delete_column/<int:pk>", DeleteColumn.as_view(), name="delete-column"),
     path("edit_column/<int:pk>", EditColumn.as_view(), name="edit-column"),
+    path("increment/<int:pk>", IncrementPoints.as_view(), name="increment-points"),
     path("karma_dashboard/<int:pk>", DashboardView.as_view(), name="karma-dashboard"),
 ]
@@ -1,16 +1,25 @@
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db import IntegrityError, transaction
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
-from django.views.generic import TemplateView
+from django.utils.functional import SimpleLazyObject
+from django.utils.translation import get_language
+from django.views.generic import TemplateView, View
 
 from apps.group_maker.models import GroupCreationModel
 
-from .forms import AddFieldForm, EditColumnForm
+from .forms import AddFieldForm, EditColumnForm, IncrementPointsForm
 from .models import FieldDefinition
 from .selectors import get_group_full_data, get_group_with_members, get_user_groups
 from .services.member_service import MemberService
+from .services.table_cache import TableCache
+
+
+def _lazy_item(data, key):
+    """Return a lazy proxy for data[key] that is only resolved when the template reads it."""
+    return SimpleLazyObject(lambda: data[key])
 
 
 class HomeView(LoginRequiredMixin, TemplateView):
@@ -23,6 +32,8 @@ class HomeView(LoginRequiredMixin, TemplateView):
             "selected_group": None,
             "group_id": group_id,
             "members": [],
+            "positive_rows": [],
+            "negative_rows": [],
             "positive_data": [],
             "negative_data": [],
             "column_type_positive": {},
@@ -30,15 +41,28 @@ class HomeView(LoginRequiredMixin, TemplateView):
         }
 
         if group_id:
-            data = get_group_full_data(int(group_id), self.request.user)
+            group, _ = get_group_with_members(int(group_id), self.request.user)
+            table_cache_key = TableCache.key(group.id, get_language(), getattr(self.request.user, "theme", ""))
+            context.update(
+                {
+                    "selected_group": group,
+                    "table_cache_key": table_cache_key,
+                    "table_cache_timeout": TableCache.timeout(),
+                }
+            )
+            # Built on first use, so a {% cache %} hit skips the member and column
+            # queries while a miss (even one evicted after the key was read)
+            # always renders real rows
+            data = SimpleLazyObject(lambda: get_group_full_data(group.id, self.request.user))
             context.update(
                 {
-                    "selected_group": data["group"],
-                    "members": data["members"],
-                    "positive_data": data["positive_column_names"],
-                    "negative_data": data["negative_column_names"],
-                    "column_type_positive": data["column_type_positive"],
-                    "column_type_negative": data["column_type_negative"],
+                    "members": _lazy_item(data, "members"),
+                    "positive_rows": _lazy_item(data, "positive_rows"),
+                    "negative_rows": _lazy_item(data, "negative_rows"),
+                    "positive_data": _lazy_item(data, "positive_column_names"),
+                    "negative_data": _lazy_item(data, "negative_column_names"),
+                    "column_type_positive": _lazy_item(data, "column_type_positive"),
+                    "column_type_negative": _lazy_item(data, "column_type_negative"),
                 }
             )
 
@@ -55,36 +79,63 @@ class HomeView(LoginRequiredMixin, TemplateView):
             return redirect(reverse("karma:karma-home"))
         _, members = get_group_with_members(int(group_id), request.user)
 
-        # Pre-index POST data by member ID in a single pass: O(m) instead of O(n*m)
-        post_data = {}
-        for key, value in request.POST.items():
-            for sep in ("_positive_", "_negative_"):
-                if sep in key:
-                    member_id, col_name = key.split(sep, 1)
-                    kind = sep.strip("_")  # "positive" or "negative"
-                    post_data.setdefault(member_id, {}).setdefault(kind, {})[col_name] = value
-                    break
-
-        for member in members:
-            member_post = post_data.get(str(member.id), {})
-
-            if "negative_save" in request.POST:
-                negative_data = member.negative_data.copy() if member.negative_data else {}
-                for col_name, value in member_post.get("negative", {}).items():
-                    if col_name in negative_data:
-                        negative_data[col_name] = value
-                MemberService.update_member_data(member, negative_data=negative_data)
-            elif "positive_save" in request.POST:
-                positive_data = member.positive_data.copy() if member.positive_data else {}
-                for col_name, value in member_post.get("positive", {}).items():
-                    if col_name in positive_data:
-                        positive_data[col_name] = value
-                MemberService.update_member_data(member, positive_data=positive_data)
+        if "negative_save" in request.POST:
+            definition = "negative"
+        elif "positive_save" in request.POST:
+            definition = "positive"
+        else:
+            definition = None
+
+        if definition:
+            # The form only submits cells the teacher edited, so index the
+            # (member_id, column, value) triples and touch just those rows.
+            changes: dict[int, dict[str, str]] = {}
+            separator = f"_{definition}_"
+            for key, value in request.POST.items():
+                member_id, sep, col_name = key.partition(separator)
+                if sep and member_id.isdigit():
+                    changes.setdefault(int(member_id), {})[col_name] = value
+
+            if changes:
+                MemberService.bulk_update_member_data(
+                    members.filter(id__in=changes), definition, changes, actor=request.user
+                )
 
         context = self.get_context_data(group_id)
         return render(request, self.template_name, context)
 
 
+class IncrementPoints(LoginRequiredMixin, View):
+    """JSON endpoint that adds (or removes) points on one numeric field of one member."""
+
+    def post(self, request, pk):
+        form = IncrementPointsForm(request.POST)
+        if not form.is_valid():
+            return JsonResponse({"error": "Invalid request"}, status=400)
+
+        field_name = form.cleaned_data["field_name"]
+        definition = form.cleaned_data["definition"]
+        delta = form.cleaned_data["delta"] if form.cleaned_data["delta"] is not None else 1
+
+        # One query checks both member ownership and that the field is numeric
+        field_exists = FieldDefinition.objects.filter(
+            group__user=request.user,
+            group__members__id=pk,
+            name=field_name,
+            definition=definition,
+            type="int",
+        ).exists()
+        if not field_exists:
+            return JsonResponse({"error": "Field not found"}, status=404)
+
+        result = MemberService.increment_field(pk, field_name, definition, delta, actor=request.user)
+        if result is None:
+            return JsonResponse({"error": "Member not found"}, status=404)
+
+        value, total = result
+        return JsonResponse({"member_id": pk, "field_name": field_name, "value": value, "total": total})
+
+
 class AddColumn(LoginRequiredMixin, TemplateView):
     template_name = "point_system/new_column.html"
 
@@ -176,7 +227,7 @@ class EditColumn(LoginRequiredMixin, TemplateView):
 
             try:
                 # Use service to rename field
-                MemberService.rename_field_for_members(group, old_name, new_name, table_definition)
+                MemberService.rename_field_for_members(group, old_name, new_name, table_definition, actor=request.user)
                 return redirect(f"{reverse('karma:karma-home')}?group_id={group.id}")
 
             except FieldDefinition.DoesNotExist:
@@ -226,7 +277,7 @@ class DeleteColumn(LoginRequiredMixin, TemplateView):
 
         if field_name and field_name in all_keys:
             # Use service to remove field
-            MemberService.remove_field_from_members(group, field_name, table_definition)
+            MemberService.remove_field_from_members(group, field_name, table_definition, actor=request.user)
 
             return redirect(f"{reverse('karma:karma-home')}?group_id={group.id}")
 
@@ -4,6 +4,7 @@ import pytest
 from django.urls import reverse
 
 from apps.users.models import UserStats
+from apps.users.services import UsageCounters
 
 
 @pytest.mark.django_db
@@ -105,7 +106,7 @@ class TestStopwatchViewPost:
         """POST with elapsed=0 does not update total."""
         response = authenticated_client.post(url, {"action": "stop", "elapsed": "0"})
         assert response.status_code == 200
-        stats = UserStats.objects.get(user=user)
+        stats = UsageCounters.read(user)
         assert stats.stopwatch_total_ms == 0
 
     def test_invalid_action_returns_400(self, authenticated_client, url):
@@ -189,7 +190,7 @@ class TestCountdownViewPost:
     def test_stop_with_zero_elapsed_does_not_save(self, authenticated_client, url, user):
         """POST with elapsed=0 does not update total."""
         authenticated_client.post(url, {"action": "stop", "elapsed": "0"})
-        stats = UserStats.objects.get(user=user)
+        stats = UsageCounters.read(user)
         assert stats.countdown_total_ms == 0
 
     def test_invalid_action_returns_400(self, authenticated_client, url):
@@ -2,7 +2,7 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import JsonResponse
 from django.views.generic import FormView, TemplateView
 
-from apps.users.models import UserStats
+from apps.users.services import UsageCounters
 
 from .forms import CountdownmForm
 
@@ -16,19 +16,14 @@ class StopwatchView(LoginRequiredMixin, TemplateView):
 
     def post(self, request):
         action = request.POST.get("action")
-        stats, _ = UserStats.objects.get_or_create(user=request.user)
 
         if action == "start":
-            stats.stopwatch_starts += 1
-            stats.save(update_fields=["stopwatch_starts"])
+            UsageCounters.increment(request.user.id, "stopwatch_starts")
         elif action == "flag":
-            stats.stopwatch_flags += 1
-            stats.save(update_fields=["stopwatch_flags"])
+            UsageCounters.increment(request.user.id, "stopwatch_flags")
         elif action == "stop":
             elapsed = int(request.POST.get("elapsed", 0))
-            if elapsed > 0:
-                stats.stopwatch_total_ms += elapsed
-                stats.save(update_fields=["stopwatch_total_ms"])
+            UsageCounters.increment(request.user.id, "stopwatch_total_ms", elapsed)
         else:
             return JsonResponse({"status": "error"}, status=400)
 
@@ -41,16 +36,12 @@ class TimerView(LoginRequiredMixin, FormView):
 
     def post(self, request, *args, **kwargs):
         action = request.POST.get("action")
-        stats, _ = UserStats.objects.get_or_create(user=request.user)
 
         if action == "start":
-            stats.countdown_starts += 1
-            stats.save(update_fields=["countdown_starts"])
+            UsageCounters.increment(request.user.id, "countdown_starts")
         elif action == "stop":
             elapsed = int(request.POST.get("elapsed", 0))
-            if elapsed > 0:
-                stats.countdown_total_ms += elapsed
-                stats.save(update_fields=["countdown_total_ms"])
+            UsageCounters.increment(request.user.id, "countdown_total_ms", elapsed)
         else:
             return JsonResponse({"status": "error"}, status=400)
 
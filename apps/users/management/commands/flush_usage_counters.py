@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.users.services import UsageCounters
+
+
+class Command(BaseCommand):
+    help = "Write usage counter increments buffered in Redis or Memcached to UserStats."
+
+    def handle(self, *args, **options):
+        flushed = UsageCounters.flush()
+        self.stdout.write(self.style.SUCCESS(f"Flushed usage counters of {flushed} users."))
@@ -0,0 +1,66 @@
+"""
+Selectors for users app.
+
+Landing-page dashboard numbers of a user: group and member counts, point
+totals and usage stats, read in one aggregate query and cached per user
+until one of the user's groups, members or stats changes. Changes delete the
+cached numbers, so every worker must share the cache; core.W001 warns when
+it does not.
+"""
+
+import logging
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import Coalesce
+
+from .services.usage_counters import FIELDS, UsageCounters
+
+logger = logging.getLogger(__name__)
+
+
+def _dashboard_key(user_id: int) -> str:
+    return f"users:dashboard:{user_id}"
+
+
+def get_dashboard(user) -> dict[str, int]:
+    """
+    Get the dashboard numbers of a user.
+
+    Usage counters include increments still buffered when the numbers were
+    read; later buffered increments show up once they are flushed.
+
+    Args:
+        user: User instance
+
+    Returns:
+        Dict with groups_count, members_count, positive_points,
+        negative_points and one entry per usage counter
+    """
+    key = _dashboard_key(user.pk)
+    dashboard: dict[str, int] | None = cache.get(key)
+    if dashboard is None:
+        dashboard = (
+            get_user_model()
+            .objects.filter(pk=user.pk)
+            .aggregate(
+                groups_count=Count("groupcreationmodel", distinct=True),
+                members_count=Count("groupcreationmodel__members"),
+                positive_points=Coalesce(Sum("groupcreationmodel__members__positive_total"), 0),
+                negative_points=Coalesce(Sum("groupcreationmodel__members__negative_total"), 0),
+                # One stats row per user, so Max just carries it through the join
+                **{field: Coalesce(Max(f"stats__{field}"), 0) for field in FIELDS},
+            )
+        )
+        if UsageCounters.buffering():
+            for field, delta in UsageCounters.pending(user.pk).items():
+                dashboard[field] += delta
+        cache.set(key, dashboard, getattr(settings, "DASHBOARD_CACHE_TIMEOUT", 60 * 60))
+    return dashboard
+
+
+def invalidate_dashboard(user_id: int) -> None:
+    """Drop the cached dashboard numbers of a user."""
+    cache.delete(_dashboard_key(user_id))
@@ -0,0 +1,9 @@
+"""
+Service layer for users app.
+
+Contains business logic separated from views.
+"""
+
+from .usage_counters import UsageCounters
+
+__all__ = ["UsageCounters"]
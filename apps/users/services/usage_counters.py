@@ -0,0 +1,229 @@
+"""
+Usage counters for users app.
+
+Buffers UserStats increments in the cache instead of writing the row on
+every click. Each (user, field) delta is its own atomic cache counter; users
+with pending deltas are registered in numbered slots so a flush, from any
+process, can find them. A flush applies each user's deltas with F()
+increments in one UPDATE and subtracts exactly what it applied, so
+increments racing with a flush are never lost.
+
+Buffering needs a cache that every process shares and whose incr() is
+atomic, i.e. Redis or Memcached. With any other backend (the database cache
+reads and rewrites counters; local memory is private to one process, so its
+deltas die with the worker) every increment is written through instead.
+
+A flush runs USAGE_COUNTERS_FLUSH_SECONDS after the first buffered
+increment, from a timer in the process that buffered it. That bound only
+holds while the process stays alive: deltas of a worker that exits first
+stay in the cache until another worker's timer or the flush_usage_counters
+command flushes them. Setting the lag to 0 writes every increment through
+immediately.
+"""
+
+import logging
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F
+
+from ..models import UserStats
+
+logger = logging.getLogger(__name__)
+
+FIELDS = (
+    "calculator_uses",
+    "wheel_spins",
+    "divider_uses",
+    "stopwatch_starts",
+    "stopwatch_flags",
+    "stopwatch_total_ms",
+    "countdown_starts",
+    "countdown_total_ms",
+)
+
+# Shared backends with an atomic incr(); only these can buffer
+BUFFERING_CACHES = (
+    "django.core.cache.backends.redis.RedisCache",
+    "django.core.cache.backends.memcached.PyMemcacheCache",
+    "django.core.cache.backends.memcached.PyLibMCCache",
+)
+
+SEQUENCE_KEY = "usage:slot_sequence"
+FLUSHED_KEY = "usage:flushed_sequence"
+FLUSH_LOCK_KEY = "usage:flush_lock"
+
+_timer_lock = threading.Lock()
+_timer: threading.Timer | None = None
+
+
+def _pending_key(user_id: int, field: str) -> str:
+    return f"usage:pending:{user_id}:{field}"
+
+
+def _dirty_key(user_id: int) -> str:
+    return f"usage:dirty:{user_id}"
+
+
+def _slot_key(slot: int) -> str:
+    return f"usage:slot:{slot}"
+
+
+def _incr(key: str, amount: int) -> int:
+    """Atomically add to a cache counter, creating it if missing."""
+    try:
+        return cache.incr(key, amount)
+    except ValueError:
+        if cache.add(key, amount, None):
+            return amount
+        return cache.incr(key, amount)
+
+
+class UsageCounters:
+    """Service class for buffered UserStats counters."""
+
+    @staticmethod
+    def lag() -> int:
+        """Return the maximum number of seconds a buffered increment waits before it is flushed."""
+        return getattr(settings, "USAGE_COUNTERS_FLUSH_SECONDS", 10)
+
+    @staticmethod
+    def buffering() -> bool:
+        """Return whether increments are buffered rather than written through."""
+        backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+        return UsageCounters.lag() > 0 and backend in BUFFERING_CACHES
+
+    @staticmethod
+    def increment(user_id: int, field: str, amount: int = 1) -> None:
+        """
+        Add amount to one of a user's usage counters.
+
+        Args:
+            user_id: ID of the user
+            field: One of FIELDS
+            amount: Positive amount to add
+        """
+        if field not in FIELDS:
+            raise ValueError(f"Unknown usage counter: {field}")
+        if amount <= 0:
+            return
+        if not UsageCounters.buffering():
+            UsageCounters._apply({user_id: {field: amount}})
+            return
+
+        _incr(_pending_key(user_id, field), amount)
+        if cache.add(_dirty_key(user_id), 1, None):
+            cache.set(_slot_key(_incr(SEQUENCE_KEY, 1)), user_id, None)
+        UsageCounters._schedule_flush()
+
+    @staticmethod
+    def pending(user_id: int) -> dict[str, int]:
+        """Return a user's buffered deltas that are not in the database yet."""
+        values = cache.get_many([_pending_key(user_id, field) for field in FIELDS])
+        return {field: values.get(_pending_key(user_id, field), 0) for field in FIELDS}
+
+    @staticmethod
+    def read(user) -> UserStats:
+        """
+        Return a user's stats with pending deltas merged in.
+
+        Never writes; users without a row get an unsaved UserStats of zeros.
+        """
+        stats = UserStats.objects.filter(user=user).first() or UserStats(user=user)
+        if UsageCounters.buffering():
+            for field, delta in UsageCounters.pending(user.pk).items():
+                if delta:
+                    setattr(stats, field, getattr(stats, field) + delta)
+        return stats
+
+    @staticmethod
+    def _apply(deltas_by_user: dict[int, dict[str, int]]) -> None:
+        """
+        Write deltas with one UPDATE of F() increments per user.
+
+        Users without a stats row yet get one inserted (ignoring a concurrent
+        insert) and updated again, so the common case is a single UPDATE.
+        """
+        from ..selectors import invalidate_dashboard
+
+        def update(user_id: int, deltas: dict[str, int]) -> int:
+            return UserStats.objects.filter(user_id=user_id).update(
+                **{field: F(field) + delta for field, delta in deltas.items()}
+            )
+
+        missing = {user_id: deltas for user_id, deltas in deltas_by_user.items() if not update(user_id, deltas)}
+        if missing:
+            UserStats.objects.bulk_create([UserStats(user_id=user_id) for user_id in missing], ignore_conflicts=True)
+            for user_id, deltas in missing.items():
+                update(user_id, deltas)
+        for user_id in deltas_by_user:
+            invalidate_dashboard(user_id)
+
+    @staticmethod
+    def flush() -> int:
+        """
+        Write every buffered delta to the database.
+
+        Only one flush runs at a time across processes; a concurrent call
+        returns immediately.
+
+        Returns:
+            Number of users whose stats were updated
+        """
+        if not cache.add(FLUSH_LOCK_KEY, 1, 60):
+            return 0
+        deltas_by_user: dict[int, dict[str, int]] = {}
+        try:
+            start = cache.get(FLUSHED_KEY, 0)
+            end = cache.get(SEQUENCE_KEY, 0)
+            if end < start:
+                # The sequence was evicted and restarted
+                start = 0
+            slot_keys = [_slot_key(slot) for slot in range(start + 1, end + 1)]
+            user_ids = set(cache.get_many(slot_keys).values())
+
+            # Unmark before reading, so an increment from here on registers a new slot
+            cache.delete_many([_dirty_key(user_id) for user_id in user_ids])
+            for user_id in user_ids:
+                deltas = {field: delta for field, delta in UsageCounters.pending(user_id).items() if delta}
+                if deltas:
+                    deltas_by_user[user_id] = deltas
+
+            if deltas_by_user:
+                UsageCounters._apply(deltas_by_user)
+                for user_id, deltas in deltas_by_user.items():
+                    for field, delta in deltas.items():
+                        try:
+                            cache.decr(_pending_key(user_id, field), delta)
+                        except ValueError:
+                            pass
+            cache.delete_many(slot_keys)
+            cache.set(FLUSHED_KEY, end, None)
+        finally:
+            cache.delete(FLUSH_LOCK_KEY)
+
+        if deltas_by_user:
+            logger.info(f"Flushed usage counters of {len(deltas_by_user)} users")
+        return len(deltas_by_user)
+
+    @staticmethod
+    def _schedule_flush() -> None:
+        """Start a flush timer in this process unless one is already pending."""
+        global _timer
+        with _timer_lock:
+            if _timer is not None and _timer.is_alive():
+                return
+            _timer = threading.Timer(UsageCounters.lag(), UsageCounters._timed_flush)
+            _timer.daemon = True
+            _timer.start()
+
+    @staticmethod
+    def _timed_flush() -> None:
+        try:
+            UsageCounters.flush()
+        except Exception:
+            logger.exception("Timed usage counter flush failed")
+        finally:
+            connection.close()
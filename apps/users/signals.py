@@ -0,0 +1,19 @@
+"""
+Signals for users app.
+
+Keeps the cached dashboard numbers of a user fresh when their stats row is
+written directly (buffered counter flushes invalidate on their own).
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import UserStats
+from .selectors import invalidate_dashboard
+
+
+@receiver(post_save, sender=UserStats)
+@receiver(post_delete, sender=UserStats)
+def invalidate_dashboard_on_stats_write(sender, instance, **kwargs):
+    """Drop the user's cached dashboard when their stats row is saved or deleted."""
+    invalidate_dashboard(instance.user_id)
@@ -0,0 +1,135 @@
+"""Tests for users app selectors."""
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.group_maker.models import GroupCreationModel
+from apps.point_system.models import FieldDefinition
+from apps.point_system.services import MemberService
+from apps.users.models import UserStats
+from apps.users.selectors import get_dashboard
+from apps.users.services import UsageCounters
+
+
+@pytest.fixture
+def group(user):
+    return GroupCreationModel.objects.create(user=user, title="Class A", members_string="Alice, Bob, Charlie")
+
+
+@pytest.mark.django_db
+class TestGetDashboard:
+    """Tests for the cached landing-page numbers."""
+
+    def test_counts_points_and_usage(self, user, group):
+        GroupCreationModel.objects.create(user=user, title="Class B", members_string="Zed")
+        FieldDefinition.objects.create(group=group, name="hw", type="int", definition="positive")
+        FieldDefinition.objects.create(group=group, name="late", type="int", definition="negative")
+        alice, bob, _ = group.members.order_by("id")
+        MemberService.update_member_data(alice, positive_data={"hw": 5}, negative_data={"late": 2})
+        MemberService.update_member_data(bob, positive_data={"hw": 1})
+        UserStats.objects.create(user=user, wheel_spins=7, countdown_total_ms=60_000)
+
+        dashboard = get_dashboard(user)
+
+        assert dashboard["groups_count"] == 2
+        assert dashboard["members_count"] == 4
+        assert dashboard["positive_points"] == 6
+        assert dashboard["negative_points"] == 2
+        assert dashboard["wheel_spins"] == 7
+        assert dashboard["countdown_total_ms"] == 60_000
+
+    def test_new_user_is_all_zeros(self, user):
+        dashboard = get_dashboard(user)
+
+        assert set(dashboard.values()) == {0}
+        assert not UserStats.objects.filter(user=user).exists()
+
+    def test_single_query_then_cached(self, user, group):
+        with CaptureQueriesContext(connection) as first:
+            get_dashboard(user)
+        with CaptureQueriesContext(connection) as second:
+            get_dashboard(user)
+
+        assert len(first) == 1
+        assert len(second) == 0
+
+    def test_other_users_data_excluded(self, user, other_user, group):
+        GroupCreationModel.objects.create(user=other_user, title="Theirs", members_string="Zed")
+
+        assert get_dashboard(user)["members_count"] == 3
+        assert get_dashboard(other_user)["members_count"] == 1
+
+    def test_group_writes_invalidate(self, user, group):
+        assert get_dashboard(user)["members_count"] == 3
+
+        group.members_string = "Alice, Bob"
+        group.save()
+        assert get_dashboard(user)["members_count"] == 2
+
+        group.delete()
+        assert get_dashboard(user)["groups_count"] == 0
+
+    def test_member_delete_invalidates(self, user, group):
+        get_dashboard(user)
+
+        group.members.first().delete()
+
+        assert get_dashboard(user)["members_count"] == 2
+
+    def test_point_write_invalidates(self, user, group):
+        FieldDefinition.objects.create(group=group, name="hw", type="int", definition="positive")
+        assert get_dashboard(user)["positive_points"] == 0
+
+        MemberService.update_member_data(group.members.first(), positive_data={"hw": 3})
+
+        assert get_dashboard(user)["positive_points"] == 3
+
+    def test_stats_writes_invalidate(self, user):
+        get_dashboard(user)
+
+        UsageCounters.increment(user.id, "divider_uses")
+        assert get_dashboard(user)["divider_uses"] == 1
+
+        UserStats.objects.filter(user=user).get().delete()
+        assert get_dashboard(user)["divider_uses"] == 0
+
+    def test_buffered_increments_show_after_flush(self, user, settings, monkeypatch):
+        settings.USAGE_COUNTERS_FLUSH_SECONDS = 10
+        monkeypatch.setattr(UsageCounters, "buffering", staticmethod(lambda: True))
+        monkeypatch.setattr(UsageCounters, "_schedule_flush", staticmethod(lambda: None))
+        UsageCounters.increment(user.id, "calculator_uses")
+        assert get_dashboard(user)["calculator_uses"] == 1
+
+        UsageCounters.increment(user.id, "calculator_uses")
+        UsageCounters.flush()
+
+        assert get_dashboard(user)["calculator_uses"] == 2
+
+
+@pytest.mark.django_db
+class TestHomeView:
+    """Tests for the landing page numbers."""
+
+    def test_renders_dashboard(self, authenticated_client, user, group):
+        UserStats.objects.create(user=user, divider_uses=4, stopwatch_total_ms=120_000)
+
+        response = authenticated_client.get(reverse("home"))
+
+        assert response.status_code == 200
+        assert response.context["user_groups_count"] == 1
+        assert response.context["user_members_count"] == 3
+        assert response.context["divider_uses"] == 4
+        assert response.context["timer_total_minutes"] == 2
+
+    def test_cached_visit_adds_no_queries(self, authenticated_client, user, group):
+        authenticated_client.get(reverse("home"))
+        with CaptureQueriesContext(connection) as warm:
+            authenticated_client.get(reverse("home"))
+        cache.clear()
+        with CaptureQueriesContext(connection) as cold:
+            authenticated_client.get(reverse("home"))
+
+        assert len(cold) == len(warm) + 1
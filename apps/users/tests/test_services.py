@@ -0,0 +1,148 @@
+"""Tests for users app services."""
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.users.models import UserStats
+from apps.users.services import UsageCounters
+
+
+@pytest.fixture
+def buffered(settings, monkeypatch):
+    """
+    Buffer increments without starting the background flush timer.
+
+    The in-process test cache stands in for Redis or Memcached.
+    """
+    settings.USAGE_COUNTERS_FLUSH_SECONDS = 10
+    monkeypatch.setattr(UsageCounters, "buffering", staticmethod(lambda: True))
+    monkeypatch.setattr(UsageCounters, "_schedule_flush", staticmethod(lambda: None))
+
+
+@pytest.mark.django_db
+class TestUsageCounters:
+    """Tests for the buffered usage counters."""
+
+    def test_write_through_without_lag(self, user):
+        UsageCounters.increment(user.id, "wheel_spins")
+        UsageCounters.increment(user.id, "wheel_spins", 2)
+
+        assert UserStats.objects.get(user=user).wheel_spins == 3
+
+    def test_write_through_without_atomic_shared_cache(self, user, settings):
+        settings.USAGE_COUNTERS_FLUSH_SECONDS = 10
+        assert not UsageCounters.buffering()
+
+        UsageCounters.increment(user.id, "divider_uses")
+
+        assert UserStats.objects.get(user=user).divider_uses == 1
+        assert UsageCounters.pending(user.id)["divider_uses"] == 0
+
+    def test_write_through_is_one_update_once_the_row_exists(self, user):
+        UsageCounters.increment(user.id, "wheel_spins")
+
+        with CaptureQueriesContext(connection) as queries:
+            UsageCounters.increment(user.id, "wheel_spins")
+
+        assert [q["sql"].split()[0] for q in queries.captured_queries] == ["UPDATE"]
+        assert UserStats.objects.get(user=user).wheel_spins == 2
+
+    def test_read_skips_pending_without_buffering(self, user, monkeypatch):
+        monkeypatch.setattr(UsageCounters, "pending", staticmethod(lambda user_id: pytest.fail("pending() read")))
+        UsageCounters.increment(user.id, "calculator_uses")
+
+        assert UsageCounters.read(user).calculator_uses == 1
+
+    def test_unknown_field_rejected(self, user):
+        with pytest.raises(ValueError):
+            UsageCounters.increment(user.id, "username")
+
+    def test_non_positive_amount_ignored(self, user):
+        UsageCounters.increment(user.id, "stopwatch_total_ms", 0)
+
+        assert not UserStats.objects.filter(user=user).exists()
+
+    def test_buffered_until_flush(self, user, buffered):
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(5):
+                UsageCounters.increment(user.id, "divider_uses")
+            UsageCounters.increment(user.id, "countdown_total_ms", 1500)
+
+        assert len(queries) == 0
+        assert not UserStats.objects.filter(user=user).exists()
+
+        assert UsageCounters.flush() == 1
+
+        stats = UserStats.objects.get(user=user)
+        assert stats.divider_uses == 5
+        assert stats.countdown_total_ms == 1500
+        assert not any(UsageCounters.pending(user.id).values())
+
+    def test_read_merges_pending(self, user, buffered):
+        UserStats.objects.create(user=user, calculator_uses=4)
+        UsageCounters.increment(user.id, "calculator_uses", 3)
+
+        assert UsageCounters.read(user).calculator_uses == 7
+        assert UserStats.objects.get(user=user).calculator_uses == 4
+
+    def test_read_never_creates_row(self, user):
+        stats = UsageCounters.read(user)
+
+        assert stats.wheel_spins == 0
+        assert not UserStats.objects.filter(user=user).exists()
+
+    def test_flush_one_update_per_user(self, user, other_user, buffered):
+        UserStats.objects.create(user=user, wheel_spins=1)
+        UserStats.objects.create(user=other_user)
+        for field in ("wheel_spins", "divider_uses", "stopwatch_starts"):
+            UsageCounters.increment(user.id, field)
+            UsageCounters.increment(other_user.id, field)
+
+        with CaptureQueriesContext(connection) as queries:
+            assert UsageCounters.flush() == 2
+
+        updates = [q["sql"] for q in queries if q["sql"].startswith("UPDATE")]
+        assert len(updates) == 2
+        assert not any(q["sql"].startswith("INSERT") for q in queries)
+        assert UserStats.objects.get(user=user).wheel_spins == 2
+        assert UserStats.objects.get(user=other_user).stopwatch_starts == 1
+
+    def test_flush_creates_missing_rows(self, user, buffered):
+        UsageCounters.increment(user.id, "divider_uses", 3)
+
+        assert UsageCounters.flush() == 1
+        assert UserStats.objects.get(user=user).divider_uses == 3
+
+    def test_increment_during_flush_is_kept(self, user, buffered, monkeypatch):
+        UsageCounters.increment(user.id, "wheel_spins", 2)
+        apply = UsageCounters._apply
+
+        def racing_apply(deltas_by_user):
+            apply(deltas_by_user)
+            UsageCounters.increment(user.id, "wheel_spins")
+
+        monkeypatch.setattr(UsageCounters, "_apply", staticmethod(racing_apply))
+        UsageCounters.flush()
+        monkeypatch.setattr(UsageCounters, "_apply", staticmethod(apply))
+
+        assert UserStats.objects.get(user=user).wheel_spins == 2
+        assert UsageCounters.pending(user.id)["wheel_spins"] == 1
+
+        UsageCounters.flush()
+        assert UserStats.objects.get(user=user).wheel_spins == 3
+
+    def test_empty_flush(self, db, buffered):
+        assert UsageCounters.flush() == 0
+
+    def test_command_flushes(self, user, buffered):
+        UsageCounters.increment(user.id, "stopwatch_flags", 2)
+        out = StringIO()
+
+        call_command("flush_usage_counters", stdout=out)
+
+        assert "Flushed usage counters of 1 users." in out.getvalue()
+        assert UserStats.objects.get(user=user).stopwatch_flags == 2
@@ -1 +1,9 @@
+from django.contrib import admin
+
+from .models import MemberPickDay, MemberWheelStats, WheelSpin
+
 # Register your models here.
+
+admin.site.register(MemberWheelStats)
+admin.site.register(WheelSpin)
+admin.site.register(MemberPickDay)
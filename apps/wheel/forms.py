@@ -1,5 +1,29 @@
 from django import forms
 
+from .services.weighted import WEIGHTINGS
+
 
 class NameWheelForm(forms.Form):
     chosen_members_amount = forms.IntegerField(label="Members chosen", min_value=1, initial=1)
+    weighting = forms.ChoiceField(
+        label="Chances",
+        choices=[("", "Equal chances"), *WEIGHTINGS.items()],
+        required=False,
+    )
+
+
+class WheelWeightsForm(forms.Form):
+    """One non-negative weight per member; 0 keeps a member off weighted spins."""
+
+    def __init__(self, *args, members=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.members = list(members)
+        for member in self.members:
+            stats = getattr(member, "wheel_stats", None)
+            self.fields[f"weight_{member.id}"] = forms.IntegerField(
+                label=member.name, min_value=0, max_value=100, initial=stats.weight if stats else 1
+            )
+
+    def weights(self):
+        """Return the cleaned weights keyed by member ID."""
+        return {member.id: self.cleaned_data[f"weight_{member.id}"] for member in self.members}
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.group_maker.models import GroupCreationModel
+from apps.wheel.services.picks import rebuild_pick_counts
+
+
+class Command(BaseCommand):
+    help = "Rebuild per-member wheel pick counts and daily pick counts from the spin log."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--group", type=int, help="Only rebuild counts of this group ID.")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Spin log rows fetched per round trip.")
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be at least 1.")
+
+        group = None
+        if options["group"] is not None:
+            group = GroupCreationModel.objects.filter(id=options["group"]).first()
+            if group is None:
+                raise CommandError(f"Group {options['group']} does not exist.")
+
+        replayed = rebuild_pick_counts(group=group, chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt wheel pick counts from {replayed} spins."))
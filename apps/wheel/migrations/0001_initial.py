@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-17 02:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('core', '0002_member_color'),
+        ('group_maker', '0005_alter_groupcreationmodel_title'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemberWheelStats',
+            fields=[
+                ('member', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='wheel_stats', serialize=False, to='core.member')),
+                ('weight', models.PositiveIntegerField(default=1)),
+                ('pick_count', models.PositiveIntegerField(default=0)),
+                ('last_picked_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='group_maker.groupcreationmodel')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['group', 'last_picked_at'], name='wheelstats_group_last_picked')],
+            },
+        ),
+    ]
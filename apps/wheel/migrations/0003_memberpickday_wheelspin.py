@@ -0,0 +1,46 @@
+# Generated by Django 5.2.1 on 2026-10-17 02:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_member_color'),
+        ('group_maker', '0005_alter_groupcreationmodel_title'),
+        ('wheel', '0002_wheelstate'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemberPickDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='group_maker.groupcreationmodel')),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.member')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['group', 'day'], name='pickday_group_day')],
+                'constraints': [models.UniqueConstraint(fields=('member', 'day'), name='unique_pick_day_per_member')],
+            },
+        ),
+        migrations.CreateModel(
+            name='WheelSpin',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('member_ids', models.JSONField(default=list)),
+                ('mode', models.CharField(choices=[('uniform', 'Equal chances'), ('karma', 'Karma'), ('recency', 'Time since last picked'), ('manual', 'Manual weights')], default='uniform', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='group_maker.groupcreationmodel')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['group', 'created_at'], name='wheelspin_group_time')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-17 04:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wheel', '0003_memberpickday_wheelspin'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='memberwheelstats',
+            name='weights_updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
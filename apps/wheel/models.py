@@ -1 +1,99 @@
-# Create your models here.
+from django.conf import settings
+from django.db import models
+
+from apps.core.models import Member
+from apps.group_maker.models import GroupCreationModel
+
+
+class MemberWheelStats(models.Model):
+    """
+    Per-member wheel state: the manual weight and a summary of past picks.
+
+    Rows are created lazily, on the first pick or weight change; a missing row
+    means weight 1 and never picked.
+    """
+
+    member = models.OneToOneField(Member, on_delete=models.CASCADE, primary_key=True, related_name="wheel_stats")
+    group = models.ForeignKey(GroupCreationModel, on_delete=models.CASCADE, related_name="+")
+    weight = models.PositiveIntegerField(default=1)
+    pick_count = models.PositiveIntegerField(default=0)
+    last_picked_at = models.DateTimeField(null=True, blank=True)
+    # Changed by set_weights only, so picks never invalidate cached manual alias tables
+    weights_updated_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["group", "last_picked_at"], name="wheelstats_group_last_picked")]
+
+    def __str__(self):
+        return f"{self.member_id}_w{self.weight}_{self.pick_count}"
+
+
+class WheelState(models.Model):
+    """
+    Database copy of one user's wheel state for one group.
+
+    The cache holds the live copy; this row lets the state survive a cache
+    flush. Already chosen members are a bitset over member positions in ID
+    order, stored as hex, and only valid for the roster fingerprint beside it.
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+    group = models.ForeignKey(GroupCreationModel, on_delete=models.CASCADE, related_name="+")
+    roster = models.CharField(max_length=32, blank=True, default="")
+    chosen_bits = models.TextField(blank=True, default="")
+    result = models.JSONField(null=True, blank=True)
+    message = models.CharField(max_length=255, blank=True, default="")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["user", "group"], name="unique_wheel_state_per_user_and_group")]
+
+    def __str__(self):
+        return f"{self.user_id}_{self.group_id}_{self.chosen_bits or '0'}"
+
+
+class WheelSpin(models.Model):
+    """
+    Append-only log entry for one spin: who was picked, from which group, and how.
+
+    MemberWheelStats and MemberPickDay are pre-aggregated from these rows;
+    rebuild_pick_counts recomputes them from the log.
+    """
+
+    MODES = [
+        ("uniform", "Equal chances"),
+        ("karma", "Karma"),
+        ("recency", "Time since last picked"),
+        ("manual", "Manual weights"),
+    ]
+
+    group = models.ForeignKey(GroupCreationModel, on_delete=models.CASCADE, related_name="+")
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    member_ids = models.JSONField(default=list)
+    mode = models.CharField(max_length=10, choices=MODES, default="uniform")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["group", "created_at"], name="wheelspin_group_time")]
+
+    def __str__(self):
+        return f"{self.group_id}_{self.mode}_{self.member_ids}"
+
+
+class MemberPickDay(models.Model):
+    """Number of times a member was picked on one day, for pick-frequency charts."""
+
+    member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name="+")
+    group = models.ForeignKey(GroupCreationModel, on_delete=models.CASCADE, related_name="+")
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["member", "day"], name="unique_pick_day_per_member")]
+        indexes = [models.Index(fields=["group", "day"], name="pickday_group_day")]
+
+    def __str__(self):
+        return f"{self.member_id}_{self.day}_{self.count}"
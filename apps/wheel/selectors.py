@@ -0,0 +1,61 @@
+"""
+Selectors for wheel app.
+
+Fairness queries over the pre-aggregated pick tables; each one is an
+indexed lookup on (group, last_picked_at) or (group, day), never a scan of
+the WheelSpin log.
+"""
+
+from django.db.models import F, Q, QuerySet, Sum
+
+from apps.core.models import Member
+
+from .models import MemberPickDay
+
+
+def members_not_picked_since(group, since) -> QuerySet[Member]:
+    """
+    Get the members of a group not picked since a given time, longest waiting first.
+
+    Members never picked come first. Each member carries last_picked_at.
+    """
+    return (
+        Member.objects.filter(group=group)
+        .filter(
+            Q(wheel_stats__isnull=True)
+            | Q(wheel_stats__last_picked_at__isnull=True)
+            | Q(wheel_stats__last_picked_at__lt=since)
+        )
+        .annotate(last_picked_at=F("wheel_stats__last_picked_at"))
+        .order_by(F("last_picked_at").asc(nulls_first=True), "id")
+    )
+
+
+def pick_frequency(group, since=None) -> list[dict]:
+    """
+    Count the picks of every member of a group, optionally from a given day on.
+
+    Returns:
+        List of {'id', 'name', 'picks'} dicts in member ID order, including members with no picks
+    """
+    days = MemberPickDay.objects.filter(group=group)
+    if since is not None:
+        days = days.filter(day__gte=since)
+    picks = dict(days.values("member_id").annotate(picks=Sum("count")).values_list("member_id", "picks"))
+    return [
+        {"id": member_id, "name": name, "picks": picks.get(member_id, 0)}
+        for member_id, name in Member.objects.filter(group=group).order_by("id").values_list("id", "name")
+    ]
+
+
+def daily_picks(group, since=None) -> list[dict]:
+    """
+    Count the picks of a group per day, optionally from a given day on.
+
+    Returns:
+        List of {'day', 'picks'} dicts in day order; days without picks are left out
+    """
+    days = MemberPickDay.objects.filter(group=group)
+    if since is not None:
+        days = days.filter(day__gte=since)
+    return list(days.values("day").annotate(picks=Sum("count")).order_by("day"))
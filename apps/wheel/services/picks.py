@@ -0,0 +1,179 @@
+"""
+Pick bookkeeping for wheel app.
+
+Appends spins to the WheelSpin log and keeps the pre-aggregated pick tables
+(MemberWheelStats totals, MemberPickDay daily counts) in step with it, using
+set-based writes so recording costs the same few queries however many
+members were picked.
+"""
+
+import logging
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.core.models import Member
+
+from ..models import MemberPickDay, MemberWheelStats, WheelSpin
+
+logger = logging.getLogger(__name__)
+
+
+def _add_picks(picks: Counter, when) -> None:
+    """
+    Add pick counts to the aggregate tables.
+
+    Args:
+        picks: Counter of (group_id, member_id) -> number of picks
+        when: Time of the picks; also their day bucket
+    """
+    day = timezone.localdate(when)
+    MemberWheelStats.objects.bulk_create(
+        [MemberWheelStats(member_id=member_id, group_id=group_id) for group_id, member_id in picks],
+        ignore_conflicts=True,
+    )
+    MemberPickDay.objects.bulk_create(
+        [MemberPickDay(member_id=member_id, group_id=group_id, day=day) for group_id, member_id in picks],
+        ignore_conflicts=True,
+    )
+
+    # One UPDATE per distinct increment; a single spin only ever has increment 1
+    by_increment: dict[int, list[int]] = defaultdict(list)
+    for (_, member_id), count in picks.items():
+        by_increment[count].append(member_id)
+    for count, member_ids in by_increment.items():
+        MemberWheelStats.objects.filter(member_id__in=member_ids).update(
+            pick_count=F("pick_count") + count, last_picked_at=when, updated_at=when
+        )
+        MemberPickDay.objects.filter(member_id__in=member_ids, day=day).update(count=F("count") + count)
+
+
+@transaction.atomic
+def record_spins(spins: list[WheelSpin]) -> None:
+    """
+    Append spins to the log in one insert and add their picks to the aggregates.
+
+    Args:
+        spins: Unsaved WheelSpin instances
+    """
+    spins = [spin for spin in spins if spin.member_ids]
+    if not spins:
+        return
+    WheelSpin.objects.bulk_create(spins)
+    _add_picks(
+        Counter((spin.group_id, member_id) for spin in spins for member_id in spin.member_ids),
+        timezone.now(),
+    )
+
+
+def record_spin(group_id, member_ids, mode="uniform", user_id=None) -> None:
+    """
+    Record one spin.
+
+    Args:
+        group_id: ID of the group spun
+        member_ids: IDs of the members picked
+        mode: 'uniform' or one of the weightings
+        user_id: ID of the user who spun (optional)
+    """
+    record_spins([WheelSpin(group_id=group_id, user_id=user_id, member_ids=list(member_ids), mode=mode)])
+
+
+def set_weights(group_id, weights) -> None:
+    """
+    Store manual wheel weights.
+
+    Args:
+        group_id: ID of the group the members belong to
+        weights: Mapping of member ID to a non-negative weight
+    """
+    if not weights:
+        return
+    now = timezone.now()
+    MemberWheelStats.objects.bulk_create(
+        [
+            MemberWheelStats(
+                member_id=member_id, group_id=group_id, weight=weight, weights_updated_at=now, updated_at=now
+            )
+            for member_id, weight in weights.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["member"],
+        update_fields=["weight", "weights_updated_at", "updated_at"],
+    )
+
+
+@transaction.atomic
+def rebuild_pick_counts(group=None, chunk_size: int = 2000) -> int:
+    """
+    Recompute MemberWheelStats pick totals and MemberPickDay counts from the spin log.
+
+    Manual weights are kept. Picks of members that no longer exist are skipped.
+
+    Args:
+        group: Restrict the rebuild to one GroupCreationModel (optional)
+        chunk_size: Log rows fetched per database round trip
+
+    Returns:
+        Number of spins replayed
+    """
+    spins = WheelSpin.objects.order_by("id")
+    stats = MemberWheelStats.objects.all()
+    days = MemberPickDay.objects.all()
+    members = Member.objects.all()
+    if group is not None:
+        spins, stats, days, members = (
+            spins.filter(group=group),
+            stats.filter(group=group),
+            days.filter(group=group),
+            members.filter(group=group),
+        )
+
+    totals: Counter = Counter()
+    last_picked: dict = {}
+    daily: Counter = Counter()
+    replayed = 0
+    for group_id, member_ids, created_at in spins.values_list("group_id", "member_ids", "created_at").iterator(
+        chunk_size=chunk_size
+    ):
+        replayed += 1
+        day = timezone.localdate(created_at)
+        for member_id in member_ids:
+            totals[(group_id, member_id)] += 1
+            last_picked[member_id] = created_at
+            daily[(group_id, member_id, day)] += 1
+
+    existing = set(members.values_list("id", flat=True))
+    now = timezone.now()
+    days.delete()
+    stats.update(pick_count=0, last_picked_at=None, updated_at=now)
+    MemberWheelStats.objects.bulk_create(
+        [
+            MemberWheelStats(
+                member_id=member_id,
+                group_id=group_id,
+                pick_count=count,
+                last_picked_at=last_picked[member_id],
+                updated_at=now,
+            )
+            for (group_id, member_id), count in totals.items()
+            if member_id in existing
+        ],
+        update_conflicts=True,
+        unique_fields=["member"],
+        update_fields=["pick_count", "last_picked_at", "updated_at"],
+        batch_size=chunk_size,
+    )
+    MemberPickDay.objects.bulk_create(
+        [
+            MemberPickDay(member_id=member_id, group_id=group_id, day=day, count=count)
+            for (group_id, member_id, day), count in daily.items()
+            if member_id in existing
+        ],
+        batch_size=chunk_size,
+    )
+
+    logger.info(f"Rebuilt wheel pick counts from {replayed} spins")
+    return replayed
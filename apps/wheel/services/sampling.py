@@ -0,0 +1,37 @@
+"""
+Member sampling for wheel app.
+
+Draws several members without replacement from one read of the eligible IDs
+and one in_bulk fetch of the winners, however many picks a spin asks for.
+"""
+
+import random
+
+
+def sample_members(members_queryset, already_chosen_ids, k, rng=None, member_ids=None):
+    """
+    Choose up to k distinct members from those not yet chosen.
+
+    Args:
+        members_queryset: QuerySet of Member objects
+        already_chosen_ids: List of already chosen member IDs (left unchanged)
+        k: Number of members to pick
+        rng: random.Random instance to draw with (optional, for seeding)
+        member_ids: The queryset's member IDs in ID order, if already loaded
+
+    Returns:
+        Tuple of (chosen members in draw order, already_chosen_ids plus the new picks)
+    """
+    excluded = set(already_chosen_ids)
+    if member_ids is None:
+        # Ordered so that a seeded rng always draws the same members
+        member_ids = members_queryset.order_by("id").values_list("id", flat=True)
+    eligible = [member_id for member_id in member_ids if member_id not in excluded]
+
+    sample = rng.sample if rng is not None else random.sample
+    picked = sample(eligible, min(max(k, 0), len(eligible)))
+    if not picked:
+        return [], list(already_chosen_ids)
+
+    members_by_id = members_queryset.in_bulk(picked)
+    return [members_by_id[member_id] for member_id in picked], list(already_chosen_ids) + picked
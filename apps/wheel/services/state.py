@@ -0,0 +1,164 @@
+"""
+Wheel state for wheel app.
+
+Per (user, group) state of the wheel: which members were already chosen,
+plus the last spin result and notice for non-AJAX redirects. The WheelState
+row is the store of record, so spins never touch the session and a cache
+flush loses nothing.
+
+With the database cache a cached copy would only add a write per spin, so
+the row is read and written directly. Other backends (Redis, Memcached)
+keep a live copy in the cache in front of the row, shared by all workers
+(see CACHES). Cached entries carry
+the per-user generation they were written under, and a read fetches the
+entry and the current generation in one round trip, so a reset handled by
+any worker drops the user's entries for every worker.
+
+Already chosen members are a bitset over member positions (ID order),
+tagged with a fingerprint of the roster it was built for; if members were
+added or removed since, the bitset no longer lines up and reads as empty.
+"""
+
+import time
+import zlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+from ..models import WheelState
+
+# Backends that are no cheaper than the WheelState table itself
+UNCACHED_BACKENDS = ("django.core.cache.backends.db.DatabaseCache",)
+
+
+def _use_cache() -> bool:
+    """Return whether states are kept in the cache in front of their WheelState rows."""
+    return settings.CACHES.get("default", {}).get("BACKEND", "") not in UNCACHED_BACKENDS
+
+
+def _empty_state() -> dict:
+    return {"roster": "", "bits": 0, "result": None, "message": ""}
+
+
+def roster_fingerprint(member_ids) -> str:
+    """Fingerprint of an ordered list of member IDs."""
+    member_ids = list(member_ids)
+    return f"{len(member_ids)}:{zlib.crc32(','.join(map(str, member_ids)).encode()):08x}"
+
+
+def _generation_key(user_id) -> str:
+    return f"wheel:state_generation:{user_id}"
+
+
+def _state_key(user_id, group_id) -> str:
+    return f"wheel:state:{user_id}:{group_id}"
+
+
+def _generation(user_id, generation=None) -> int:
+    """Per-user generation; bumping it drops every cached state of the user at once."""
+    if generation is None:
+        generation = cache.get(_generation_key(user_id))
+    if generation is None:
+        # A clock-based start never reuses the generation of an evicted counter
+        cache.add(_generation_key(user_id), time.time_ns(), None)
+        generation = cache.get(_generation_key(user_id), 0)
+    return int(generation)
+
+
+def _timeout() -> int:
+    return getattr(settings, "WHEEL_STATE_CACHE_TIMEOUT", 60 * 60 * 24)
+
+
+def load_state(user_id, group_id) -> dict:
+    """
+    Return the wheel state of a user for a group.
+
+    Reads the cache first (when used) and falls back to the WheelState row.
+
+    Returns:
+        Dict with 'roster', 'bits', 'result' and 'message'
+    """
+    if not _use_cache():
+        return _load_row(user_id, group_id)
+
+    key = _state_key(user_id, group_id)
+    cached = cache.get_many([_generation_key(user_id), key])
+    generation = _generation(user_id, cached.get(_generation_key(user_id)))
+    entry = cached.get(key)
+    state: dict | None = entry["state"] if entry and entry["generation"] == generation else None
+    if state is None:
+        state = _load_row(user_id, group_id)
+        cache.set(key, {"generation": generation, "state": state}, _timeout())
+    return state
+
+
+def _load_row(user_id, group_id) -> dict:
+    """Read a state from its WheelState row, or an empty state without one."""
+    row = (
+        WheelState.objects.filter(user_id=user_id, group_id=group_id)
+        .values("roster", "chosen_bits", "result", "message")
+        .first()
+    )
+    state = _empty_state()
+    if row:
+        state.update(
+            roster=row["roster"],
+            bits=int(row["chosen_bits"] or "0", 16),
+            result=row["result"],
+            message=row["message"],
+        )
+    return state
+
+
+def save_state(user_id, group_id, state) -> None:
+    """Store the wheel state of a user for a group in the database (and the cache, when used)."""
+    if _use_cache():
+        cache.set(_state_key(user_id, group_id), {"generation": _generation(user_id), "state": state}, _timeout())
+    WheelState.objects.bulk_create(
+        [
+            WheelState(
+                user_id=user_id,
+                group_id=group_id,
+                roster=state["roster"],
+                chosen_bits=format(state["bits"], "x"),
+                result=state["result"],
+                message=state["message"],
+            )
+        ],
+        update_conflicts=True,
+        unique_fields=["user", "group"],
+        update_fields=["roster", "chosen_bits", "result", "message", "updated_at"],
+    )
+
+
+def clear_state(user_id, group_id) -> None:
+    """Forget the wheel state of a user for one group."""
+    if _use_cache():
+        cache.delete(_state_key(user_id, group_id))
+    WheelState.objects.filter(user_id=user_id, group_id=group_id).delete()
+
+
+def reset_states(user_id) -> None:
+    """Forget the wheel state of a user for every group: one DELETE and one cache write."""
+    WheelState.objects.filter(user_id=user_id).delete()
+    if _use_cache():
+        cache.set(_generation_key(user_id), time.time_ns(), None)
+
+
+def chosen_ids(state, member_ids) -> list[int]:
+    """Decode the already chosen member IDs, given the group's member IDs in ID order."""
+    if not state["bits"] or state["roster"] != roster_fingerprint(member_ids):
+        return []
+    bits = state["bits"]
+    return [member_id for position, member_id in enumerate(member_ids) if bits >> position & 1]
+
+
+def with_chosen(state, member_ids, chosen) -> dict:
+    """Return a copy of state with the given member IDs marked as chosen."""
+    fingerprint = roster_fingerprint(member_ids)
+    bits = state["bits"] if state["roster"] == fingerprint else 0
+    positions = {member_id: position for position, member_id in enumerate(member_ids)}
+    for member_id in chosen:
+        if member_id in positions:
+            bits |= 1 << positions[member_id]
+    return {**state, "roster": fingerprint, "bits": bits}
@@ -1,23 +1,23 @@
-import random
+from .sampling import sample_members
 
 
-def choose_random_member(members_queryset, already_chosen_ids):
+def choose_random_member(members_queryset, already_chosen_ids, rng=None):
     """
     Choose a random member from those not yet chosen.
 
     Args:
         members_queryset: QuerySet of Member objects
         already_chosen_ids: List of already chosen member IDs
+        rng: random.Random instance to draw with (optional, for seeding)
 
     Returns:
         Tuple of (chosen_member or None, updated already_chosen_ids list)
     """
-    remaining = members_queryset.exclude(id__in=already_chosen_ids)
+    chosen, _ = sample_members(members_queryset, already_chosen_ids, 1, rng=rng)
 
-    if not remaining.exists():
+    if not chosen:
         return None, already_chosen_ids
 
-    chosen = random.choice(list(remaining))
-    already_chosen_ids.append(chosen.id)
+    already_chosen_ids.append(chosen[0].id)
 
-    return chosen, already_chosen_ids
+    return chosen[0], already_chosen_ids
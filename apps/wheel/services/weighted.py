@@ -0,0 +1,184 @@
+"""
+Weighted spins for wheel app.
+
+Members are drawn with probability proportional to a weight taken from their
+karma, the time since they were last picked, or a manual setting. Draws use a
+Walker alias table: O(n) to build, O(1) per pick. Tables are cached per
+(group, weighting, version), so repeated spins reuse them until something
+that feeds the weights changes.
+"""
+
+import random
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.core.models import Member
+from apps.point_system.services import TableCache
+
+from ..models import MemberWheelStats
+
+WEIGHTINGS = {
+    "karma": "Karma (net points)",
+    "recency": "Time since last picked",
+    "manual": "Manual weights",
+}
+
+
+def build_alias_table(weights) -> tuple[list[float], list[int]]:
+    """
+    Build a Walker alias table (Vose's method) for non-negative weights.
+
+    Args:
+        weights: Sequence of weights with a positive sum
+
+    Returns:
+        Tuple of (acceptance probabilities, alias indices)
+    """
+    n = len(weights)
+    total = float(sum(weights))
+    scaled = [weight * n / total for weight in weights]
+    prob = [1.0] * n
+    alias = list(range(n))
+
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        less, more = small.pop(), large.pop()
+        prob[less] = scaled[less]
+        alias[less] = more
+        scaled[more] -= 1.0 - scaled[less]
+        (small if scaled[more] < 1.0 else large).append(more)
+    # Whatever is left is 1.0 up to rounding error
+    for i in small + large:
+        prob[i] = 1.0
+    return prob, alias
+
+
+def alias_draw(prob, alias, rng) -> int:
+    """Draw one index from an alias table."""
+    i = int(rng.random() * len(prob))
+    return i if rng.random() < prob[i] else alias[i]
+
+
+def member_weights(group_id, weighting, now=None) -> tuple[list[int], list[float]]:
+    """
+    Compute the wheel weight of every member of a group.
+
+    karma: net points shifted so the lowest member still has weight 1.
+    recency: 1 + days since last picked; members never picked weigh one
+        more than the longest-waiting picked member.
+    manual: the stored weight (1 by default, 0 keeps a member off the wheel).
+
+    Returns:
+        Tuple of (member IDs, weights), in member ID order
+    """
+    members = Member.objects.filter(group_id=group_id).order_by("id")
+
+    if weighting == "karma":
+        totals = list(members.values_list("id", "positive_total", "negative_total"))
+        nets = [positive - negative for _, positive, negative in totals]
+        lowest = min(nets, default=0)
+        return [row[0] for row in totals], [float(net - lowest + 1) for net in nets]
+
+    rows = list(members.values_list("id", "wheel_stats__weight", "wheel_stats__last_picked_at"))
+    ids = [row[0] for row in rows]
+    if weighting == "manual":
+        return ids, [float(1 if weight is None else weight) for _, weight, _ in rows]
+
+    now = now or timezone.now()
+    waits = [None if picked is None else (now - picked).total_seconds() / 86400 for _, _, picked in rows]
+    never_picked = max((wait for wait in waits if wait is not None), default=0.0) + 1
+    return ids, [1 + (never_picked if wait is None else wait) for wait in waits]
+
+
+# Column whose latest value changes whenever the weights of a weighting may have changed
+VERSION_STAMPS = {"recency": "last_picked_at", "manual": "weights_updated_at"}
+
+
+def _table_version(group_id, weighting) -> str:
+    """
+    Version token that changes whenever the weights of a group may have changed.
+
+    Roster and point changes bump the group's table version. Recency tables
+    also follow the latest pick; manual tables follow the latest weight
+    change only, so spinning never rebuilds them.
+    """
+    version = str(TableCache.version(group_id))
+    if weighting in VERSION_STAMPS:
+        stamp = MemberWheelStats.objects.filter(group_id=group_id).aggregate(stamp=Max(VERSION_STAMPS[weighting]))[
+            "stamp"
+        ]
+        version += f":{stamp.timestamp() if stamp else 0}"
+    return version
+
+
+def get_alias_table(group_id, weighting) -> dict:
+    """
+    Return the cached alias table of a group, building it on a miss.
+
+    Returns:
+        Dict with 'ids', 'weights', 'prob' and 'alias' lists
+    """
+    key = f"wheel:alias:{group_id}:{weighting}:{_table_version(group_id, weighting)}"
+    table: dict | None = cache.get(key)
+    if table is None:
+        ids, weights = member_weights(group_id, weighting)
+        if not any(weights):
+            weights = [1.0] * len(ids)
+        prob, alias = build_alias_table(weights) if ids else ([], [])
+        table = {"ids": ids, "weights": weights, "prob": prob, "alias": alias}
+        cache.set(key, table, getattr(settings, "WHEEL_ALIAS_CACHE_TIMEOUT", 60 * 60))
+    return table
+
+
+def weighted_sample_members(members_queryset, group_id, already_chosen_ids, k, weighting, rng=None):
+    """
+    Choose up to k distinct members, each draw weighted by the chosen weighting.
+
+    Already chosen members are rejected and redrawn. If rejections pile up
+    (most of the weight is already chosen), the rest is drawn from a fresh
+    table over the remaining members.
+
+    Args:
+        members_queryset: QuerySet of the group's Member objects
+        group_id: ID of the group
+        already_chosen_ids: List of already chosen member IDs (left unchanged)
+        k: Number of members to pick
+        weighting: One of WEIGHTINGS
+        rng: random.Random instance to draw with (optional, for seeding)
+
+    Returns:
+        Tuple of (chosen members in draw order, already_chosen_ids plus the new picks)
+    """
+    rng = rng or random.Random()
+    table = get_alias_table(group_id, weighting)
+    ids, weights = table["ids"], table["weights"]
+
+    excluded = set(already_chosen_ids)
+    available = sum(1 for member_id, weight in zip(ids, weights, strict=True) if weight and member_id not in excluded)
+    target = min(max(k, 0), available)
+
+    picked: list[int] = []
+    attempts = 0
+    while len(picked) < target and attempts < 32 * target + len(ids):
+        attempts += 1
+        member_id = ids[alias_draw(table["prob"], table["alias"], rng)]
+        if member_id not in excluded:
+            picked.append(member_id)
+            excluded.add(member_id)
+
+    while len(picked) < target:
+        remaining = [(i, w) for i, w in zip(ids, weights, strict=True) if w and i not in excluded]
+        prob, alias = build_alias_table([w for _, w in remaining])
+        member_id = remaining[alias_draw(prob, alias, rng)][0]
+        picked.append(member_id)
+        excluded.add(member_id)
+
+    if not picked:
+        return [], list(already_chosen_ids)
+
+    members_by_id = members_queryset.in_bulk(picked)
+    return [members_by_id[member_id] for member_id in picked], list(already_chosen_ids) + picked
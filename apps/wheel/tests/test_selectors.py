@@ -0,0 +1,60 @@
+"""Tests for wheel app selectors."""
+
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from apps.group_maker.models import GroupCreationModel
+from apps.wheel import selectors
+from apps.wheel.models import MemberPickDay, MemberWheelStats
+from apps.wheel.services.picks import record_spin, set_weights
+
+
+@pytest.fixture
+def group(user):
+    return GroupCreationModel.objects.create(user=user, title="Class", members_string="Alice, Bob, Charlie, Dana")
+
+
+@pytest.mark.django_db
+class TestMembersNotPickedSince:
+    """Tests for members_not_picked_since selector."""
+
+    def test_lists_never_and_long_ago_picked_members(self, group):
+        alice, bob, charlie, dana = group.get_members().order_by("id")
+        now = timezone.now()
+        record_spin(group.id, [alice.id, bob.id])
+        MemberWheelStats.objects.filter(member=bob).update(last_picked_at=now - timedelta(days=20))
+        set_weights(group.id, {charlie.id: 2})
+
+        members = list(selectors.members_not_picked_since(group, now - timedelta(days=14)))
+
+        # Never picked first (with or without a stats row), then the longest waiting
+        assert members == [charlie, dana, bob]
+        assert members[2].last_picked_at == now - timedelta(days=20)
+
+
+@pytest.mark.django_db
+class TestPickFrequency:
+    """Tests for pick_frequency and daily_picks selectors."""
+
+    def test_counts_picks_per_member_and_day(self, group):
+        alice, bob, charlie, dana = group.get_members().order_by("id")
+        today = timezone.localdate()
+        record_spin(group.id, [alice.id, bob.id])
+        record_spin(group.id, [alice.id])
+        MemberPickDay.objects.create(member=charlie, group=group, day=today - timedelta(days=30), count=5)
+
+        frequency = selectors.pick_frequency(group, since=today - timedelta(days=14))
+        assert [(row["name"], row["picks"]) for row in frequency] == [
+            ("Alice", 2),
+            ("Bob", 1),
+            ("Charlie", 0),
+            ("Dana", 0),
+        ]
+        assert selectors.pick_frequency(group)[2]["picks"] == 5
+
+        assert selectors.daily_picks(group) == [
+            {"day": today - timedelta(days=30), "picks": 5},
+            {"day": today, "picks": 3},
+        ]
@@ -1,7 +1,25 @@
+import random
+from datetime import timedelta
+
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
+from apps.core.models import Member
 from apps.group_maker.models import GroupCreationModel
+from apps.wheel.models import MemberPickDay, MemberWheelStats, WheelSpin
+from apps.wheel.services import weighted
+from apps.wheel.services.picks import rebuild_pick_counts, record_spin, record_spins, set_weights
+from apps.wheel.services.sampling import sample_members
 from apps.wheel.services.utils import choose_random_member
+from apps.wheel.services.weighted import (
+    alias_draw,
+    build_alias_table,
+    get_alias_table,
+    member_weights,
+    weighted_sample_members,
+)
 
 
 @pytest.mark.django_db
@@ -173,3 +191,213 @@ class TestChooseRandomMember:
         chosen, already_chosen_ids = choose_random_member(members, already_chosen_ids)
         assert chosen is None
         assert len(already_chosen_ids) == 3
+
+
+@pytest.mark.django_db
+class TestSampleMembers:
+    """Tests for sample_members service."""
+
+    @pytest.fixture
+    def members(self, user):
+        names = ", ".join(f"Student {i}" for i in range(40))
+        group = GroupCreationModel.objects.create(user=user, title="Class", members_string=names)
+        return group.get_members()
+
+    def test_ten_picks_take_two_queries(self, members):
+        with CaptureQueriesContext(connection) as queries:
+            chosen, updated_ids = sample_members(members, [], 10)
+
+        assert len(queries) == 2
+        assert len(chosen) == 10
+        assert len({member.id for member in chosen}) == 10
+        assert updated_ids == [member.id for member in chosen]
+
+    def test_seeded_rng_is_reproducible(self, members):
+        first, _ = sample_members(members, [], 5, rng=random.Random(42))
+        second, _ = sample_members(members, [], 5, rng=random.Random(42))
+
+        assert [m.id for m in first] == [m.id for m in second]
+
+    def test_excludes_already_chosen_without_mutating(self, members):
+        already_chosen_ids = list(members.values_list("id", flat=True)[:38])
+
+        chosen, updated_ids = sample_members(members, already_chosen_ids, 5)
+
+        assert len(chosen) == 2
+        assert not {m.id for m in chosen} & set(already_chosen_ids)
+        assert len(already_chosen_ids) == 38
+        assert len(updated_ids) == 40
+
+    def test_returns_empty_when_all_chosen(self, members):
+        all_ids = list(members.values_list("id", flat=True))
+
+        with CaptureQueriesContext(connection) as queries:
+            chosen, updated_ids = sample_members(members, all_ids, 3)
+
+        assert chosen == []
+        assert updated_ids == all_ids
+        assert len(queries) == 1
+
+
+class TestAliasTable:
+    """Tests for the Walker alias table."""
+
+    def test_empirical_distribution_matches_weights(self):
+        """Chi-square goodness of fit over 200k seeded draws."""
+        weights = [1, 2, 3, 4, 0, 10]
+        prob, alias = build_alias_table(weights)
+        rng = random.Random(1234)
+        draws = 200_000
+
+        counts = [0] * len(weights)
+        for _ in range(draws):
+            counts[alias_draw(prob, alias, rng)] += 1
+
+        total = sum(weights)
+        assert counts[4] == 0
+        chi_square = sum(
+            (count - draws * weight / total) ** 2 / (draws * weight / total)
+            for count, weight in zip(counts, weights, strict=True)
+            if weight
+        )
+        # Critical value for 4 degrees of freedom at p = 0.001
+        assert chi_square < 18.47
+
+    def test_uniform_weights_give_full_acceptance(self):
+        prob, alias = build_alias_table([2, 2, 2])
+        assert prob == [1.0, 1.0, 1.0]
+        assert alias == [0, 1, 2]
+
+
+@pytest.mark.django_db
+class TestWeightedSampleMembers:
+    """Tests for weighted spins."""
+
+    @pytest.fixture
+    def group(self, user):
+        return GroupCreationModel.objects.create(user=user, title="Class", members_string="Alice, Bob, Charlie")
+
+    def test_karma_weights_shift_lowest_to_one(self, group):
+        alice, bob, charlie = group.get_members().order_by("id")
+        Member.objects.filter(id=alice.id).update(positive_total=5, negative_total=1)
+        Member.objects.filter(id=bob.id).update(negative_total=2)
+
+        ids, weights = member_weights(group.id, "karma")
+
+        assert ids == [alice.id, bob.id, charlie.id]
+        assert weights == [7.0, 1.0, 3.0]
+
+    def test_recency_favours_never_picked(self, group):
+        alice, bob, charlie = group.get_members().order_by("id")
+        now = timezone.now()
+        record_spin(group.id, [alice.id])
+        MemberWheelStats.objects.filter(member=alice).update(last_picked_at=now - timedelta(days=3))
+        record_spin(group.id, [bob.id])
+
+        _, weights = member_weights(group.id, "recency", now=now)
+
+        assert weights[0] == pytest.approx(4.0)
+        assert weights[1] == pytest.approx(1.0, abs=0.01)
+        assert weights[2] == pytest.approx(5.0)
+
+    def test_manual_zero_weight_is_never_drawn(self, group):
+        alice, bob, charlie = group.get_members().order_by("id")
+        set_weights(group.id, {alice.id: 0, bob.id: 1, charlie.id: 1})
+
+        for seed in range(30):
+            chosen, _ = weighted_sample_members(group.get_members(), group.id, [], 2, "manual", rng=random.Random(seed))
+            assert alice not in chosen
+            assert len(chosen) == 2
+
+    def test_respects_already_chosen(self, group):
+        alice, bob, charlie = group.get_members().order_by("id")
+
+        chosen, updated_ids = weighted_sample_members(group.get_members(), group.id, [alice.id, bob.id], 3, "karma")
+
+        assert chosen == [charlie]
+        assert updated_ids == [alice.id, bob.id, charlie.id]
+
+    def test_table_is_cached_until_weights_change(self, group, monkeypatch):
+        alice = group.get_members().order_by("id").first()
+        get_alias_table(group.id, "manual")
+
+        def rebuild(*args, **kwargs):
+            raise AssertionError("alias table was rebuilt")
+
+        monkeypatch.setattr(weighted, "member_weights", rebuild)
+        weighted_sample_members(group.get_members(), group.id, [], 1, "manual")
+        monkeypatch.undo()
+
+        set_weights(group.id, {alice.id: 50})
+        assert get_alias_table(group.id, "manual")["weights"][0] == 50.0
+
+    def test_spins_never_rebuild_manual_table(self, group, monkeypatch):
+        alice = group.get_members().order_by("id").first()
+        set_weights(group.id, {alice.id: 3})
+        builds = []
+        original = weighted.member_weights
+
+        def counting(*args, **kwargs):
+            builds.append(args)
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(weighted, "member_weights", counting)
+        for _ in range(3):
+            chosen, _ = weighted_sample_members(group.get_members(), group.id, [], 1, "manual")
+            record_spin(group.id, [member.id for member in chosen], mode="manual")
+
+        assert len(builds) == 1
+
+    def test_record_spin_counts_and_stamps(self, group):
+        alice = group.get_members().first()
+
+        record_spin(group.id, [alice.id])
+        record_spin(group.id, [alice.id])
+
+        stats = MemberWheelStats.objects.get(member=alice)
+        assert stats.pick_count == 2
+        assert stats.last_picked_at is not None
+
+
+@pytest.mark.django_db
+class TestSpinLog:
+    """Tests for the spin log and its pre-aggregated pick tables."""
+
+    @pytest.fixture
+    def group(self, user):
+        return GroupCreationModel.objects.create(user=user, title="Class", members_string="Alice, Bob, Charlie")
+
+    def test_record_spins_writes_log_in_one_insert(self, group, user):
+        alice, bob, _ = group.get_members().order_by("id")
+        spins = [
+            WheelSpin(group=group, user=user, member_ids=[alice.id, bob.id], mode="karma"),
+            WheelSpin(group=group, user=user, member_ids=[alice.id]),
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            record_spins(spins)
+
+        spin_inserts = [q for q in queries if q["sql"].startswith('INSERT INTO "wheel_wheelspin"')]
+        assert len(spin_inserts) == 1
+        assert WheelSpin.objects.count() == 2
+        assert dict(MemberWheelStats.objects.values_list("member_id", "pick_count")) == {alice.id: 2, bob.id: 1}
+        today = timezone.localdate()
+        assert dict(MemberPickDay.objects.filter(day=today).values_list("member_id", "count")) == {
+            alice.id: 2,
+            bob.id: 1,
+        }
+
+    def test_rebuild_matches_incremental_counts(self, group):
+        alice, bob, charlie = group.get_members().order_by("id")
+        set_weights(group.id, {charlie.id: 7})
+        record_spin(group.id, [alice.id, bob.id])
+        record_spin(group.id, [alice.id])
+        incremental = set(MemberWheelStats.objects.values_list("member_id", "pick_count", "weight"))
+        incremental_days = set(MemberPickDay.objects.values_list("member_id", "day", "count"))
+
+        MemberPickDay.objects.all().delete()
+        MemberWheelStats.objects.update(pick_count=99)
+        assert rebuild_pick_counts(group=group) == 2
+
+        assert set(MemberWheelStats.objects.values_list("member_id", "pick_count", "weight")) == incremental
+        assert set(MemberPickDay.objects.values_list("member_id", "day", "count")) == incremental_days
@@ -1,9 +1,29 @@
 import json
 
 import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from apps.group_maker.tests.factories import GroupCreationModelFactory
+from apps.wheel.models import MemberWheelStats, WheelSpin, WheelState
+from apps.wheel.services.state import chosen_ids, load_state, reset_states, save_state, with_chosen
+
+
+def _member_ids(group):
+    return list(group.members.order_by("id").values_list("id", flat=True))
+
+
+def mark_chosen(user, group, member_ids):
+    """Store member_ids as already chosen in the user's wheel state for group."""
+    state = with_chosen(load_state(user.id, group.id), _member_ids(group), list(member_ids))
+    save_state(user.id, group.id, state)
+
+
+def chosen_for(user, group):
+    """Return the already chosen member IDs of the user's wheel state for group."""
+    return chosen_ids(load_state(user.id, group.id), _member_ids(group))
 
 
 @pytest.mark.django_db
@@ -59,64 +79,50 @@ class TestHomeViewGet:
         response = authenticated_client.get(url + f"?group_id={other_group.id}")
         assert response.status_code == 404
 
-    def test_get_with_reset_clears_all_session_keys(self, authenticated_client, url, group):
-        """Reset clears all already_chosen_members session keys."""
-        session = authenticated_client.session
-        session[f"already_chosen_members_{group.id}"] = [1, 2]
-        session["already_chosen_members_999"] = [3]
-        session.save()
+    def test_get_with_reset_clears_all_wheel_states(self, authenticated_client, url, group, user):
+        """Reset clears the already chosen members of every group."""
+        other_group = GroupCreationModelFactory(user=user, members_string="X, Y")
+        mark_chosen(user, group, group.members.values_list("id", flat=True)[:2])
+        mark_chosen(user, other_group, other_group.members.values_list("id", flat=True)[:1])
 
         response = authenticated_client.get(url + "?reset=1")
         assert response.status_code == 200
 
-        # Refresh session
-        session = authenticated_client.session
-        assert f"already_chosen_members_{group.id}" not in session
-        assert "already_chosen_members_999" not in session
+        assert chosen_for(user, group) == []
+        assert chosen_for(user, other_group) == []
+        assert not WheelState.objects.exists()
 
-    def test_get_shows_already_chosen_members(self, authenticated_client, url, group):
+    def test_get_shows_already_chosen_members(self, authenticated_client, url, group, user):
         """Already chosen members are shown in context."""
-        member_ids = list(group.members.values_list("id", flat=True)[:2])
-
-        session = authenticated_client.session
-        session[f"already_chosen_members_{group.id}"] = member_ids
-        session.save()
+        mark_chosen(user, group, group.members.values_list("id", flat=True)[:2])
 
         response = authenticated_client.get(url + f"?group_id={group.id}")
         assert "already_chosen_members" in response.context
         assert response.context["already_chosen_members"].count() == 2
 
-    def test_get_shows_message_from_session(self, authenticated_client, url):
-        """Message stored in session is shown."""
-        session = authenticated_client.session
-        session["wheel_message"] = "Test message"
-        session.save()
+    def test_get_shows_message_from_state(self, authenticated_client, url, group, user):
+        """Message stored in the wheel state is shown once."""
+        save_state(user.id, group.id, {**load_state(user.id, group.id), "message": "Test message"})
 
-        response = authenticated_client.get(url)
+        response = authenticated_client.get(url + f"?group_id={group.id}")
         assert response.context.get("message") == "Test message"
 
         # Message should be cleared after display
-        session = authenticated_client.session
-        assert "wheel_message" not in session
+        assert load_state(user.id, group.id)["message"] == ""
 
-    def test_get_shows_spin_result_from_session(self, authenticated_client, url, group):
-        """Spin result from session is shown and cleared."""
+    def test_get_shows_spin_result_from_state(self, authenticated_client, url, group, user):
+        """Spin result from the wheel state is shown and cleared."""
         member = group.members.first()
 
-        session = authenticated_client.session
-        session[f"spin_result_{group.id}"] = {
-            "chosen_member_ids": [member.id],
-            "chosen_members_amount": 1,
-        }
-        session.save()
+        result = {"chosen_member_ids": [member.id], "chosen_members_amount": 1}
+        save_state(user.id, group.id, {**load_state(user.id, group.id), "result": result})
 
         response = authenticated_client.get(url + f"?group_id={group.id}")
         assert "chosen_members" in response.context
         assert member in response.context["chosen_members"]
 
         # Result should be cleared after display
-        session = authenticated_client.session
-        assert f"spin_result_{group.id}" not in session
+        assert load_state(user.id, group.id)["result"] is None
 
 
 @pytest.mark.django_db
@@ -147,60 +153,47 @@ class TestHomeViewPostNonAjax:
         assert response.status_code == 302
         assert f"group_id={group.id}" in response.url
 
-    def test_post_stores_spin_result_in_session(self, authenticated_client, url, group):
-        """Spin result is stored in session for redirect."""
+    def test_post_stores_spin_result_in_state(self, authenticated_client, url, group, user):
+        """Spin result is stored in the wheel state for redirect."""
         authenticated_client.post(
             url,
             {"group_id": group.id, "remove_after_spin": "on"},
         )
 
-        session = authenticated_client.session
-        spin_result_key = f"spin_result_{group.id}"
-        assert spin_result_key in session
-        assert "chosen_member_ids" in session[spin_result_key]
+        result = load_state(user.id, group.id)["result"]
+        assert "chosen_member_ids" in result
 
-    def test_post_tracks_chosen_members_in_session(self, authenticated_client, url, group):
-        """Chosen members are tracked in session when remove_after_spin is on."""
+    def test_post_tracks_chosen_members_in_state(self, authenticated_client, url, group, user):
+        """Chosen members are tracked in the wheel state when remove_after_spin is on."""
         authenticated_client.post(
             url,
             {"group_id": group.id, "remove_after_spin": "on"},
         )
 
-        session = authenticated_client.session
-        session_key = f"already_chosen_members_{group.id}"
-        assert session_key in session
-        assert len(session[session_key]) == 1
+        assert len(chosen_for(user, group)) == 1
 
-    def test_post_does_not_track_when_remove_after_spin_off(self, authenticated_client, url, group):
+    def test_post_does_not_track_when_remove_after_spin_off(self, authenticated_client, url, group, user):
         """Chosen members are NOT tracked when remove_after_spin is off."""
         authenticated_client.post(
             url,
             {"group_id": group.id},  # remove_after_spin not set
         )
 
-        session = authenticated_client.session
-        session_key = f"already_chosen_members_{group.id}"
-        # Session key should not exist or be empty
-        assert session.get(session_key, []) == []
+        assert chosen_for(user, group) == []
 
-    def test_post_chooses_multiple_members(self, authenticated_client, url, group):
+    def test_post_chooses_multiple_members(self, authenticated_client, url, group, user):
         """Multiple members can be chosen in one spin."""
         authenticated_client.post(
             url,
             {"group_id": group.id, "chosen_members_amount": 2, "remove_after_spin": "on"},
         )
 
-        session = authenticated_client.session
-        spin_result = session.get(f"spin_result_{group.id}", {})
+        spin_result = load_state(user.id, group.id)["result"]
         assert len(spin_result.get("chosen_member_ids", [])) == 2
 
-    def test_post_all_chosen_members_amount_redirects_with_message(self, authenticated_client, url, group):
+    def test_post_all_chosen_members_amount_redirects_with_message(self, authenticated_client, url, group, user):
         """When all members chosen, redirects with message."""
-        member_ids = list(group.members.values_list("id", flat=True))
-
-        session = authenticated_client.session
-        session[f"already_chosen_members_{group.id}"] = member_ids
-        session.save()
+        mark_chosen(user, group, group.members.values_list("id", flat=True))
 
         response = authenticated_client.post(
             url,
@@ -209,14 +202,11 @@ class TestHomeViewPostNonAjax:
         )
         assert response.status_code == 302
 
-        session = authenticated_client.session
-        assert "All members chosen" in session.get("wheel_message", "")
+        assert "All members chosen" in load_state(user.id, group.id)["message"]
 
-    def test_post_clear_session_resets_chosen_members(self, authenticated_client, url, group):
+    def test_post_clear_session_resets_chosen_members(self, authenticated_client, url, group, user):
         """clear_session=1 resets the chosen members for that group."""
-        session = authenticated_client.session
-        session[f"already_chosen_members_{group.id}"] = [1, 2]
-        session.save()
+        mark_chosen(user, group, group.members.values_list("id", flat=True)[:2])
 
         authenticated_client.post(
             url,
@@ -224,8 +214,7 @@ class TestHomeViewPostNonAjax:
         )
 
         # After spin, should have only 1 chosen (not 3)
-        session = authenticated_client.session
-        assert len(session.get(f"already_chosen_members_{group.id}", [])) == 1
+        assert len(chosen_for(user, group)) == 1
 
     def test_post_increments_wheel_spins_counter(self, authenticated_client, url, group, user):
         """User's wheel_spins counter is incremented."""
@@ -312,13 +301,9 @@ class TestHomeViewPostAjax:
         assert "error" in data
         assert "No group selected" in data["error"]
 
-    def test_ajax_post_all_chosen_returns_error(self, authenticated_client, url, group):
+    def test_ajax_post_all_chosen_returns_error(self, authenticated_client, url, group, user):
         """AJAX POST when all members chosen returns error JSON."""
-        member_ids = list(group.members.values_list("id", flat=True))
-
-        session = authenticated_client.session
-        session[f"already_chosen_members_{group.id}"] = member_ids
-        session.save()
+        mark_chosen(user, group, group.members.values_list("id", flat=True))
 
         response = self.ajax_post(
             authenticated_client,
@@ -340,8 +325,8 @@ class TestHomeViewPostAjax:
         data = json.loads(response.content)
         assert len(data["chosen_members"]) == 2
 
-    def test_ajax_post_remove_after_spin_off(self, authenticated_client, url, group):
-        """AJAX POST with remove_after_spin off doesn't track in session."""
+    def test_ajax_post_remove_after_spin_off(self, authenticated_client, url, group, user):
+        """AJAX POST with remove_after_spin off doesn't track in the wheel state."""
         response = self.ajax_post(
             authenticated_client,
             url,
@@ -349,12 +334,10 @@ class TestHomeViewPostAjax:
         )
         assert response.status_code == 200
 
-        session = authenticated_client.session
-        session_key = f"already_chosen_members_{group.id}"
-        assert session.get(session_key, []) == []
+        assert chosen_for(user, group) == []
 
     def test_ajax_post_remove_after_spin_off_returns_chosen_in_response(self, authenticated_client, url, group):
-        """AJAX POST with remove_after_spin off includes chosen member in response but not session."""
+        """AJAX POST with remove_after_spin off includes chosen member in response but not the wheel state."""
         response = self.ajax_post(
             authenticated_client,
             url,
@@ -362,7 +345,7 @@ class TestHomeViewPostAjax:
         )
         data = json.loads(response.content)
         # The response includes the just-chosen member (for JS wheel update)
-        # but session is not updated
+        # but the wheel state is not updated
         assert len(data["already_chosen_ids"]) == 1
         member_ids = list(group.members.values_list("id", flat=True))
         assert data["already_chosen_ids"][0] in member_ids
@@ -446,8 +429,7 @@ class TestHomeViewEdgeCases:
             )
             assert response.status_code == 200
 
-        session = authenticated_client.session
-        assert len(session.get(f"already_chosen_members_{group.id}", [])) == 3
+        assert len(chosen_for(user, group)) == 3
 
     def test_large_chosen_members_amount_value(self, authenticated_client, url, user):
         """Large chosen_members_amount value is handled gracefully."""
@@ -473,3 +455,219 @@ class TestHomeViewEdgeCases:
         )
         data = json.loads(response.content)
         assert len(data["chosen_members"]) == 1
+
+
+@pytest.mark.django_db
+class TestGroupMembersView:
+    """Tests for the per-group wheel members endpoint."""
+
+    @pytest.fixture
+    def group(self, user):
+        return GroupCreationModelFactory(user=user, members_string="Alice, Bob")
+
+    @pytest.fixture
+    def url(self, group):
+        return reverse("wheel:group-members", args=[group.id])
+
+    def test_requires_login(self, client, url):
+        response = client.get(url)
+        assert response.status_code == 302
+
+    def test_returns_members_with_etag(self, authenticated_client, url, group):
+        response = authenticated_client.get(url)
+
+        assert response.status_code == 200
+        assert response["ETag"].startswith('"wheel-members-')
+        assert "no-cache" in response["Cache-Control"]
+        data = response.json()
+        assert data["group_id"] == group.id
+        assert [m["name"] for m in data["members"]] == ["Alice", "Bob"]
+        assert all(m["color"] for m in data["members"])
+
+    def test_matching_etag_returns_304(self, authenticated_client, url):
+        etag = authenticated_client.get(url)["ETag"]
+
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_group_change_changes_etag(self, authenticated_client, url, group):
+        etag = authenticated_client.get(url)["ETag"]
+        group.members_string = "Alice, Bob, Charlie"
+        group.save()
+
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+        assert len(response.json()["members"]) == 3
+
+    def test_recolor_changes_etag(self, authenticated_client, url, group):
+        etag = authenticated_client.get(url)["ETag"]
+        member = group.members.first()
+
+        authenticated_client.post(
+            reverse("group_maker:group-maker-edit", args=[group.id]),
+            {"title": group.title, "members_string": group.members_string, f"member_color_{member.id}": "#000000"},
+        )
+
+        assert authenticated_client.get(url)["ETag"] != etag
+
+    def test_other_users_group_is_404(self, authenticated_client, other_user):
+        other_group = GroupCreationModelFactory(user=other_user, members_string="Eve")
+
+        response = authenticated_client.get(reverse("wheel:group-members", args=[other_group.id]))
+
+        assert response.status_code == 404
+
+    def test_home_page_does_not_inline_members(self, authenticated_client, group):
+        response = authenticated_client.get(reverse("wheel:home"))
+
+        assert b"Alice" not in response.content
+
+
+@pytest.mark.django_db
+class TestWeightedSpin:
+    """Tests for weighted spins and the weights page."""
+
+    @pytest.fixture
+    def group(self, user):
+        return GroupCreationModelFactory(user=user, members_string="Alice, Bob, Charlie")
+
+    def test_spin_records_picks(self, authenticated_client, group):
+        response = authenticated_client.post(
+            reverse("wheel:home"),
+            {"group_id": group.id, "chosen_members_amount": 2, "weighting": "karma"},
+            HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+        )
+
+        assert response.status_code == 200
+        chosen_ids = response.json()["chosen_ids"]
+        assert len(chosen_ids) == 2
+        assert set(MemberWheelStats.objects.values_list("member_id", flat=True)) == set(chosen_ids)
+
+    def test_manual_weights_page_saves_weights(self, authenticated_client, group):
+        alice, bob, charlie = group.members.order_by("id")
+        url = reverse("wheel:weights", args=[group.id])
+
+        assert authenticated_client.get(url).status_code == 200
+        response = authenticated_client.post(
+            url, {f"weight_{alice.id}": 0, f"weight_{bob.id}": 3, f"weight_{charlie.id}": 1}
+        )
+
+        assert response.status_code == 302
+        assert dict(MemberWheelStats.objects.values_list("member_id", "weight")) == {
+            alice.id: 0,
+            bob.id: 3,
+            charlie.id: 1,
+        }
+
+    def test_manual_weights_reject_negative(self, authenticated_client, group):
+        alice = group.members.first()
+        response = authenticated_client.post(reverse("wheel:weights", args=[group.id]), {f"weight_{alice.id}": -1})
+
+        assert response.status_code == 200
+        assert not MemberWheelStats.objects.exists()
+
+    def test_weights_page_of_other_user_is_404(self, authenticated_client, other_user):
+        other_group = GroupCreationModelFactory(user=other_user, members_string="Eve")
+
+        response = authenticated_client.get(reverse("wheel:weights", args=[other_group.id]))
+
+        assert response.status_code == 404
+
+
+@pytest.mark.django_db
+class TestWheelStateStore:
+    """Tests for the cache-backed wheel state with its database fallback."""
+
+    @pytest.fixture
+    def group(self, user):
+        return GroupCreationModelFactory(user=user, members_string="Alice, Bob, Charlie")
+
+    def test_ajax_spin_does_not_write_the_session(self, authenticated_client, group):
+        with CaptureQueriesContext(connection) as queries:
+            authenticated_client.post(
+                reverse("wheel:home"),
+                {"group_id": group.id, "remove_after_spin": "on"},
+                HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+            )
+
+        writes = [q["sql"] for q in queries if "django_session" in q["sql"] and not q["sql"].startswith("SELECT")]
+        assert writes == []
+
+    def test_state_survives_cache_flush(self, user, group):
+        mark_chosen(user, group, _member_ids(group)[:2])
+        cache.clear()
+
+        assert chosen_for(user, group) == _member_ids(group)[:2]
+
+    def test_roster_change_invalidates_bitset(self, user, group):
+        mark_chosen(user, group, _member_ids(group)[:1])
+
+        group.members_string = "Alice, Bob, Charlie, Dana"
+        group.save()
+
+        assert chosen_for(user, group) == []
+
+    def test_entry_of_an_older_generation_is_ignored(self, user, group):
+        ids = _member_ids(group)
+        mark_chosen(user, group, ids[:1])
+        # Another worker resets the wheel and spins again; only the shared generation and the row change
+        cache.set(f"wheel:state_generation:{user.id}", 0, None)
+        WheelState.objects.filter(user=user, group=group).update(chosen_bits="2")
+
+        assert chosen_for(user, group) == ids[1:2]
+
+    def test_database_cache_keeps_states_in_rows_only(self, user, group, settings, monkeypatch):
+        monkeypatch.setitem(settings.CACHES["default"], "BACKEND", "django.core.cache.backends.db.DatabaseCache")
+        monkeypatch.setattr(cache, "set", lambda *args, **kwargs: pytest.fail("cache write"))
+        monkeypatch.setattr(cache, "get_many", lambda *args, **kwargs: pytest.fail("cache read"))
+        ids = _member_ids(group)
+
+        mark_chosen(user, group, ids[:1])
+        mark_chosen(user, group, ids[1:2])
+        assert chosen_for(user, group) == ids[:2]
+
+        reset_states(user.id)
+        assert chosen_for(user, group) == []
+
+    def test_reset_is_per_user(self, user, other_user, group):
+        other_group = GroupCreationModelFactory(user=other_user, members_string="Eve, Frank")
+        mark_chosen(user, group, _member_ids(group)[:1])
+        mark_chosen(other_user, other_group, _member_ids(other_group)[:1])
+
+        reset_states(user.id)
+
+        assert chosen_for(user, group) == []
+        assert chosen_for(other_user, other_group) == _member_ids(other_group)[:1]
+
+
+@pytest.mark.django_db
+class TestWheelStatsView:
+    """Tests for the pick fairness endpoint."""
+
+    def test_returns_fairness_figures(self, authenticated_client, user):
+        group = GroupCreationModelFactory(user=user, members_string="Alice, Bob")
+        authenticated_client.post(
+            reverse("wheel:home"),
+            {"group_id": group.id, "weighting": "recency"},
+            HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+        )
+
+        response = authenticated_client.get(reverse("wheel:stats", args=[group.id]) + "?days=7")
+
+        data = response.json()
+        assert data["days"] == 7
+        assert len(data["not_picked"]) == 1
+        assert sum(row["picks"] for row in data["frequency"]) == 1
+        assert data["daily"][0]["picks"] == 1
+        assert WheelSpin.objects.get().mode == "recency"
+
+    def test_other_users_group_is_404(self, authenticated_client, other_user):
+        other_group = GroupCreationModelFactory(user=other_user, members_string="Eve")
+
+        response = authenticated_client.get(reverse("wheel:stats", args=[other_group.id]))
+
+        assert response.status_code == 404
@@ -1,9 +1,12 @@
 from django.urls import path
 
-from .views import HomeView
+from .views import GroupMembersView, HomeView, WheelStatsView, WheelWeightsView
 
 app_name = "wheel"
 
 urlpatterns = [
     path("", HomeView.as_view(), name="home"),
+    path("groups/<int:group_id>/members/", GroupMembersView.as_view(), name="group-members"),
+    path("groups/<int:group_id>/weights/", WheelWeightsView.as_view(), name="weights"),
+    path("groups/<int:group_id>/stats/", WheelStatsView.as_view(), name="stats"),
 ]
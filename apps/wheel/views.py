@@ -1,15 +1,53 @@
+from datetime import timedelta
+
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
-from django.views.generic import TemplateView
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from django.views.generic import TemplateView, View
 
 from apps.core.models import Member
 from apps.group_maker.models import GroupCreationModel
-from apps.users.models import UserStats
+from apps.group_maker.selectors import get_user_groups
+from apps.point_system.services import TableCache
+from apps.users.services import UsageCounters
+
+from .forms import NameWheelForm, WheelWeightsForm
+from .selectors import daily_picks, members_not_picked_since, pick_frequency
+from .services.picks import record_spin, set_weights
+from .services.sampling import sample_members
+from .services.state import chosen_ids, clear_state, load_state, reset_states, save_state, with_chosen
+from .services.weighted import WEIGHTINGS, weighted_sample_members
+
+
+def _group_members_etag(request, group_id):
+    """
+    ETag for a group's wheel members, derived from the group's table version.
+
+    Renames, additions and removals all go through a group save, which bumps
+    the version; None (no ETag) for groups the user does not own.
+    """
+    if not GroupCreationModel.objects.filter(id=group_id, user=request.user).exists():
+        return None
+    return f"wheel-members-{group_id}-{TableCache.version(group_id)}"
+
+
+class GroupMembersView(LoginRequiredMixin, View):
+    """Members (id, name, color) of one group, for drawing the wheel."""
 
-from .forms import NameWheelForm
-from .services.utils import choose_random_member
+    @method_decorator(cache_control(private=True, no_cache=True))
+    @method_decorator(condition(etag_func=_group_members_etag))
+    def get(self, request, group_id):
+        group = get_object_or_404(GroupCreationModel, id=group_id, user=request.user)
+        members = [
+            {**member, "color": member["color"] or "#6366f1"}
+            for member in group.members.order_by("id").values("id", "name", "color")
+        ]
+        return JsonResponse({"group_id": group.id, "members": members})
 
 
 class HomeView(LoginRequiredMixin, TemplateView):
@@ -18,17 +56,15 @@ class HomeView(LoginRequiredMixin, TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["groups"] = GroupCreationModel.objects.filter(user=self.request.user).prefetch_related("members")
+        context["groups"] = get_user_groups(self.request.user)
+        context["form"] = self.form_class()
         return context
 
     def get(self, request, *args, **kwargs):
         selected_group = None
 
         if "reset" in request.GET:
-            for key in list(request.session.keys()):
-                if key.startswith("already_chosen_members_"):
-                    request.session.pop(key, None)
-            request.session.modified = True
+            reset_states(request.user.id)
 
         selected_group_id = request.GET.get("group_id")
         if selected_group_id:
@@ -36,31 +72,32 @@ class HomeView(LoginRequiredMixin, TemplateView):
 
         context = self.get_context_data(**kwargs)
 
-        # Check for message from POST redirect ("All members chosen! Click Reset to start over.")
-        message = request.session.pop("wheel_message", None)
-        if message:
-            context["message"] = message
-            request.session.modified = True
-
         if selected_group:
             context["selected_group"] = selected_group
-
-            # Check for spin results from POST redirect
-            spin_result_key = f"spin_result_{selected_group.id}"
-            spin_result = request.session.pop(spin_result_key, None)
-            if spin_result:
-                chosen_member_ids = spin_result.get("chosen_member_ids", [])
-                context["chosen_members"] = Member.objects.filter(id__in=chosen_member_ids)  # members that were picked
-                context["chosen_members_amount"] = spin_result.get(
-                    "chosen_members_amount", 1
-                )  # members to pick per spin
-                request.session.modified = True
+            state = load_state(request.user.id, selected_group.id)
+
+            # Message and spin results from a POST redirect are shown once
+            if state["message"] or state["result"]:
+                if state["message"]:
+                    context["message"] = state["message"]
+                spin_result = state["result"]
+                if spin_result:
+                    chosen_member_ids = spin_result.get("chosen_member_ids", [])
+                    context["chosen_members"] = Member.objects.filter(
+                        id__in=chosen_member_ids
+                    )  # members that were picked
+                    context["chosen_members_amount"] = spin_result.get(
+                        "chosen_members_amount", 1
+                    )  # members to pick per spin
+                state = {**state, "message": "", "result": None}
+                save_state(request.user.id, selected_group.id, state)
 
             # Get already chosen members
-            session_key = f"already_chosen_members_{selected_group.id}"
-            already_chosen_ids = request.session.get(session_key, [])
-            if already_chosen_ids:
-                context["already_chosen_members"] = Member.objects.filter(id__in=already_chosen_ids)
+            if state["bits"]:
+                member_ids = list(selected_group.get_members().order_by("id").values_list("id", flat=True))
+                already_chosen_ids = chosen_ids(state, member_ids)
+                if already_chosen_ids:
+                    context["already_chosen_members"] = Member.objects.filter(id__in=already_chosen_ids)
 
         return self.render_to_response(context)
 
@@ -80,35 +117,25 @@ class HomeView(LoginRequiredMixin, TemplateView):
 
         selected_group = get_object_or_404(GroupCreationModel, id=selected_group_id, user=request.user)
         members = selected_group.get_members()
-        member_count = members.count()
-
-        session_key = f"already_chosen_members_{selected_group.id}"
 
         if request.POST.get("clear_session") == "1":
-            request.session.pop(session_key, None)
-            request.session.modified = True
+            clear_state(request.user.id, selected_group.id)
 
-        already_chosen_ids = request.session.get(session_key, [])
+        state = load_state(request.user.id, selected_group.id)
+        member_ids = list(members.order_by("id").values_list("id", flat=True))
+        already_chosen_ids = chosen_ids(state, member_ids)
         remove_after_spin = request.POST.get("remove_after_spin") == "on"
 
-        if remove_after_spin and len(already_chosen_ids) >= member_count:
-            if is_ajax:
-                return JsonResponse(
-                    {
-                        "error": "All members chosen! Click Reset to start over.",
-                        "all_chosen": True,
-                    }
-                )
-            request.session["wheel_message"] = "All members chosen! Click Reset to start over."
-            request.session.modified = True
-            return redirect(f"{reverse('wheel:home')}?group_id={selected_group.id}")
-
-        chosen_members = []
         chosen_members_amount_amount = int(request.POST.get("chosen_members_amount", 1))
-        for _ in range(chosen_members_amount_amount):
-            chosen_member, already_chosen_ids = choose_random_member(members, already_chosen_ids)
-            if chosen_member:
-                chosen_members.append(chosen_member)
+        weighting = request.POST.get("weighting", "")
+        if weighting in WEIGHTINGS:
+            chosen_members, already_chosen_ids = weighted_sample_members(
+                members, selected_group.id, already_chosen_ids, chosen_members_amount_amount, weighting
+            )
+        else:
+            chosen_members, already_chosen_ids = sample_members(
+                members, already_chosen_ids, chosen_members_amount_amount, member_ids=member_ids
+            )
 
         if not chosen_members:
             if is_ajax:
@@ -118,21 +145,30 @@ class HomeView(LoginRequiredMixin, TemplateView):
                         "all_chosen": True,
                     }
                 )
-            request.session["wheel_message"] = "All members chosen! Click Reset to start over."
-            request.session.modified = True
+            save_state(
+                request.user.id,
+                selected_group.id,
+                {**state, "message": "All members chosen! Click Reset to start over."},
+            )
             return redirect(f"{reverse('wheel:home')}?group_id={selected_group.id}")
 
-        # Update session only if removing after spin
+        record_spin(
+            selected_group.id,
+            [m.id for m in chosen_members],
+            mode=weighting if weighting in WEIGHTINGS else "uniform",
+            user_id=request.user.id,
+        )
+
+        # Remember the picks only if removing after spin
         if remove_after_spin:
-            request.session[session_key] = already_chosen_ids
-            request.session.modified = True
+            state = with_chosen(state, member_ids, already_chosen_ids)
 
         # Track usage
-        stats, _ = UserStats.objects.get_or_create(user=request.user)
-        stats.wheel_spins += 1
-        stats.save(update_fields=["wheel_spins"])
+        UsageCounters.increment(request.user.id, "wheel_spins")
 
         if is_ajax:
+            if remove_after_spin:
+                save_state(request.user.id, selected_group.id, state)
             return JsonResponse(
                 {
                     "chosen_members": [m.name for m in chosen_members],
@@ -141,11 +177,64 @@ class HomeView(LoginRequiredMixin, TemplateView):
                 }
             )
 
-        # Non-AJAX: store in session and redirect
-        spin_result_key = f"spin_result_{selected_group.id}"
-        request.session[spin_result_key] = {
-            "chosen_member_ids": [m.id for m in chosen_members],
-            "chosen_members_amount": chosen_members_amount_amount,
+        # Non-AJAX: keep the result for the redirected page
+        state = {
+            **state,
+            "result": {
+                "chosen_member_ids": [m.id for m in chosen_members],
+                "chosen_members_amount": chosen_members_amount_amount,
+            },
         }
-        request.session.modified = True
+        save_state(request.user.id, selected_group.id, state)
         return redirect(f"{reverse('wheel:home')}?group_id={selected_group.id}")
+
+
+class WheelWeightsView(LoginRequiredMixin, View):
+    """Edit the manual wheel weights of one group's members."""
+
+    template_name = "wheel/weights.html"
+
+    def _render(self, request, group, members, form):
+        rows = [(member, form[f"weight_{member.id}"]) for member in members]
+        return render(request, self.template_name, {"group": group, "rows": rows, "form": form})
+
+    def _members(self, group):
+        return list(group.members.order_by("id").select_related("wheel_stats"))
+
+    def get(self, request, group_id):
+        group = get_object_or_404(GroupCreationModel, id=group_id, user=request.user)
+        members = self._members(group)
+        return self._render(request, group, members, WheelWeightsForm(members=members))
+
+    def post(self, request, group_id):
+        group = get_object_or_404(GroupCreationModel, id=group_id, user=request.user)
+        members = self._members(group)
+        form = WheelWeightsForm(request.POST, members=members)
+        if not form.is_valid():
+            return self._render(request, group, members, form)
+        set_weights(group.id, form.weights())
+        return redirect(f"{reverse('wheel:home')}?group_id={group.id}")
+
+
+class WheelStatsView(LoginRequiredMixin, View):
+    """Pick fairness figures for one group, as JSON for charts."""
+
+    def get(self, request, group_id):
+        group = get_object_or_404(GroupCreationModel, id=group_id, user=request.user)
+        try:
+            days = max(1, int(request.GET.get("days", 14)))
+        except ValueError:
+            days = 14
+        since = timezone.now() - timedelta(days=days)
+
+        return JsonResponse(
+            {
+                "days": days,
+                "not_picked": [
+                    {"id": member.id, "name": member.name, "last_picked_at": member.last_picked_at}
+                    for member in members_not_picked_since(group, since)
+                ],
+                "frequency": pick_frequency(group, since=timezone.localdate(since)),
+                "daily": daily_picks(group, since=timezone.localdate(since)),
+            }
+        )
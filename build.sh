@@ -15,4 +15,5 @@ cd ../..
 
 rm -rf staticfiles
 python manage.py collectstatic --no-input
-python manage.py migrate
\ No newline at end of file
+python manage.py migrate
+python manage.py createcachetable
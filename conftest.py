@@ -6,6 +6,47 @@ Contains fixtures shared across all apps.
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+
+def pytest_addoption(parser):
+    parser.addoption("--benchmark", action="store_true", help="Also run the wall-clock benchmark tests.")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip benchmark tests unless asked for: their timings depend on the machine's load."""
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmark; run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(autouse=True)
+def local_memory_cache(settings):
+    """
+    Run tests against an in-process cache.
+
+    Production uses a cache shared by all workers (the database cache table
+    or Redis); tests run in one process, and query-count assertions should
+    only count model queries, not cache reads.
+    """
+    settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(local_memory_cache):
+    """Start every test with an empty cache so cached fragments never leak between tests."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def write_through_usage_counters(settings):
+    """Write usage counters immediately so tests can assert on UserStats rows."""
+    settings.USAGE_COUNTERS_FLUSH_SECONDS = 0
 
 
 @pytest.fixture
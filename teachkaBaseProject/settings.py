@@ -198,6 +198,54 @@ if not DEBUG:
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Point system storage layout: "json" keeps scores in the Member JSON fields,
+# "scores" uses the normalized Score table (run `manage.py migrate_scores` before switching)
+POINT_STORAGE = os.environ.get("POINT_STORAGE", "json")
+
+# Every worker process must share one cache: cached group listings, dashboards and
+# wheel states are invalidated with cache.delete(), which a per-process cache would
+# only apply in the worker that handled the write. REDIS_URL selects Redis (needs the
+# redis package); otherwise the database cache table (`manage.py createcachetable`) is used.
+# The database cache culls a third of its rows once it holds MAX_ENTRIES (Django's default
+# is 300). Each user keeps a dashboard and a group listing, and each group keeps two table
+# fragments per language/theme and version, a wheel alias table and wheel states. So the
+# limit is sized for thousands of active groups; raise CACHE_MAX_ENTRIES for larger sites.
+CACHES: dict[str, dict]
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "django_cache",
+            "OPTIONS": {"MAX_ENTRIES": int(os.environ.get("CACHE_MAX_ENTRIES", 50000))},
+        }
+    }
+
+# Seconds a rendered points table is kept in the cache; writes invalidate it earlier
+POINT_TABLE_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Seconds a user's annotated group listing is cached; group and point writes invalidate it earlier
+USER_GROUPS_CACHE_TIMEOUT = 60 * 60
+
+# Seconds a weighted-wheel alias table is reused; weight changes invalidate it earlier
+WHEEL_ALIAS_CACHE_TIMEOUT = 60 * 60
+
+# Seconds a wheel state (already chosen members) stays in the cache; the database copy outlives it
+WHEEL_STATE_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Seconds usage counter increments may wait in the cache before they are written; 0 writes through.
+# Only Redis or Memcached buffer (atomic, shared counters); other caches always write through
+USAGE_COUNTERS_FLUSH_SECONDS = 10
+
+# Seconds a user's landing-page numbers are cached; group, member and stats writes invalidate them earlier
+DASHBOARD_CACHE_TIMEOUT = 60 * 60
+
 LOGIN_URL = "login"
 LOGIN_REDIRECT_URL = "/"
 LOGOUT_REDIRECT_URL = "login"
@@ -1,11 +1,8 @@
 from datetime import date
 
-from django.db.models import Sum
 from django.views.generic import TemplateView
 
-from apps.group_maker.models import GroupCreationModel
-from apps.point_system.models import Member
-from apps.users.models import UserStats
+from apps.users.selectors import get_dashboard
 
 
 class HomeView(TemplateView):
@@ -16,29 +13,21 @@ class HomeView(TemplateView):
 
         # User-specific stats (for authenticated users)
         if self.request.user.is_authenticated:
-            user = self.request.user
+            dashboard = get_dashboard(self.request.user)
 
             # Groups and members
-            user_groups = GroupCreationModel.objects.filter(user=user)
-            context["user_groups_count"] = user_groups.count()
-
-            user_members = Member.objects.filter(group__user=user)
-            context["user_members_count"] = user_members.count()
+            context["user_groups_count"] = dashboard["groups_count"]
+            context["user_members_count"] = dashboard["members_count"]
 
             # Points totals
-            user_totals = user_members.aggregate(
-                total_positive=Sum("positive_total"),
-                total_negative=Sum("negative_total"),
-            )
-            context["user_positive_points"] = user_totals["total_positive"] or 0
-            context["user_negative_points"] = user_totals["total_negative"] or 0
+            context["user_positive_points"] = dashboard["positive_points"]
+            context["user_negative_points"] = dashboard["negative_points"]
 
             # Usage stats
-            stats, _ = UserStats.objects.get_or_create(user=user)
-            context["calculator_uses"] = stats.calculator_uses
-            context["wheel_spins"] = stats.wheel_spins
-            context["divider_uses"] = stats.divider_uses
-            total_timer_ms = stats.stopwatch_total_ms + stats.countdown_total_ms
+            context["calculator_uses"] = dashboard["calculator_uses"]
+            context["wheel_spins"] = dashboard["wheel_spins"]
+            context["divider_uses"] = dashboard["divider_uses"]
+            total_timer_ms = dashboard["stopwatch_total_ms"] + dashboard["countdown_total_ms"]
             context["timer_total_hours"] = round(total_timer_ms / 3_600_000, 1)
             context["timer_total_minutes"] = round(total_timer_ms / 60_000)
 